@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 10:44, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+from mealpy.swarm_based import GWO
+import numpy as np
+
+def obj_function(solution):
+    return np.sum(solution**2)
+
+problem_dict1 = {
+    "obj_func": obj_function,       # Only used to check the problem, the evaluations below are done by us
+    "lb": [-100, ] * 30,
+    "ub": [100, ] * 30,
+    "minmax": "min",
+    "verbose": True,
+}
+
+## Ask for the candidates, evaluate them anywhere (cluster, simulator...) and tell the results back
+model1 = GWO.BaseGWO(problem_dict1, epoch=100, pop_size=50)
+while True:
+    pos_matrix = model1.ask()
+    if pos_matrix is None:
+        break
+    model1.tell(np.sum(pos_matrix**2, axis=1))
+print(model1.solution[0], model1.solution[1][0])
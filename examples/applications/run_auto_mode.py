@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 11:24, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+from mealpy.evolutionary_based import DE
+import numpy as np
+
+def obj_function(solution):
+    return np.sum(solution**2)
+
+def obj_batch_function(pos_matrix):
+    return np.sum(pos_matrix**2, axis=1)
+
+problem_dict1 = {
+    "obj_func": obj_function,
+    "obj_batch_func": obj_batch_function,       # Optional, lets mode="auto" consider the vectorized mode
+    "lb": [-100, ] * 30,
+    "ub": [100, ] * 30,
+    "minmax": "min",
+    "verbose": True,
+}
+
+if __name__ == "__main__":
+    ## The mode (sequential, vectorized, thread or process) is picked from the measured cost of the objective
+    model1 = DE.BaseDE(problem_dict1, epoch=100, pop_size=50)
+    best_position, best_fitness = model1.solve(mode="auto")
+    print(model1.auto_info["mode"], model1.auto_info["batch_times"])
+    print(best_position, best_fitness)
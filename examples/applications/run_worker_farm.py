@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 11:21, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+from mealpy.swarm_based import GWO
+from mealpy.utils.worker_farm import WorkerFarm
+import numpy as np
+import time
+
+def obj_function(solution):
+    time.sleep(0.01)                # An expensive objective
+    return np.sum(solution**2)
+
+problem_dict1 = {
+    "obj_func": obj_function,
+    "lb": [-100, ] * 30,
+    "ub": [100, ] * 30,
+    "minmax": "min",
+    "verbose": True,
+}
+
+if __name__ == "__main__":
+    ## 4 workers on this host, with a random authkey. Workers on other hosts join with (host = "0.0.0.0", a fixed port
+    ## and an authkey shared with them here):
+    ##      run_worker(("coordinator-host", 6000), obj_function, authkey=farm.authkey)
+    farm = WorkerFarm(host="127.0.0.1", port=6000, n_local_workers=4)
+    model1 = GWO.BaseGWO(problem_dict1, epoch=20, pop_size=50, farm=farm)
+    best_position, best_fitness = model1.solve(mode="farm")
+    print(best_position, best_fitness)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 10:47, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+from mealpy.evolutionary_based.DE import BaseDE
+from mealpy.utils.multi_run import MultiRun
+import numpy as np
+
+def obj_function(solution):
+    return np.sum(solution**2 - 10 * np.cos(2 * np.pi * solution)) + 10 * len(solution)
+
+def batch_obj_function(pos_matrix):
+    ## Same function on a matrix (n_candidates x n_dims), called once per generation for all the runs
+    return np.sum(pos_matrix**2 - 10 * np.cos(2 * np.pi * pos_matrix), axis=1) + 10 * pos_matrix.shape[1]
+
+problem_dict1 = {
+    "obj_func": obj_function,
+    "lb": [-5.12, ] * 15,
+    "ub": [5.12, ] * 15,
+    "minmax": "min",
+    "verbose": False,
+}
+
+## 30 independent runs, seed of run k is k
+multi = MultiRun(BaseDE, problem_dict1, n_runs=30, seeds=list(range(30)), epoch=1000, pop_size=50, wf=0.8, cr=0.9)
+list_results = multi.solve(batch_obj_func=batch_obj_function)
+list_best_fit = [best_fit for _, best_fit in list_results]
+print(f"Mean: {np.mean(list_best_fit)}, Std: {np.std(list_best_fit)}")
+list_loss = multi.models[0].history.list_global_best_fit       # Convergence of the first run
@@ -85,7 +85,7 @@ class BaseEOA(Optimizer):
             x_t1 = self.dyn_beta * x_t1 + (1.0 - self.dyn_beta) * x_child
             pos_new = self.amend_position_faster(x_t1)
             pop.append([pos_new, None])
-        pop = self.update_fitness_population(pop)
+        pop = self.update_fitness_population_bound(pop, self.pop)
         pop = self.greedy_selection_population(self.pop, pop)
         nfe_epoch += self.pop_size
         self.dyn_beta = self.gamma * self.beta
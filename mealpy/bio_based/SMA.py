@@ -8,7 +8,6 @@
 #-------------------------------------------------------------------------------------------------------%
 
 import numpy as np
-from copy import deepcopy
 from mealpy.optimizer import Optimizer
 
 
@@ -25,8 +24,6 @@ class BaseSMA(Optimizer):
             + My version not only faster but also better
     """
 
-    ID_WEI = 2
-
     def __init__(self, problem, epoch=10000, pop_size=100, pr=0.03, **kwargs):
         """
         Args:
@@ -42,65 +39,54 @@ class BaseSMA(Optimizer):
         self.pop_size = pop_size
         self.pr = pr
 
-    def create_solution(self):
+    def get_weight_matrix(self, list_fitness):
         """
+        Eq.(2.5) for the whole population, the better half (by fitness rank) gets 1 + r * log(.), the other half 1 - r * log(.)
+
+        Args:
+            list_fitness (nd.array): 1-D array (pop_size,) of fitness values
+
         Returns:
-            The position position with 2 element: index of position/location and index of fitness wrapper
-            The general format: [position, [target, [obj1, obj2, ...]], weight]
-
-        ## To get the position, fitness wrapper, target and obj list
-        ##      A[self.ID_POS]                  --> Return: position
-        ##      A[self.ID_FIT]                  --> Return: [target, [obj1, obj2, ...]]
-        ##      A[self.ID_FIT][self.ID_TAR]     --> Return: target
-        ##      A[self.ID_FIT][self.ID_OBJ]     --> Return: [obj1, obj2, ...]
+            2-D matrix (pop_size x n_dims) of slime mould weights
         """
-        position = np.random.uniform(self.problem.lb, self.problem.ub)
-        fitness = self.get_fitness_position(position=position)
-        weight = np.zeros(self.problem.n_dims)
-        return [position, fitness, weight]
+        list_rank = np.empty(len(list_fitness), dtype=int)
+        list_rank[np.argsort(list_fitness if self.problem.minmax == "min" else -list_fitness, kind="stable")] = np.arange(len(list_fitness))
+        fit_best = self.g_best[self.ID_FIT][self.ID_TAR]
+        fit_worst = np.max(list_fitness) if self.problem.minmax == "min" else np.min(list_fitness)
+        # plus eps to avoid denominator zero
+        s = fit_best - fit_worst + self.EPSILON
+        sign = np.where(list_rank <= int(len(list_fitness) / 2), 1, -1)
+        weight = np.log10((fit_best - list_fitness) / s + 1)
+        return 1 + sign[:, None] * np.random.uniform(0, 1, (len(list_fitness), self.problem.n_dims)) * weight[:, None]
 
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        # plus eps to avoid denominator zero
-        s = self.g_best[self.ID_FIT][self.ID_TAR] - self.pop[-1][self.ID_FIT][self.ID_TAR] + self.EPSILON
-
+        pos_matrix = self.get_position_matrix(self.pop)
+        list_fit = self.get_fitness_vector(self.pop)
         # calculate the fitness weight of each slime mold
-        for i in range(0, self.pop_size):
-            # Eq.(2.5)
-            if i <= int(self.pop_size / 2):
-                self.pop[i][self.ID_WEI] = 1 + np.random.uniform(0, 1, self.problem.n_dims) * \
-                                      np.log10((self.g_best[self.ID_FIT][self.ID_TAR] - self.pop[i][self.ID_FIT][self.ID_TAR]) / s + 1)
-            else:
-                self.pop[i][self.ID_WEI] = 1 - np.random.uniform(0, 1, self.problem.n_dims) * \
-                                      np.log10((self.g_best[self.ID_FIT][self.ID_TAR] - self.pop[i][self.ID_FIT][self.ID_TAR]) / s + 1)
+        weight = self.get_weight_matrix(list_fit)
 
         a = np.arctanh(-((epoch + 1) / self.epoch) + 1)         # Eq.(2.4)
         b = 1 - (epoch + 1) / self.epoch
 
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            # Update the Position of search agent
-            if np.random.uniform() < self.pr:  # Eq.(2.7)
-                pos_new = np.random.uniform(self.problem.lb, self.problem.ub)
-            else:
-                p = np.tanh(np.abs(self.pop[idx][self.ID_FIT][self.ID_TAR] - self.g_best[self.ID_FIT][self.ID_TAR]))  # Eq.(2.2)
-                vb = np.random.uniform(-a, a, self.problem.n_dims)  # Eq.(2.3)
-                vc = np.random.uniform(-b, b, self.problem.n_dims)
-
-                # two positions randomly selected from population, apply for the whole problem size instead of 1 variable
-                id_a, id_b = np.random.choice(list(set(range(0, self.pop_size)) - {idx}), 2, replace=False)
-
-                pos_1 = self.g_best[self.ID_POS] + vb * (self.pop[idx][self.ID_WEI] * self.pop[id_a][self.ID_POS] - self.pop[id_b][self.ID_POS])
-                pos_2 = vc * self.pop[idx][self.ID_POS]
-                pos_new = np.where(np.random.uniform(0, 1, self.problem.n_dims) < p, pos_1, pos_2)
+        # Update the Position of search agent
+        p = np.tanh(np.abs(list_fit - self.g_best[self.ID_FIT][self.ID_TAR]))[:, None]  # Eq.(2.2)
+        vb = np.random.uniform(-a, a, (self.pop_size, self.problem.n_dims))  # Eq.(2.3)
+        vc = np.random.uniform(-b, b, (self.pop_size, self.problem.n_dims))
+        # two positions randomly selected from population, apply for the whole problem size instead of 1 variable
+        list_partner = self.get_index_random_partner(self.pop_size, n_partners=2)
+        pos_1 = self.g_best[self.ID_POS] + vb * (weight * pos_matrix[list_partner[:, 0]] - pos_matrix[list_partner[:, 1]])
+        pos_2 = vc * pos_matrix
+        pos_new = np.where(np.random.uniform(0, 1, (self.pop_size, self.problem.n_dims)) < p, pos_1, pos_2)
+        list_random = np.random.uniform(0, 1, self.pop_size) < self.pr  # Eq.(2.7)
+        pos_new[list_random] = np.random.uniform(self.problem.lb, self.problem.ub, (np.sum(list_random), self.problem.n_dims))
 
-            # Check bound and re-calculate fitness after each individual move
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None, np.zeros(self.problem.n_dims)])
-        self.pop = self.update_fitness_population(pop_new)
+        # Check bound and re-calculate fitness after each individual move
+        pos_new = self.amend_position_faster(pos_new)
+        self.pop = self.update_fitness_population([[pos, None] for pos in pos_new])
 
 
 class OriginalSMA(BaseSMA):
@@ -111,8 +97,6 @@ class OriginalSMA(BaseSMA):
             https://doi.org/10.1016/j.future.2020.03.055
     """
 
-    ID_WEI = 2
-
     def __init__(self, problem, epoch=10000, pop_size=100, pr=0.03, **kwargs):
         """
         Args:
@@ -127,40 +111,26 @@ class OriginalSMA(BaseSMA):
         Args:
             epoch (int): The current iteration
         """
-
-        s = self.g_best[self.ID_FIT][self.ID_TAR] - self.pop[-1][self.ID_FIT][self.ID_TAR] + self.EPSILON  # plus eps to avoid denominator zero
-
+        pos_matrix = self.get_position_matrix(self.pop)
+        list_fit = self.get_fitness_vector(self.pop)
         # calculate the fitness weight of each slime mold
-        for i in range(0, self.pop_size):
-            # Eq.(2.5)
-            if i <= int(self.pop_size / 2):
-                self.pop[i][self.ID_WEI] = 1 + np.random.uniform(0, 1, self.problem.n_dims) * \
-                                      np.log10((self.g_best[self.ID_FIT][self.ID_TAR] - self.pop[i][self.ID_FIT][self.ID_TAR]) / s + 1)
-            else:
-                self.pop[i][self.ID_WEI] = 1 - np.random.uniform(0, 1, self.problem.n_dims) * \
-                                      np.log10((self.g_best[self.ID_FIT][self.ID_TAR] - self.pop[i][self.ID_FIT][self.ID_TAR]) / s + 1)
+        weight = self.get_weight_matrix(list_fit)
 
         a = np.arctanh(-((epoch + 1) / self.epoch) + 1)  # Eq.(2.4)
         b = 1 - (epoch + 1) / self.epoch
 
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            # Update the Position of search agent
-            current_agent = deepcopy(self.pop[idx])
-            if np.random.uniform() < self.pr:  # Eq.(2.7)
-                current_agent[self.ID_POS] = np.random.uniform(self.problem.lb, self.problem.ub)
-            else:
-                p = np.tanh(np.abs(current_agent[self.ID_FIT][self.ID_TAR] - self.g_best[self.ID_FIT][self.ID_TAR]))  # Eq.(2.2)
-                vb = np.random.uniform(-a, a, self.problem.n_dims)  # Eq.(2.3)
-                vc = np.random.uniform(-b, b, self.problem.n_dims)
-                for j in range(0, self.problem.n_dims):
-                    # two positions randomly selected from population
-                    id_a, id_b = np.random.choice(list(set(range(0, self.pop_size)) - {idx}), 2, replace=False)
-                    if np.random.uniform() < p:  # Eq.(2.1)
-                        current_agent[self.ID_POS][j] = self.g_best[self.ID_POS][j] + vb[j] * (
-                                current_agent[self.ID_WEI][j] * self.pop[id_a][self.ID_POS][j] - self.pop[id_b][self.ID_POS][j])
-                    else:
-                        current_agent[self.ID_POS][j] = vc[j] * current_agent[self.ID_POS][j]
-            pos_new = self.amend_position_faster(current_agent[self.ID_POS])
-            pop_new.append([pos_new, None, np.zeros(self.problem.n_dims)])
-        self.pop = self.update_fitness_population(pop_new)
+        # Update the Position of search agent
+        p = np.tanh(np.abs(list_fit - self.g_best[self.ID_FIT][self.ID_TAR]))[:, None]  # Eq.(2.2)
+        vb = np.random.uniform(-a, a, (self.pop_size, self.problem.n_dims))  # Eq.(2.3)
+        vc = np.random.uniform(-b, b, (self.pop_size, self.problem.n_dims))
+        # two positions randomly selected from population for each variable
+        list_partner = self.get_index_random_partner(self.pop_size, np.repeat(np.arange(self.pop_size), self.problem.n_dims), 2)
+        list_partner = list_partner.reshape(self.pop_size, self.problem.n_dims, 2)
+        list_dims = np.arange(self.problem.n_dims)[None, :]
+        pos_1 = self.g_best[self.ID_POS] + vb * (weight * pos_matrix[list_partner[:, :, 0], list_dims] -
+                                                 pos_matrix[list_partner[:, :, 1], list_dims])  # Eq.(2.1)
+        pos_new = np.where(np.random.uniform(0, 1, (self.pop_size, self.problem.n_dims)) < p, pos_1, vc * pos_matrix)
+        list_random = np.random.uniform(0, 1, self.pop_size) < self.pr  # Eq.(2.7)
+        pos_new[list_random] = np.random.uniform(self.problem.lb, self.problem.ub, (np.sum(list_random), self.problem.n_dims))
+        pos_new = self.amend_position_faster(pos_new)
+        self.pop = self.update_fitness_population([[pos, None] for pos in pos_new])
@@ -71,7 +71,7 @@ class BaseWHO(Optimizer):
             temp = self.local_move[0] * best_local[self.ID_POS] + self.local_move[1] * (self.pop[i][self.ID_POS] - best_local[self.ID_POS])
             pos_new = self.amend_position_faster(temp)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         pop_new = self.greedy_selection_population(self.pop, pop_new)
         nfe_epoch += self.pop_size
 
@@ -8,6 +8,7 @@
 # ------------------------------------------------------------------------------------------------------%
 
 import numpy as np
+from copy import deepcopy
 from mealpy.optimizer import Optimizer
 
 
@@ -15,7 +16,10 @@ class BaseCRO(Optimizer):
     """
         The original version of: Coral Reefs Optimization (CRO)
             http://downloads.hindawi.com/journals/tswj/2014/739768.pdf
+    Notes:
+        + Noisy problem: the larval settlement compares a larva with several cells, without racing re-sampling
     """
+    NOISE_RACING = False
 
     def __init__(self, problem, epoch=10000, pop_size=100,
                  po=0.4, Fb=0.9, Fa=0.1, Fd=0.1, Pd=0.1, G=(0.02, 0.2), GCR=0.1, n_trials=3, **kwargs):
@@ -50,65 +54,96 @@ class BaseCRO(Optimizer):
         self.G = G
         self.GCR = GCR
         self.G1 = G[1]
-        self.reef = np.array([])
-        self.occupied_position = []  # after a gen, you should update the occupied_position
-        self.alpha = 10 * self.Pd / self.epoch
+        self.alpha = 10 * self.Pd_thres / self.epoch
         self.gama = 10 * (self.G[1] - self.G[0]) / self.epoch
         self.num_occupied = int(self.pop_size / (1 + self.po))
 
-        self.occupied_list = np.zeros(self.pop_size)
-        self.occupied_idx_list = np.random.choice(list(range(self.pop_size)), self.num_occupied, replace=False)
-        self.occupied_list[self.occupied_idx_list] = 1
+        ## The reef: self.pop holds a coral for every cell, the occupancy mask tells which cells are alive
+        self.occupied_mask = np.zeros(self.pop_size, dtype=bool)
+        self.occupied_mask[np.random.choice(self.pop_size, self.num_occupied, replace=False)] = True
 
     def _gausion_mutation(self, position):
-        temp = position + self.G1 * (self.problem.ub - self.problem.lb) * np.random.normal(0, 1, self.problem.n_dims)
-        pos_new = np.where(np.random.uniform(0, 1, self.problem.n_dims) < self.GCR, temp, position)
+        temp = position + self.G1 * (self.problem.ub - self.problem.lb) * np.random.normal(0, 1, position.shape)
+        pos_new = np.where(np.random.uniform(0, 1, position.shape) < self.GCR, temp, position)
         return self.amend_position_faster(pos_new)
 
     ### Crossover
     def _multi_point_cross(self, pos1, pos2):
-        p1, p2 = np.random.choice(list(range(len(pos1))), 2, replace=False)
-        start = min(p1, p2)
-        end = max(p1, p2)
-        return np.concatenate((pos1[:start], pos2[start:end], pos1[end:]), axis=0)
+        """
+        Two-point crossover of many pairs at once
+
+        Args:
+            pos1 (nd.array): 2-D matrix (n_pairs x n_dims)
+            pos2 (nd.array): 2-D matrix (n_pairs x n_dims)
+
+        Returns:
+            2-D matrix (n_pairs x n_dims), the segment [start, end) is taken from pos2, the rest from pos1
+        """
+        points = np.sort(np.argsort(np.random.uniform(0, 1, (len(pos1), self.problem.n_dims)), axis=1)[:, :2], axis=1)
+        list_dims = np.arange(0, self.problem.n_dims)
+        mask = (points[:, :1] <= list_dims) & (list_dims < points[:, 1:])
+        return np.where(mask, pos2, pos1)
+
+    def _get_occupied_index(self, n_corals, best=True):
+        """
+        Args:
+            n_corals (int): number of corals
+            best (bool): True for the healthiest corals, False for the worst ones
+
+        Returns:
+            Index of the n_corals best (or worst) occupied cells, found with argpartition
+        """
+        list_occupied = np.flatnonzero(self.occupied_mask)
+        n_corals = min(n_corals, len(list_occupied))
+        if n_corals <= 0:
+            return np.array([], dtype=int)
+        list_fitness = self.get_fitness_vector([self.pop[idx] for idx in list_occupied])
+        if (self.problem.minmax == "min") != best:
+            list_fitness = -list_fitness
+        return list_occupied[np.argpartition(list_fitness, n_corals - 1)[:n_corals]]
 
     def _larvae_setting(self, larvae):
+        """
+        Every larva tries n_trials random cells at once, it lands on the first cell that is free or whose coral is worse.
+        When many larvae land on the same cell, the healthiest one settles.
+        """
+        if len(larvae) == 0:
+            return
+        list_fitness = self.get_fitness_vector(self.pop)
+        fit_larvae = self.get_fitness_vector(larvae)
         # Trial to land on a square of reefs
-        for larva in larvae:
-            for i in range(self.n_trials):
-                p = np.random.randint(0, self.pop_size - 1)
-                if self.occupied_list[p] == 0:
-                    self.pop[p] = larva
-                    self.occupied_idx_list = np.append(self.occupied_idx_list, p)           # Update occupied id
-                    self.occupied_list[p] = 1                                               # Update occupied list
-                    break
-                else:
-                    if self.compare_agent(larva, self.pop[p]):
-                        self.pop[p] = larva
-                        break
-
-    def _sort_occupied_reef(self):
-        def reef_fitness(idx):
-            return self.pop[idx][self.ID_FIT][self.ID_TAR]
-        idx_list_sorted = sorted(self.occupied_idx_list, key=reef_fitness)
-        return idx_list_sorted
+        list_cells = np.random.randint(0, self.pop_size, (len(larvae), self.n_trials))
+        list_success = ~self.occupied_mask[list_cells] | self.compare_fitness_vector(fit_larvae[:, None], list_fitness[list_cells])
+        list_larvae = np.flatnonzero(np.any(list_success, axis=1))
+        if len(list_larvae) == 0:
+            return
+        list_cells = list_cells[list_larvae, np.argmax(list_success[list_larvae], axis=1)]
+        # Conflicts: sort by cell, then by health, and keep the first larva of each cell
+        fit_order = fit_larvae[list_larvae] if self.problem.minmax == "min" else -fit_larvae[list_larvae]
+        order = np.lexsort((fit_order, list_cells))
+        list_cells, list_larvae = list_cells[order], list_larvae[order]
+        list_first = np.r_[True, list_cells[1:] != list_cells[:-1]]
+        for idx, cell in zip(list_larvae[list_first], list_cells[list_first]):
+            self.pop[cell] = larvae[idx]
+        self.occupied_mask[list_cells[list_first]] = True
 
     def broadcast_spawing_brooding(self):
         # Step 1a
-        larvae = []
-        selected_corals = np.random.choice(self.occupied_idx_list, int(len(self.occupied_idx_list) * self.Fb), replace=False)
-        for i in self.occupied_idx_list:
-            if i not in selected_corals:
-                pos_new = self._gausion_mutation(self.pop[i][self.ID_POS])
-                larvae.append([pos_new, None])
-        # Step 1b
-        while len(selected_corals) >= 2:
-            id1, id2 = np.random.choice(range(len(selected_corals)), 2, replace=False)
-            pos_new = self._multi_point_cross(self.pop[selected_corals[id1]][self.ID_POS], self.pop[selected_corals[id2]][self.ID_POS])
-            larvae.append([pos_new, None])
-            selected_corals = np.delete(selected_corals, [id1, id2])
+        list_occupied = np.random.permutation(np.flatnonzero(self.occupied_mask))
+        n_selected = int(len(list_occupied) * self.Fb)
+        selected_corals, brooding_corals = list_occupied[:n_selected], list_occupied[n_selected:]
+        pos_matrix = self.get_position_matrix(self.pop)
+        pos_new = self._gausion_mutation(pos_matrix[brooding_corals])
+        # Step 1b: the selected corals are paired randomly (they are already shuffled)
+        n_pairs = len(selected_corals) // 2
+        pos_cross = self._multi_point_cross(pos_matrix[selected_corals[0:2 * n_pairs:2]], pos_matrix[selected_corals[1:2 * n_pairs:2]])
+        larvae = [[pos, None] for pos in np.concatenate((pos_new, pos_cross), axis=0)]
         return self.update_fitness_population(larvae)
 
+    def _depredation(self):
+        num__depredation__ = int(np.sum(self.occupied_mask) * self.Fd)
+        return self._get_occupied_index(num__depredation__, best=False)
+
     def evolve(self, epoch):
         """
         Args:
@@ -121,19 +156,13 @@ class BaseCRO(Optimizer):
         nfe_epoch += len(larvae)
 
         ## Asexual Reproduction
-        num_duplicate = int(len(self.occupied_idx_list) * self.Fa)
-        pop_best = [self.pop[idx] for idx in self.occupied_idx_list]
-        pop_best = self.get_sorted_strim_population(pop_best, num_duplicate)
+        num_duplicate = int(np.sum(self.occupied_mask) * self.Fa)
+        pop_best = [deepcopy(self.pop[idx]) for idx in self._get_occupied_index(num_duplicate)]
         self._larvae_setting(pop_best)
 
         ## Depredation
         if np.random.random() < self.Pd:
-            num__depredation__ = int(len(self.occupied_idx_list) * self.Fd)
-            idx_list_sorted = self._sort_occupied_reef()
-            selected_depredator = idx_list_sorted[-num__depredation__:]
-            for idx in selected_depredator:
-                del self.occupied_idx_list[idx]
-                self.occupied_list[idx] = 0
+            self.occupied_mask[self._depredation()] = False
 
         if self.Pd <= self.Pd_thres:
             self.Pd += self.alpha
@@ -171,18 +200,16 @@ class OCRO(BaseCRO):
         self.reset_count = 0
 
     def _local_seach(self, pop=None):
-        pop_new = []
-        for idx in range(0, len(pop)):
-            temp = np.random.uniform(self.problem.lb, self.problem.ub)
-            pos_new = np.where(np.random.uniform(0, 1, self.problem.n_dims) < 0.5, self.g_best[self.ID_POS], temp)
-            pop_new.append([pos_new, None])
-        return self.update_fitness_population(pop_new)
+        temp = np.random.uniform(self.problem.lb, self.problem.ub, (len(pop), self.problem.n_dims))
+        pos_new = np.where(np.random.uniform(0, 1, temp.shape) < 0.5, self.g_best[self.ID_POS], temp)
+        return self.update_fitness_population([[pos, None] for pos in pos_new])
 
     def _opposition_based_position(self, reef, g_best):
-        pos_new = self.problem.ub + self.problem.lb - g_best[self.ID_POS] + np.random.uniform() * (g_best[self.ID_POS] - reef[self.ID_POS])
+        pos_matrix = self.get_position_matrix(reef)
+        pos_new = self.problem.ub + self.problem.lb - g_best[self.ID_POS] + \
+                  np.random.uniform(0, 1, (len(reef), 1)) * (g_best[self.ID_POS] - pos_matrix)
         pos_new = self.amend_position_faster(pos_new)
-        fit_new = self.get_fitness_position(pos_new)
-        return [pos_new, fit_new]
+        return self.update_fitness_population([[pos, None] for pos in pos_new])
 
     def evolve(self, epoch):
         """
@@ -196,24 +223,21 @@ class OCRO(BaseCRO):
         nfe_epoch += len(larvae)
 
         ## Asexual Reproduction
-        num_duplicate = int(len(self.occupied_idx_list) * self.Fa)
-        pop_best = [self.pop[idx] for idx in self.occupied_idx_list]
-        pop_best = self.get_sorted_strim_population(pop_best, num_duplicate)
+        num_duplicate = int(np.sum(self.occupied_mask) * self.Fa)
+        pop_best = [self.pop[idx] for idx in self._get_occupied_index(num_duplicate)]
         pop_local_search = self._local_seach(pop_best)
         self._larvae_setting(pop_local_search)
+        nfe_epoch += len(pop_local_search)
 
         ## Depredation
-        if np.random.random() < self.Pd:
-            num__depredation__ = int(len(self.occupied_idx_list) * self.Fd)
-            idx_list_sorted = self._sort_occupied_reef()
-            selected_depredator = idx_list_sorted[-num__depredation__:]
-            for idx in selected_depredator:
-                opposite_reef = self._opposition_based_position(self.pop[idx], self.g_best)
-                if self.compare_agent(opposite_reef, self.pop[idx]):
-                    self.pop[idx] = opposite_reef
-                else:
-                    del self.occupied_idx_list[idx]
-                    self.occupied_list[idx] = 0
+        selected_depredator = self._depredation() if np.random.random() < self.Pd else []
+        if len(selected_depredator) > 0:
+            opposite_reef = self._opposition_based_position([self.pop[idx] for idx in selected_depredator], self.g_best)
+            nfe_epoch += len(opposite_reef)
+            list_better = self.compare_population(opposite_reef, [self.pop[idx] for idx in selected_depredator])
+            for idx, agent in zip(selected_depredator[list_better], [opposite_reef[i] for i in np.flatnonzero(list_better)]):
+                self.pop[idx] = agent
+            self.occupied_mask[selected_depredator[~list_better]] = False
 
         if self.Pd <= self.Pd_thres:
             self.Pd += self.alpha
@@ -228,8 +252,7 @@ class OCRO(BaseCRO):
         if self.reset_count == self.restart_count:
             nfe_epoch += self.pop_size
             self.pop = self.create_population(self.pop_size)
-            self.occupied_list = np.zeros(self.pop_size)
-            self.occupied_idx_list = np.random.choice(range(self.pop_size), self.num_occupied, replace=False)
-            self.occupied_list[self.occupied_idx_list] = 1
+            self.occupied_mask = np.zeros(self.pop_size, dtype=bool)
+            self.occupied_mask[np.random.choice(self.pop_size, self.num_occupied, replace=False)] = True
             self.reset_count = 0
         self.nfe_per_epoch = nfe_epoch
@@ -99,7 +99,7 @@ class BaseDE(Optimizer):
                           self.weighting_factor * (self.pop[idx_list[1]][self.ID_POS] - self.pop[idx_list[2]][self.ID_POS])
                 pos_new = self._mutation__(self.pop[idx][self.ID_POS], pos_new)
                 pop.append([pos_new, None])
-        pop = self.update_fitness_population(pop)
+        pop = self.update_fitness_population_bound(pop, self.pop)
 
         # create new pop by comparing fitness of corresponding each member in pop and children
         self.pop = self.greedy_selection_population(self.pop, pop)
@@ -8,7 +8,6 @@
 #-------------------------------------------------------------------------------------------------------%
 
 import numpy as np
-from copy import deepcopy
 from mealpy.optimizer import Optimizer
 
 
@@ -61,32 +60,45 @@ class BaseEP(Optimizer):
         times_win = 0
         return [position, fitness, strategy, times_win]
 
+    def _generate_children(self):
+        pos_matrix = np.array([agent[self.ID_POS] for agent in self.pop])
+        str_matrix = np.array([agent[self.ID_STR] for agent in self.pop])
+        pos_new = pos_matrix + str_matrix * np.random.normal(0, 1.0, pos_matrix.shape)
+        pos_new = self.amend_position_faster(pos_new)
+        str_new = str_matrix + np.random.normal(0, 1.0, str_matrix.shape) * np.abs(str_matrix) ** 0.5
+        child = [[pos_new[idx], None, str_new[idx], 0] for idx in range(0, self.pop_size)]
+        return self.update_fitness_population(child)
+
+    def _update_times_win(self, pop):
+        """
+        Each agent fights bout_size times against random opponents, all bouts are resolved as one batch of 2-way tournaments.
+
+        Returns:
+            1-D numpy array, the accumulated times_win of each agent
+        """
+        n_agents = len(pop)
+        list_fitness = np.array([agent[self.ID_FIT][self.ID_TAR] for agent in pop])
+        list_contestants = np.column_stack((np.repeat(np.arange(n_agents), self.bout_size),
+                                            np.random.randint(0, n_agents, n_agents * self.bout_size)))
+        list_winners = self.get_winner_index_tournament(list_fitness, list_contestants)
+        list_wins = np.bincount(list_winners, minlength=n_agents)
+        for idx in range(0, n_agents):
+            pop[idx][self.ID_WIN] += list_wins[idx]
+        return np.array([agent[self.ID_WIN] for agent in pop])
+
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        child = []
-        for idx in range(0, self.pop_size):
-            pos_new = self.pop[idx][self.ID_POS] + self.pop[idx][self.ID_STR] * np.random.normal(0, 1.0, self.problem.n_dims)
-            pos_new = self.amend_position_faster(pos_new)
-            s_old = self.pop[idx][self.ID_STR] + np.random.normal(0, 1.0, self.problem.n_dims) * np.abs(self.pop[idx][self.ID_STR]) ** 0.5
-            child.append([pos_new, None, s_old, 0])
-        child = self.update_fitness_population(child)
+        child = self._generate_children()
 
         # Update the global best
         children, self.g_best = self.update_global_best_solution(child, save=False)
         pop = children + self.pop
-        for i in range(0, len(pop)):
-            ## Tournament winner (Tried with bout_size times)
-            for idx in range(0, self.bout_size):
-                rand_idx = np.random.randint(0, len(pop))
-                if self.compare_agent(pop[i], pop[rand_idx]):
-                    pop[i][self.ID_WIN] += 1
-                else:
-                    pop[rand_idx][self.ID_WIN] += 1
-        pop = sorted(pop, key=lambda item: item[self.ID_WIN], reverse=True)
-        self.pop = pop[:self.pop_size]
+        list_times_win = self._update_times_win(pop)
+        list_idx = np.argsort(-list_times_win, kind="stable")
+        self.pop = [pop[idx] for idx in list_idx[:self.pop_size]]
 
 
 class LevyEP(BaseEP):
@@ -108,45 +120,31 @@ class LevyEP(BaseEP):
         self.nfe_per_epoch = 2 * pop_size
         self.sort_flag = True
 
-    def evolve(self, mode='sequential', epoch=None, pop=None, g_best=None):
+    def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-
-        child = []
-        for idx in range(0, self.pop_size):
-            pos_new = self.pop[idx][self.ID_POS] + self.pop[idx][self.ID_STR] * np.random.normal(0, 1.0, self.problem.n_dims)
-            pos_new = self.amend_position_faster(pos_new)
-            s_old = self.pop[idx][self.ID_STR] + np.random.normal(0, 1.0, self.problem.n_dims) * np.abs(self.pop[idx][self.ID_STR]) ** 0.5
-            child.append([pos_new, None, s_old, 0])
-        child = self.update_fitness_population(child)
+        child = self._generate_children()
 
         # Update the global best
         children, self.g_best = self.update_global_best_solution(child, save=False)
         pop = children + self.pop
-        for i in range(0, len(pop)):
-            ## Tournament winner (Tried with bout_size times)
-            for idx in range(0, self.bout_size):
-                rand_idx = np.random.randint(0, len(pop))
-                if self.compare_agent(pop[i], pop[rand_idx]):
-                    pop[i][self.ID_WIN] += 1
-                else:
-                    pop[rand_idx][self.ID_WIN] += 1
+        list_times_win = self._update_times_win(pop)
 
         ## Keep the top population, but 50% of left population will make a comeback an take the good position
-        pop = sorted(pop, key=lambda agent: agent[self.ID_WIN], reverse=True)
-        pop = deepcopy(pop[:self.pop_size])
-        pop_left = deepcopy(pop[self.pop_size:])
+        list_idx = np.argsort(-list_times_win, kind="stable")
+        pop_left = [pop[idx] for idx in list_idx[self.pop_size:]]
+        pop = [pop[idx] for idx in list_idx[:self.pop_size]]
 
         ## Choice random 50% of population left
+        n_comeback = int(0.5 * len(pop_left))
+        idx_list = np.random.choice(len(pop_left), n_comeback, replace=False)
         pop_comeback = []
-        idx_list = np.random.choice(range(0, len(pop_left)), int(0.5 * len(pop_left)), replace=False)
         for idx in idx_list:
             levy = self.get_levy_flight_step(multiplier=0.001, case=-1)
-            pos_new = pop_left[idx][self.ID_POS] + 0.01 * levy
-            strategy = self.distance = 0.05 * (self.problem.ub - self.problem.lb)
-            pop_comeback.append([pos_new, None, strategy, 0])
+            pos_new = self.amend_position_faster(pop_left[idx][self.ID_POS] + 0.01 * levy)
+            pop_comeback.append([pos_new, None, self.distance.copy(), 0])
         pop_comeback = self.update_fitness_population(pop_comeback)
-        self.nfe_per_epoch = self.pop_size + int(0.5 * len(pop_left))
-        self.pop = self.get_sorted_strim_population(pop + pop_comeback, self.pop_size)
\ No newline at end of file
+        self.nfe_per_epoch = self.pop_size + n_comeback
+        self.pop = self.get_sorted_strim_population(pop + pop_comeback, self.pop_size)
@@ -44,7 +44,7 @@ class BaseGA(Optimizer):
         """
         # c1, c2 = self._get_parents_kway_tournament_selection__(pop, k_way=0.2)
         list_fitness = np.array([agent[self.ID_FIT][self.ID_TAR] for agent in self.pop])
-        pop = []
+        pop, list_parents = [], []
         for i in range(0, self.pop_size):
             ### Selection
             # c1, c2 = self._get_parents_kway_tournament_selection__(pop, k_way=0.2)
@@ -54,8 +54,10 @@ class BaseGA(Optimizer):
             w1 = self.pop[id_c1][self.ID_POS]
             w2 = self.pop[id_c2][self.ID_POS]
             ### Crossover
+            parent1, parent2 = w1, w2           # Without crossover, a child only differs from its parent by the mutation
             if np.random.uniform() < self.pc:
                 w1, w2 = self.crossover_arthmetic_recombination(w1, w2)
+                parent1, parent2 = None, None
 
             ### Mutation, remove third loop here
             w1 = np.where(np.random.uniform(0, 1, self.problem.n_dims) < self.pm, np.random.uniform(self.problem.lb, self.problem.ub), w1)
@@ -63,6 +65,8 @@ class BaseGA(Optimizer):
 
             if np.random.uniform() < 0.5:
                 pop.append([w1, None])
+                list_parents.append(parent1)
             else:
                 pop.append([w2, None])
-        self.pop = self.update_fitness_population(pop)
+                list_parents.append(parent2)
+        self.pop = self.update_fitness_population_delta(pop, list_parents)
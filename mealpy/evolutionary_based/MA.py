@@ -52,6 +52,7 @@ class BaseMA(Optimizer):
         Returns:
             The position position with 2 element: index of position/location and index of fitness wrapper
             The general format: [position, [target, [obj1, obj2, ...]], bitstring]
+            The bitstring is a boolean numpy array of bits_total bits, position is its decoded vector
 
         ## To get the position, fitness wrapper, target and obj list
         ##      A[self.ID_POS]                  --> Return: position
@@ -59,90 +60,94 @@ class BaseMA(Optimizer):
         ##      A[self.ID_FIT][self.ID_TAR]     --> Return: target
         ##      A[self.ID_FIT][self.ID_OBJ]     --> Return: [obj1, obj2, ...]
         """
-        position = np.random.uniform(self.problem.lb, self.problem.ub)
+        bitstring = np.random.uniform(0, 1, self.bits_total) < 0.5
+        position = self._decode(bitstring)
         fitness = self.get_fitness_position(position=position)
-        bitstring = ''.join(["1" if np.random.uniform() < 0.5 else "0" for _ in range(0, self.bits_total)])
         return [position, fitness, bitstring]
 
     def _decode(self, bitstring=None):
         """
-        Decode the random bitstring into real number
+        Decode the bit arrays into real numbers
         Args:
-            bitstring (str): "11000000100101000101010" - bits_per_param = 16, 32 bit for 2 variable. eg. x1 and x2
+            bitstring (nd.array): boolean array (bits_total,) or matrix (n_agents x bits_total), each group of
+                bits_per_param bits (most significant bit first) encodes one variable
 
         Returns:
-            list of real number (vector)
+            vector (n_dims,) or matrix (n_agents x n_dims) of real numbers
         """
-        vector = np.ones(self.problem.n_dims)
-        for idx in range(0, self.problem.n_dims):
-            param = bitstring[idx * self.bits_per_param: (idx + 1) * self.bits_per_param]  # Select 16 bit every time
-            vector[idx] = self.problem.lb[idx] + ((self.problem.ub[idx] - self.problem.lb[idx]) / ((2.0 ** self.bits_per_param) - 1)) * int(param, 2)
-        return vector
+        bitstring = np.asarray(bitstring)
+        list_power = 2.0 ** np.arange(self.bits_per_param - 1, -1, -1)
+        integers = bitstring.reshape(bitstring.shape[:-1] + (self.problem.n_dims, self.bits_per_param)) @ list_power
+        return self.problem.lb + ((self.problem.ub - self.problem.lb) / ((2.0 ** self.bits_per_param) - 1)) * integers
 
     def _crossover(self, dad=None, mom=None):
-        if np.random.uniform() >= self.pc:
-            temp = deepcopy([dad])
-            return temp[0]
-        else:
-            child = ""
-            for idx in range(0, self.bits_total):
-                if np.random.uniform() < 0.5:
-                    child += dad[idx]
-                else:
-                    child += mom[idx]
-            return child
+        """
+        Uniform crossover of whole populations
+
+        Args:
+            dad (nd.array): boolean matrix (n_agents x bits_total)
+            mom (nd.array): boolean matrix (n_agents x bits_total)
+
+        Returns:
+            boolean matrix (n_agents x bits_total), a row is copied from dad when no crossover happens
+        """
+        list_cross = np.random.uniform(0, 1, len(dad)) < self.pc
+        mask = np.random.uniform(0, 1, dad.shape) >= 0.5
+        return np.where(list_cross[:, None] & mask, mom, dad)
 
     def _point_mutation(self, bitstring=None):
-        child = ""
-        for bit in bitstring:
-            if np.random.uniform() < self.pc:
-                child += "0" if bit == "1" else "1"
-            else:
-                child += bit
-        return child
-
-    def _bits_climber(self, child=None):
-        current = deepcopy(child)
+        """
+        Args:
+            bitstring (nd.array): boolean matrix (n_agents x bits_total)
+
+        Returns:
+            boolean matrix with each bit flipped with probability pm
+        """
+        return bitstring ^ (np.random.uniform(0, 1, bitstring.shape) < self.pm)
+
+    def _bits_climber(self, pop=None):
+        """
+        Hill climbing of many agents at the same time, each local move is evaluated for all agents as one batch
+
+        Args:
+            pop (list): agents to be improved
+
+        Returns:
+            list of improved agents
+        """
+        current = deepcopy(pop)
         for idx in range(0, self.max_local_gens):
-            child = deepcopy(current)
-            bitstring_new = self._point_mutation(child[self.ID_BIT])
+            bitstring_new = self._point_mutation(np.array([agent[self.ID_BIT] for agent in current]))
             pos_new = self._decode(bitstring_new)
-            fit_new = self.get_fitness_position(pos_new)
-            current = self.get_better_solution(child, [pos_new, fit_new, bitstring_new])
+            pop_new = self.update_fitness_population([[pos_new[i], None, bitstring_new[i]] for i in range(0, len(current))])
+            list_better = self.compare_population(pop_new, current)
+            current = [pop_new[i] if list_better[i] else current[i] for i in range(0, len(current))]
         return current
 
-    def create_child(self, idx, pop_copy):
-        ancient = pop_copy[idx + 1] if idx % 2 == 0 else pop_copy[idx - 1]
-        if idx == self.pop_size - 1:
-            ancient = pop_copy[0]
-        bitstring_new = self._crossover(pop_copy[idx][self.ID_BIT], ancient[self.ID_BIT])
-        bitstring_new = self._point_mutation(bitstring_new)
-        pos_new = self._decode(bitstring_new)
-        fit_new = self.get_fitness_position(pos_new)
-        return [pos_new, fit_new, bitstring_new]
-
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
         nfe_epoch = self.pop_size
-        ## Binary tournament
-        children = [self.get_solution_kway_tournament_selection(self.pop, k_way=2, output=1)[0] for _ in range(self.pop_size)]
-        pop = []
-        for idx in range(0, self.pop_size):
-            ancient = children[idx + 1] if idx % 2 == 0 else children[idx - 1]
-            if idx == self.pop_size - 1:
-                ancient = children[0]
-            bitstring_new = self._crossover(children[idx][self.ID_BIT], ancient[self.ID_BIT])
-            bitstring_new = self._point_mutation(bitstring_new)
-            pos_new = self._decode(bitstring_new)
-            pop.append([pos_new, None, bitstring_new])
-        self.pop = self.update_fitness_population(pop)
+        ## Binary tournament between two distinct agents
+        list_first = np.random.randint(0, self.pop_size, self.pop_size)
+        list_contestants = np.stack((list_first, self.get_index_random_partner(self.pop_size, list_first)), axis=1)
+        list_idx = self.get_winner_index_tournament(self.get_fitness_vector(self.pop), list_contestants)
+        children = np.array([self.pop[idx][self.ID_BIT] for idx in list_idx])
+        ## Mate with the neighbour: (0, 1), (1, 0), (2, 3), (3, 2)..., the last agent mates with the first one
+        list_mate = np.arange(0, self.pop_size) + np.where(np.arange(0, self.pop_size) % 2 == 0, 1, -1)
+        list_mate[-1] = 0
+        bitstring_new = self._crossover(children, children[list_mate])
+        bitstring_new = self._point_mutation(bitstring_new)
+        pos_new = self._decode(bitstring_new)
+        self.pop = self.update_fitness_population([[pos_new[idx], None, bitstring_new[idx]] for idx in range(0, self.pop_size)])
 
         # Searching in local
-        for i in range(0, self.pop_size):
-            if np.random.rand() < self.p_local:
-                self.pop[i] = self._bits_climber(pop[i])
-                nfe_epoch += self.max_local_gens
+        list_local = np.flatnonzero(np.random.rand(self.pop_size) < self.p_local)
+        if len(list_local) > 0:
+            pop_local = self._bits_climber([self.pop[i] for i in list_local])
+            for i, agent in zip(list_local, pop_local):
+                self.pop[i] = agent
+            nfe_epoch += self.max_local_gens * len(list_local)
         self.nfe_per_epoch = nfe_epoch
@@ -8,9 +8,9 @@
 # ------------------------------------------------------------------------------------------------------%
 
 import numpy as np
-from scipy.spatial.distance import cdist
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils.pairwise import get_nearest_neighbour
 
 
 class BaseBRO(Optimizer):
@@ -60,65 +60,101 @@ class BaseBRO(Optimizer):
         damage = 0
         return [position, fitness, damage]
 
-    def find_argmin_distance(self, target_pos=None, pop=None):
-        list_pos = np.array([pop[idx][self.ID_POS] for idx in range(0, self.pop_size)])
-        target_pos = np.reshape(target_pos, (1, -1))
-        dist_list = cdist(list_pos, target_pos, 'euclidean')
-        dist_list = np.reshape(dist_list, (-1))
-        idx = np.argmin(dist_list[np.nonzero(dist_list)])
-        return idx
+    def find_argmin_distance(self, pos_matrix=None):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (pop_size x n_dims) of the soldier positions
 
-    def evolve(self, epoch):
+        Returns:
+            1-D integer array, the index of the nearest other soldier of each soldier (itself is excluded)
+        """
+        list_idx, _ = get_nearest_neighbour(pos_matrix)
+        ## All soldiers stand at the same place, fight the next one
+        list_none = np.where(list_idx == -1)[0]
+        list_idx[list_none] = (list_none + 1) % len(pos_matrix)
+        return list_idx
+
+    def _get_last_writes(self, list_slots):
         """
         Args:
-            epoch (int): The current iteration
+            list_slots (nd.array): 1-D integer array, the soldier slot written by each update, in the order of the battles
+
+        Returns:
+            1-D integer array, the index of the last update of each written slot (later battles overwrite earlier ones)
+        """
+        list_slots = np.asarray(list_slots)
+        _, list_first = np.unique(list_slots[::-1], return_index=True)
+        return len(list_slots) - 1 - list_first
+
+    def _update_population(self, list_slots, pos_new, dam_new, list_copy):
         """
-        nfe_epoch = 0
-        for i in range(self.pop_size):
-            # Compare ith soldier with nearest one (jth)
-            j = self.find_argmin_distance(self.pop[i][self.ID_POS], self.pop)
-            if self.compare_agent(self.pop[i], self.pop[j]):
-                ## Update Winner based on global best solution
-                pos_new = self.pop[i][self.ID_POS] + np.random.uniform() * \
-                          np.mean(np.array([self.pop[i][self.ID_POS], self.g_best[self.ID_POS]]), axis=0)
-                fit_new = self.get_fitness_position(pos_new)
-                dam_new = self.pop[i][self.ID_DAM] - 1  ## Substract damaged hurt -1 to go next battle
-                self.pop[i] = [pos_new, fit_new, dam_new]
-                ## Update Loser
-                if self.pop[j][self.ID_DAM] < self.threshold:  ## If loser not dead yet, move it based on general
-                    pos_new = np.random.uniform() * (np.maximum(self.pop[j][self.ID_POS], self.g_best[self.ID_POS]) -
-                                                       np.minimum(self.pop[j][self.ID_POS], self.g_best[self.ID_POS])) + \
-                                          np.maximum(self.pop[j][self.ID_POS], self.g_best[self.ID_POS])
-                    dam_new = self.pop[j][self.ID_DAM] + 1
-
-                    self.pop[j][self.ID_FIT] = self.get_fitness_position(self.pop[j][self.ID_POS])
-                else:  ## Loser dead and respawn again
-                    pos_new = np.random.uniform(self.problem.lb, self.problem.ub)
-                    dam_new = 0
-                pos_new = self.amend_position_faster(pos_new)
-                fit_new = self.get_fitness_position(pos_new)
-                self.pop[j] = [pos_new, fit_new, dam_new]
-                nfe_epoch += 2
-            else:
-                ## Update Loser by following position of Winner
-                self.pop[i] = deepcopy(self.pop[j])
-                ## Update Winner by following position of General to protect the King and General
-                pos_new = self.pop[j][self.ID_POS] + np.random.uniform() * (self.g_best[self.ID_POS] - self.pop[j][self.ID_POS])
-                pos_new = self.amend_position_faster(pos_new)
-                fit_new = self.get_fitness_position(pos_new)
-                dam_new = 0
-                self.pop[j] = [pos_new, fit_new, dam_new]
-                nfe_epoch += 1
-        self.nfe_per_epoch = nfe_epoch
+        Args:
+            list_slots (nd.array): soldier slot of each update
+            pos_new (nd.array): 2-D matrix, the new position of each update
+            dam_new (nd.array): the new damage of each update
+            list_copy (nd.array): index of the soldier copied by each update, -1 if the new position must be evaluated
+        """
+        list_keep = self._get_last_writes(list_slots)
+        list_eval = list_keep[list_copy[list_keep] == -1]
+        pop_new = self.update_fitness_population([[pos, None] for pos in pos_new[list_eval]])
+        pop_old = self.pop
+        self.pop = [agent for agent in pop_old]
+        for idx in list_keep[list_copy[list_keep] != -1]:
+            self.pop[list_slots[idx]] = [pop_old[list_copy[idx]][self.ID_POS].copy(),
+                                         deepcopy(pop_old[list_copy[idx]][self.ID_FIT]), dam_new[idx]]
+        for idx, agent in zip(list_eval, pop_new):
+            self.pop[list_slots[idx]] = [agent[self.ID_POS], agent[self.ID_FIT], dam_new[idx]]
+        self.nfe_per_epoch = len(list_eval)
+
+    def _shrink_bounds(self, epoch):
         if epoch >= self.dyn_delta:  # max_epoch = 1000 -> delta = 300, 450, >500,....
-            pos_list = np.array([self.pop[idx][self.ID_POS] for idx in range(0, self.pop_size)])
-            pos_std = np.std(pos_list, axis=0)
+            pos_std = np.std(self.get_position_matrix(self.pop), axis=0)
             lb = self.g_best[self.ID_POS] - pos_std
             ub = self.g_best[self.ID_POS] + pos_std
             self.problem.lb = np.clip(lb, self.problem.lb, self.problem.ub)
             self.problem.ub = np.clip(ub, self.problem.lb, self.problem.ub)
             self.dyn_delta += np.round(self.dyn_delta / 2)
 
+    def evolve(self, epoch):
+        """
+        All battles of an epoch are fought on the population at the start of the epoch (one nearest-neighbour query),
+        when a soldier takes part in several battles the last one decides its new state.
+
+        Args:
+            epoch (int): The current iteration
+        """
+        pos_matrix = self.get_position_matrix(self.pop)
+        list_dam = np.array([agent[self.ID_DAM] for agent in self.pop])
+        list_idx = np.arange(self.pop_size)
+        # Compare ith soldier with nearest one (jth)
+        list_j = self.find_argmin_distance(pos_matrix)
+        list_win = self.compare_population(self.pop, [self.pop[j] for j in list_j])
+        g_best = self.g_best[self.ID_POS]
+        r1 = np.random.uniform(0, 1, (self.pop_size, 1))
+        r2 = np.random.uniform(0, 1, (self.pop_size, 1))
+        pos_i, pos_j = pos_matrix, pos_matrix[list_j]
+
+        ## ith soldier: the winner moves based on global best solution, the loser follows position of the winner
+        pos_new_i = np.where(list_win[:, None], pos_i + r1 * (pos_i + g_best) / 2, pos_j)
+        dam_new_i = np.where(list_win, list_dam - 1, list_dam[list_j])   ## Substract damaged hurt -1 to go next battle
+        copy_i = np.where(list_win, -1, list_j)
+
+        ## jth soldier: the loser moves based on general or dies and respawns again,
+        ##      the winner follows position of general to protect the king and general
+        pos_max, pos_min = np.maximum(pos_j, g_best), np.minimum(pos_j, g_best)
+        pos_respawn = np.random.uniform(self.problem.lb, self.problem.ub, (self.pop_size, self.problem.n_dims))
+        list_alive = list_dam[list_j] < self.threshold
+        pos_new_j = np.where(list_alive[:, None], r2 * (pos_max - pos_min) + pos_max, pos_respawn)
+        pos_new_j = np.where(list_win[:, None], pos_new_j, pos_j + r2 * (g_best - pos_j))
+        dam_new_j = np.where(list_win & list_alive, list_dam[list_j] + 1, 0)
+        copy_j = -np.ones(self.pop_size, dtype=int)
+
+        pos_new = np.stack([pos_new_i, pos_new_j], axis=1).reshape(-1, self.problem.n_dims)
+        pos_new = self.amend_position_faster(pos_new)
+        self._update_population(np.stack([list_idx, list_j], axis=1).ravel(), pos_new,
+                                np.stack([dam_new_i, dam_new_j], axis=1).ravel(), np.stack([copy_i, copy_j], axis=1).ravel())
+        self._shrink_bounds(epoch)
+
 
 class OriginalBRO(BaseBRO):
     """
@@ -144,29 +180,30 @@ class OriginalBRO(BaseBRO):
         Args:
             epoch (int): The current iteration
         """
-        for i in range(self.pop_size):
-            # Compare ith soldier with nearest one (jth)
-            j = self.find_argmin_distance(self.pop[i][self.ID_POS], self.pop)
-            dam, vic = i, j  ## This error in the algorithm's flow in the paper, But in the matlab code, he changed.
-            if self.compare_agent(self.pop[i], self.pop[j]):
-                dam, vic = j, i  ## The mistake also here in the paper.
-            if self.pop[dam][self.ID_DAM] < self.threshold:
-                pos_new = np.random.uniform(0, 1, self.problem.n_dims) * \
-                          (np.maximum(self.pop[dam][self.ID_POS], self.g_best[self.ID_POS]) -
-                            np.minimum(self.pop[dam][self.ID_POS], self.g_best[self.ID_POS])) + \
-                            np.maximum(self.pop[dam][self.ID_POS], self.g_best[self.ID_POS])
-                self.pop[dam][self.ID_POS] = self.amend_position_faster(pos_new)
-                self.pop[dam][self.ID_FIT] = self.get_fitness_position(self.pop[dam][self.ID_POS])
-                self.pop[dam][self.ID_DAM] += 1
-                self.pop[vic][self.ID_DAM] = 0
-            else:
-                self.pop[dam] = self.create_solution()
-        if epoch >= self.dyn_delta:
-            pos_list = np.array([self.pop[idx][self.ID_POS] for idx in range(0, self.pop_size)])
-            pos_std = np.std(pos_list, axis=0)
-            lb = self.g_best[self.ID_POS] - pos_std
-            ub = self.g_best[self.ID_POS] + pos_std
-            self.problem.lb = np.clip(lb, self.problem.lb, self.problem.ub)
-            self.problem.ub = np.clip(ub, self.problem.lb, self.problem.ub)
-            self.dyn_delta += round(self.dyn_delta / 2)
+        pos_matrix = self.get_position_matrix(self.pop)
+        list_dam = np.array([agent[self.ID_DAM] for agent in self.pop])
+        list_idx = np.arange(self.pop_size)
+        # Compare ith soldier with nearest one (jth)
+        list_j = self.find_argmin_distance(pos_matrix)
+        ## This error in the algorithm's flow in the paper, But in the matlab code, he changed.
+        list_win = self.compare_population(self.pop, [self.pop[j] for j in list_j])
+        list_dam_id = np.where(list_win, list_j, list_idx)
+        list_vic_id = np.where(list_win, list_idx, list_j)
+        list_alive = list_dam[list_dam_id] < self.threshold
+
+        ## The damaged soldier moves based on general or dies and respawns again, the victor heals
+        pos_dam = pos_matrix[list_dam_id]
+        pos_max, pos_min = np.maximum(pos_dam, self.g_best[self.ID_POS]), np.minimum(pos_dam, self.g_best[self.ID_POS])
+        pos_move = np.random.uniform(0, 1, (self.pop_size, self.problem.n_dims)) * (pos_max - pos_min) + pos_max
+        pos_respawn = np.random.uniform(self.problem.lb, self.problem.ub, (self.pop_size, self.problem.n_dims))
+        pos_new = np.where(list_alive[:, None], pos_move, pos_respawn)
+        pos_new = self.amend_position_faster(pos_new)
+        dam_new = np.where(list_alive, list_dam[list_dam_id] + 1, 0)
 
+        ## The victor keeps its position, only its damage is reset
+        pos_vic = pos_matrix[list_vic_id]
+        list_slots = np.stack([list_dam_id, list_vic_id], axis=1).ravel()
+        list_copy = np.stack([-np.ones(self.pop_size, dtype=int), list_vic_id], axis=1).ravel()
+        self._update_population(list_slots, np.stack([pos_new, pos_vic], axis=1).reshape(-1, self.problem.n_dims),
+                                np.stack([dam_new, np.zeros(self.pop_size, dtype=int)], axis=1).ravel(), list_copy)
+        self._shrink_bounds(epoch)
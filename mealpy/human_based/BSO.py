@@ -10,6 +10,7 @@
 import numpy as np
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils import group
 
 
 class ImprovedBSO(Optimizer):
@@ -48,25 +49,22 @@ class ImprovedBSO(Optimizer):
         self.p4 = p4
         self.m_solution = int(self.pop_size / self.m_clusters)
 
-        self.pop_group, self.centers = None, None
+        ## group_ids[k] is the cluster of the k-th agent, the last cluster also gets the remaining agents
+        self.group_ids = np.minimum(np.arange(0, self.pop_size) // self.m_solution, self.m_clusters - 1)
+        self.centers = None
 
-    def _find_cluster(self, pop_group):
-        centers = []
-        for i in range(0, self.m_clusters):
-            _, local_best = self.get_global_best_solution(pop_group[i])
-            centers.append(deepcopy(local_best))
-        return centers
+    def _find_cluster(self, pop):
+        list_best = group.get_group_best(self.get_fitness_vector(pop), self.group_ids, self.m_clusters, self.problem.minmax)
+        return [deepcopy(pop[idx]) for idx in list_best]
 
-    def _make_group(self, pop):
-        pop_group = []
-        for idx in range(0, self.m_clusters):
-            pop_group.append(deepcopy(pop[idx * self.m_solution:(idx + 1) * self.m_solution]))
-        return pop_group
+    def _get_two_clusters(self):
+        id1 = np.random.randint(0, self.m_clusters, self.pop_size)
+        id2 = (id1 + np.random.randint(1, self.m_clusters, self.pop_size)) % self.m_clusters
+        return id1, id2
 
     def initialization(self):
         self.pop = self.create_population(self.pop_size)
-        self.pop_group = self._make_group(self.pop)
-        self.centers = self._find_cluster(self.pop_group)
+        self.centers = self._find_cluster(self.pop)
         _, self.g_best = self.get_global_best_solution(self.pop)
 
     def evolve(self, epoch):
@@ -81,37 +79,30 @@ class ImprovedBSO(Optimizer):
             solution_new = self.create_solution()
             self.centers[idx] = solution_new
 
-        pop_group = deepcopy(self.pop_group)
-        for i in range(0, self.pop_size):  # Generate new individuals
-            cluster_id = int(i / self.m_solution)
-            location_id = int(i % self.m_solution)
-
-            if np.random.uniform() < self.p2:  # p_6b
-                if np.random.uniform() < self.p3:
-                    pos_new = self.centers[cluster_id][self.ID_POS] + epxilon * np.random.uniform()
-                else:  # 2. Using levy flight here
-                    levy_step = self.get_levy_flight_step(beta=1.0, multiplier=0.001, case=-1)
-                    pos_new = self.pop_group[cluster_id][location_id][self.ID_POS] + np.random.normal(0, 1, self.problem.n_dims) * levy_step
-            else:
-                id1, id2 = np.random.choice(range(0, self.m_clusters), 2, replace=False)
-                if np.random.uniform() < self.p4:
-                    pos_new = 0.5 * (self.centers[id1][self.ID_POS] + self.centers[id2][self.ID_POS]) + epxilon * np.random.uniform()
-                else:
-                    rand_id1 = np.random.randint(0, self.m_solution)
-                    rand_id2 = np.random.randint(0, self.m_solution)
-                    pos_new = 0.5 * (self.pop_group[id1][rand_id1][self.ID_POS] + self.pop_group[id2][rand_id2][self.ID_POS]) + \
-                              epxilon * np.random.uniform()
-            pos_new = self.amend_position_random(pos_new)
-            pop_group[cluster_id][location_id] = [pos_new, None]
-        pop_group = [self.update_fitness_population(group) for group in pop_group]
-        for idx in range(0, self.m_clusters):
-            self.pop_group[idx] = self.greedy_selection_population(self.pop_group[idx], pop_group[idx])
+        # Generate new individuals
+        pos_matrix = self.get_position_matrix(self.pop)
+        pos_centers = self.get_position_matrix(self.centers)
+        r1, r2, r3 = np.random.uniform(0, 1, (3, self.pop_size, 1))
+        noise = epxilon * np.random.uniform(0, 1, (self.pop_size, 1))
+        ## p_6b: changed by its own cluster
+        pos_center = pos_centers[self.group_ids] + noise
+        # 2. Using levy flight here
+        levy_step = self.get_levy_flight_step(beta=1.0, multiplier=0.001, case=-1, size=(self.pop_size, 1))
+        pos_levy = pos_matrix + np.random.normal(0, 1, pos_matrix.shape) * levy_step
+        pos_local = np.where(r2 < self.p3, pos_center, pos_levy)
+        ## Changed by two other clusters
+        id1, id2 = self._get_two_clusters()
+        pos_two_centers = 0.5 * (pos_centers[id1] + pos_centers[id2]) + noise
+        rand_id1 = group.get_random_member(self.group_ids, id1, self.m_clusters)
+        rand_id2 = group.get_random_member(self.group_ids, id2, self.m_clusters)
+        pos_two_members = 0.5 * (pos_matrix[rand_id1] + pos_matrix[rand_id2]) + noise
+        pos_global = np.where(r3 < self.p4, pos_two_centers, pos_two_members)
+        pos_new = self.amend_position_random(np.where(r1 < self.p2, pos_local, pos_global))
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], self.pop)
+        self.pop = self.greedy_selection_population(self.pop, pop_new)
 
         # Needed to update the centers and population
-        self.centers = self._find_cluster(self.pop_group)
-        self.pop = []
-        for idx in range(0, self.m_clusters):
-            self.pop += self.pop_group[idx]
+        self.centers = self._find_cluster(self.pop)
 
 
 class BaseBSO(ImprovedBSO):
@@ -157,38 +148,27 @@ class BaseBSO(ImprovedBSO):
             solution_new = self.create_solution()
             self.centers[idx] = solution_new
 
-        pop_group = deepcopy(self.pop_group)
-        for i in range(0, self.pop_size):  # Generate new individuals
-            cluster_id = int(i / self.m_solution)
-            location_id = int(i % self.m_solution)
-
-            if np.random.uniform() < self.p2:  # p_6b
-                if np.random.uniform() < self.p3:  # p_6i
-                    cluster_id = np.random.randint(0, self.m_clusters)
-                if np.random.uniform() < self.p3:
-                    pos_new = self.centers[cluster_id][self.ID_POS] + epxilon * np.random.normal(self.miu, self.xichma)
-                else:
-                    rand_idx = np.random.randint(0, self.m_solution)
-                    pos_new = self.pop_group[cluster_id][rand_idx][self.ID_POS] + np.random.uniform()
-            else:
-                id1, id2 = np.random.choice(range(0, self.m_clusters), 2, replace=False)
-                if np.random.uniform() < self.p4:
-                    pos_new = 0.5 * (self.centers[id1][self.ID_POS] + self.centers[id2][self.ID_POS]) + \
-                              epxilon * np.random.normal(self.miu, self.xichma)
-                else:
-                    rand_id1 = np.random.randint(0, self.m_solution)
-                    rand_id2 = np.random.randint(0, self.m_solution)
-                    pos_new = 0.5 * (self.pop_group[id1][rand_id1][self.ID_POS] + self.pop_group[id2][rand_id2][self.ID_POS]) + \
-                              epxilon * np.random.normal(self.miu, self.xichma)
-            pos_new = self.amend_position_random(pos_new)
-            pop_group[cluster_id][location_id] = [pos_new, None]
-        pop_group = [self.update_fitness_population(group) for group in pop_group]
-        for idx in range(0, self.m_clusters):
-            self.pop_group[idx] = self.greedy_selection_population(self.pop_group[idx], pop_group[idx])
+        # Generate new individuals
+        pos_matrix = self.get_position_matrix(self.pop)
+        pos_centers = self.get_position_matrix(self.centers)
+        r1, r2, r3, r4 = np.random.uniform(0, 1, (4, self.pop_size, 1))
+        noise = epxilon * np.random.normal(self.miu, self.xichma, (self.pop_size, 1))
+        ## p_6b: changed by one cluster (p_6i: a random cluster instead of its own cluster)
+        cluster_id = np.where(r2[:, 0] < self.p3, np.random.randint(0, self.m_clusters, self.pop_size), self.group_ids)
+        pos_center = pos_centers[cluster_id] + noise
+        rand_idx = group.get_random_member(self.group_ids, cluster_id, self.m_clusters)
+        pos_member = pos_matrix[rand_idx] + np.random.uniform(0, 1, (self.pop_size, 1))
+        pos_local = np.where(r3 < self.p3, pos_center, pos_member)
+        ## Changed by two other clusters
+        id1, id2 = self._get_two_clusters()
+        pos_two_centers = 0.5 * (pos_centers[id1] + pos_centers[id2]) + noise
+        rand_id1 = group.get_random_member(self.group_ids, id1, self.m_clusters)
+        rand_id2 = group.get_random_member(self.group_ids, id2, self.m_clusters)
+        pos_two_members = 0.5 * (pos_matrix[rand_id1] + pos_matrix[rand_id2]) + noise
+        pos_global = np.where(r4 < self.p4, pos_two_centers, pos_two_members)
+        pos_new = self.amend_position_random(np.where(r1 < self.p2, pos_local, pos_global))
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], self.pop)
+        self.pop = self.greedy_selection_population(self.pop, pop_new)
 
         # Needed to update the centers and population
-        self.centers = self._find_cluster(self.pop_group)
-        self.pop = []
-        for idx in range(0, self.m_clusters):
-            self.pop += self.pop_group[idx]
-
+        self.centers = self._find_cluster(self.pop)
@@ -61,7 +61,7 @@ class BaseFBIO(Optimizer):
                                             (self.pop[nb1][self.ID_POS][n_change] + self.pop[nb2][self.ID_POS][n_change]) / 2)
             pos_a = self.amend_position_random(pos_a)
             pop_new.append([pos_a, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         pop_new = self.greedy_selection_population(self.pop, pop_new)
         list_fitness = np.array([item[self.ID_FIT][self.ID_TAR] for item in pop_new])
         prob = self.probability(list_fitness)
@@ -79,7 +79,7 @@ class BaseFBIO(Optimizer):
             else:
                 pos_new = np.random.uniform(self.problem.lb, self.problem.ub)
             pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         pop_child = self.greedy_selection_population(pop_new, pop_child)
 
         ## Persuing team - team B
@@ -92,7 +92,7 @@ class BaseFBIO(Optimizer):
                     np.random.uniform(0, 1, self.problem.n_dims) * (self.g_best[self.ID_POS] - pop_child[idx][self.ID_POS])
             pos_b = self.amend_position_random(pos_b)
             pop_new.append([pos_b, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, pop_child)
         pop_new = self.greedy_selection_population(pop_child, pop_new)
 
         ## Step B2
@@ -109,7 +109,7 @@ class BaseFBIO(Optimizer):
                         np.random.uniform() * (self.g_best[self.ID_POS] - pop_new[idx][self.ID_POS])
             pos_b = self.amend_position_random(pos_b)
             pop_child.append([pos_b, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
 
 
@@ -156,7 +156,7 @@ class OriginalFBIO(BaseFBIO):
             ## Not good move here, change only 1 variable but check bound of all variable in solution
             pos_a = self.amend_position_random(pos_a)
             pop_new.append([pos_a, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         pop_new = self.greedy_selection_population(self.pop, pop_new)
 
         # Step A2
@@ -179,7 +179,7 @@ class OriginalFBIO(BaseFBIO):
             else:
                 pos_a = np.random.uniform(self.problem.lb, self.problem.ub)
             pop_child.append([pos_a, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         pop_child = self.greedy_selection_population(pop_new, pop_child)
 
         ## Persuing team - team B
@@ -193,7 +193,7 @@ class OriginalFBIO(BaseFBIO):
                            np.random.uniform() * (self.g_best[self.ID_POS][j] - pop_child[i][self.ID_POS][j])
             pos_b = self.amend_position_random(pos_b)
             pop_new.append([pos_b, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, pop_child)
         pop_new = self.greedy_selection_population(pop_child, pop_new)
 
         ## Step B2
@@ -213,5 +213,5 @@ class OriginalFBIO(BaseFBIO):
                         np.random.uniform() * (self.g_best[self.ID_POS] - pop_new[i][self.ID_POS])
             pos_b = self.amend_position_random(pos_b)
             pop_child.append([pos_b, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
@@ -10,6 +10,7 @@
 import numpy as np
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils import group
 
 
 class BaseICA(Optimizer):
@@ -51,89 +52,82 @@ class BaseICA(Optimizer):
         self.revolution_step_size_damp = revolution_step_size_damp
         self.zeta = zeta
 
-        self.pop_empires, self.pop_colonies, self.empires = None, None, None
-        self.n_revoluted_variables, self.idx_list_variables = None, None
+        self.pop_empires, self.pop_colonies, self.colony_ids = None, None, None
+        self.n_revoluted_variables = None
 
-    def revolution_country(self, position, idx_list_variables, n_revoluted):
-        pos_new = position + self.revolution_step_size * np.random.normal(0, 1, self.problem.n_dims)
-        idx_list = np.random.choice(idx_list_variables, n_revoluted, replace=False)
-        position[idx_list] = pos_new[idx_list]      # Change only those selected index
-        return position
+    def revolution_country(self, position, n_revoluted):
+        """
+        Args:
+            position (nd.array): 2-D matrix (n_countries x n_dims)
+            n_revoluted (int): number of changed variables of each country
+
+        Returns:
+            2-D matrix, only n_revoluted random variables of each row are changed
+        """
+        pos_new = position + self.revolution_step_size * np.random.normal(0, 1, position.shape)
+        idx_list = np.argsort(np.random.uniform(0, 1, position.shape), axis=1)[:, :n_revoluted]
+        mask = np.zeros(position.shape, dtype=bool)
+        np.put_along_axis(mask, idx_list, True, axis=1)
+        return np.where(mask, pos_new, position)      # Change only those selected index
 
     def initialization(self):
         pop = self.create_population(self.pop_size)
         self.pop, self.g_best = self.get_global_best_solution(pop)
+        if self.problem.minmax == "max":
+            self.pop = self.pop[::-1]
 
         # Initialization
         self.n_revoluted_variables = int(round(self.revolution_rate * self.problem.n_dims))
-        self.idx_list_variables = list(range(0, self.problem.n_dims))
 
         # pop = Empires
         colony_count = self.pop_size - self.empire_count
         self.pop_empires = deepcopy(self.pop[:self.empire_count])
         self.pop_colonies = deepcopy(self.pop[self.empire_count:])
 
-        cost_empires_list = np.array([solution[self.ID_FIT][self.ID_TAR] for solution in self.pop_empires])
+        cost_empires_list = self.get_fitness_vector(self.pop_empires)
         cost_empires_list_normalized = cost_empires_list - (np.max(cost_empires_list) + np.min(cost_empires_list))
         prob_empires_list = np.abs(cost_empires_list_normalized / np.sum(cost_empires_list_normalized))
-        # Randomly choose colonies to empires
-        self.empires = {}
-        idx_already_selected = []
-        for i in range(0, self.empire_count - 1):
-            self.empires[i] = []
-            n_colonies = int(round(prob_empires_list[i] * colony_count))
-            idx_list = np.random.choice(list(set(range(0, colony_count)) - set(idx_already_selected)), n_colonies, replace=False).tolist()
-            idx_already_selected += idx_list
-            for idx in idx_list:
-                self.empires[i].append(self.pop_colonies[idx])
-        idx_last = list(set(range(0, colony_count)) - set(idx_already_selected))
-        self.empires[self.empire_count - 1] = []
-        for idx in idx_last:
-            self.empires[self.empire_count - 1].append(self.pop_colonies[idx])
+        # Randomly choose colonies to empires: colony_ids[k] is the empire that owns the k-th colony
+        list_n_colonies = np.round(prob_empires_list[:-1] * colony_count).astype(int)
+        colony_ids = group.create_group_ids(list_n_colonies, shuffle=False)[:colony_count]
+        colony_ids = np.concatenate((colony_ids, (self.empire_count - 1) * np.ones(colony_count - len(colony_ids), dtype=int)))
+        self.colony_ids = np.random.permutation(colony_ids)
 
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
+        n_empires = len(self.pop_empires)
+        pos_empires = self.get_position_matrix(self.pop_empires)
+        pos_colonies = self.get_position_matrix(self.pop_colonies)
+
         # Assimilation
-        for idx, colonies in self.empires.items():
-            for idx_colony, colony in enumerate(colonies):
-                pos_new = colony[self.ID_POS] + self.assimilation_coeff * \
-                          np.random.uniform(0, 1, self.problem.n_dims) * (self.pop_empires[idx][self.ID_POS] - colony[self.ID_POS])
-                pos_new = self.amend_position_faster(pos_new)
-                self.empires[idx][idx_colony][self.ID_POS] = pos_new
-            self.empires[idx] = self.update_fitness_population(self.empires[idx])
-            # empires[idx], g_best = self.update_global_best_solution(empires[idx], self.ID_MIN_PROB, g_best)
-
-        # Revolution
-        for idx, colonies in self.empires.items():
-            # Apply revolution to Imperialist
-            pos_new = self.revolution_country(self.pop_empires[idx][self.ID_POS], self.idx_list_variables, self.n_revoluted_variables)
-            self.pop_empires[idx][self.ID_POS] = self.amend_position_faster(pos_new)
-
-            # Apply revolution to Colonies
-            for idx_colony, colony in enumerate(colonies):
-                if np.random.rand() < self.revolution_prob:
-                    pos_new = self.revolution_country(colony[self.ID_POS], self.idx_list_variables, self.n_revoluted_variables)
-                    self.empires[idx][idx_colony][self.ID_POS] = self.amend_position_faster(pos_new)
-            self.empires[idx] = self.update_fitness_population(self.empires[idx])
-        self.pop_empires = self.update_fitness_population(self.pop_empires)
-        _, g_best = self.update_global_best_solution(self.pop_empires)
-
-        # Intra-Empire Competition
-        for idx, colonies in self.empires.items():
-            for idx_colony, colony in enumerate(colonies):
-                if self.compare_agent(colony, self.pop_empires[idx]):
-                    self.empires[idx][idx_colony], self.pop_empires[idx] = deepcopy(self.pop_empires[idx]), deepcopy(colony)
+        pos_colonies = pos_colonies + self.assimilation_coeff * np.random.uniform(0, 1, pos_colonies.shape) * \
+                       (pos_empires[self.colony_ids] - pos_colonies)
+        pos_colonies = self.amend_position_faster(pos_colonies)
+
+        # Revolution: all imperialists and some colonies
+        pos_empires = self.amend_position_faster(self.revolution_country(pos_empires, self.n_revoluted_variables))
+        list_revolution = np.random.rand(len(pos_colonies)) < self.revolution_prob
+        pos_colonies[list_revolution] = self.amend_position_faster(
+            self.revolution_country(pos_colonies[list_revolution], self.n_revoluted_variables))
+        ## Only the imperialists have an evaluated parent, the colonies are all moved by the assimilation
+        list_parents = list(self.get_position_matrix(self.pop_empires)) + [None] * len(pos_colonies)
+        pop_new = self.update_fitness_population_delta([[pos, None] for pos in np.concatenate((pos_empires, pos_colonies), axis=0)],
+                                                       list_parents)
+        self.pop_empires, self.pop_colonies = pop_new[:n_empires], pop_new[n_empires:]
+
+        # Intra-Empire Competition: the best colony takes the place of its imperialist if it is better
+        list_best = group.get_group_best(self.get_fitness_vector(self.pop_colonies), self.colony_ids, n_empires, self.problem.minmax)
+        for idx, id_colony in enumerate(list_best):
+            if id_colony >= 0 and self.compare_agent(self.pop_colonies[id_colony], self.pop_empires[idx]):
+                self.pop_colonies[id_colony], self.pop_empires[idx] = self.pop_empires[idx], self.pop_colonies[id_colony]
 
         # Update Total Objective Values of Empires
-        cost_empires_list = []
-        for idx, colonies in self.empires.items():
-            fit_list = np.array([solution[self.ID_FIT][self.ID_TAR] for solution in colonies])
-            fit_empire = self.pop_empires[idx][self.ID_FIT][self.ID_TAR] + self.zeta * np.mean(fit_list)
-            cost_empires_list.append(fit_empire)
-        cost_empires_list = np.array(cost_empires_list)
+        fit_colonies = self.get_fitness_vector(self.pop_colonies)
+        cost_empires_list = self.get_fitness_vector(self.pop_empires) + \
+                            self.zeta * group.get_group_mean(fit_colonies, self.colony_ids, n_empires)
 
         # Find possession probability of each empire based on its total power
         cost_empires_list_normalized = cost_empires_list - (np.max(cost_empires_list) + np.min(cost_empires_list))
@@ -144,12 +138,15 @@ class BaseICA(Optimizer):
         idx_empire = np.argmax(vector_D)
 
         # Find the weakest empire and weakest colony inside it
-        idx_weakest_empire = np.argmax(cost_empires_list)
-        if len(self.empires[idx_weakest_empire]) > 0:
-            colonies_sorted, best, worst = self.get_special_solutions(self.empires[idx_weakest_empire])
-            self.empires[idx_empire].append(colonies_sorted.pop(-1))
-        else:
-            self.empires[idx_empire].append(self.pop_empires.pop(idx_weakest_empire))
+        idx_weakest_empire = np.argmax(cost_empires_list) if self.problem.minmax == "min" else np.argmin(cost_empires_list)
+        id_worst = group.get_group_worst(fit_colonies, self.colony_ids, n_empires, self.problem.minmax)[idx_weakest_empire]
+        if id_worst >= 0:
+            self.colony_ids[id_worst] = idx_empire
+        elif n_empires > 1 and idx_empire != idx_weakest_empire:
+            # The weakest empire has no colony left, its imperialist becomes a colony of the winner empire
+            self.pop_colonies.append(self.pop_empires.pop(idx_weakest_empire))
+            idx_empire = idx_empire - 1 if idx_empire > idx_weakest_empire else idx_empire
+            self.colony_ids = np.where(self.colony_ids > idx_weakest_empire, self.colony_ids - 1, self.colony_ids)
+            self.colony_ids = np.append(self.colony_ids, idx_empire)
 
         self.pop = self.pop_empires + self.pop_colonies
-
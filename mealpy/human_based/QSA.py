@@ -125,7 +125,7 @@ class BaseQSA(Optimizer):
             else:
                 pos_new = np.random.uniform(self.problem.lb, self.problem.ub)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, pop)
         pop = self.greedy_selection_population(pop, pop_new)
         pop, _ = self.get_global_best_solution(pop)
         return pop
@@ -140,7 +140,7 @@ class BaseQSA(Optimizer):
             X_new = np.where(np.random.random(self.problem.n_dims) > pr[i], temp, X_new)
             pos_new = self.amend_position_faster(X_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, pop)
         pop_new = self.greedy_selection_population(pop, pop_new)
         return pop_new
 
@@ -176,7 +176,7 @@ class OppoQSA(BaseQSA):
             X_new = self.create_opposition_position(pop[i], g_best)
             pos_new = self.amend_position_faster(X_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, pop)
         return self.greedy_selection_population(pop, pop_new)
 
     def evolve(self, epoch):
@@ -233,7 +233,7 @@ class LevyQSA(BaseQSA):
             else:
                 pos_new = np.random.uniform(self.problem.lb, self.problem.ub)
             pop_new.append([pos_new , None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, pop)
         pop_new = self.greedy_selection_population(pop, pop_new)
         pop_new, _ = self.get_global_best_solution(pop_new)
         return pop_new
@@ -309,7 +309,7 @@ class OriginalQSA(BaseQSA):
                     pos_new[j] = X1[j] + e * (X2[j] - pop[i][self.ID_POS][j])
             pos_new = self.amend_position_faster(pos_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, pop)
         return self.greedy_selection_population(pop, pop_new)
 
     def evolve(self, epoch):
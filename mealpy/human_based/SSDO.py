@@ -83,5 +83,5 @@ class BaseSSDO(Optimizer):
             pos_new = pop_new[idx][self.ID_POS] + pop_new[idx][self.ID_VEL]
             pos_new = self.amend_position_faster(pos_new)
             pop_new[idx][self.ID_POS] = pos_new
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
@@ -8,9 +8,8 @@
 #-------------------------------------------------------------------------------------------------------%
 
 import numpy as np
-from functools import reduce
-from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils.group import create_group_ids, get_group_mean, get_group_best, get_random_partner
 
 
 class BaseTLO(Optimizer):
@@ -39,37 +38,52 @@ class BaseTLO(Optimizer):
         self.epoch = epoch
         self.pop_size = pop_size
 
+    def _teaching_phase(self, pop, teacher_pos):
+        """
+        Teaching phase for the whole class: one class mean and one teaching factor (1 or 2) per learner.
+
+        Args:
+            pop (list): the learners
+            teacher_pos (nd.array): position of the teacher
+
+        Returns:
+            The learners after greedy selection
+        """
+        pos_matrix = self.get_position_matrix(pop)
+        TF = np.random.randint(1, 3, (len(pop), 1))  # 1 or 2 (never 3)
+        DIFF_MEAN = np.random.rand(len(pop), self.problem.n_dims) * (teacher_pos - TF * np.mean(pos_matrix, axis=0))
+        pos_new = self.amend_position_faster(pos_matrix + DIFF_MEAN)
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], pop)
+        return self.greedy_selection_population(pop, pop_new)
+
+    def _learning_phase(self, pop):
+        """
+        Learning phase for the whole class: each learner moves toward (away from) a random partner that is better (worse).
+
+        Args:
+            pop (list): the learners
+
+        Returns:
+            The learners after greedy selection
+        """
+        pos_matrix = self.get_position_matrix(pop)
+        list_partner = self.get_index_random_partner(len(pop))
+        list_better = self.compare_population(pop, [pop[idx] for idx in list_partner])
+        diff = pos_matrix - pos_matrix[list_partner]
+        diff = np.where(list_better[:, None], diff, -diff)
+        pos_new = self.amend_position_faster(pos_matrix + np.random.rand(len(pop), self.problem.n_dims) * diff)
+        pop_child = self.update_fitness_population_bound([[pos, None] for pos in pos_new], pop)
+        return self.greedy_selection_population(pop, pop_child)
+
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            ## Teaching Phrase
-            TF = np.random.randint(1, 3)  # 1 or 2 (never 3)
-            list_pos = np.array([item[self.ID_POS] for item in self.pop])
-            DIFF_MEAN = np.random.rand(self.problem.n_dims) * (self.g_best[self.ID_POS] - TF * np.mean(list_pos, axis=0))
-            temp = self.pop[idx][self.ID_POS] + DIFF_MEAN
-            pos_new = self.amend_position_faster(temp)
-            pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
-        pop_new = self.greedy_selection_population(self.pop, pop_new)
-
-        pop_child = []
-        for idx in range(0, self.pop_size):
-            ## Learning Phrase
-            temp = deepcopy(pop_new[idx][self.ID_POS])
-            id_partner = np.random.choice(np.setxor1d(np.array(range(self.pop_size)), np.array([idx])))
-            # arr_random = np.random.rand(self.problem.n_dims)
-            if self.compare_agent(pop_new[idx], pop_new[id_partner]):
-                temp += np.random.rand(self.problem.n_dims) * (pop_new[idx][self.ID_POS] - pop_new[id_partner][self.ID_POS])
-            else:
-                temp += np.random.rand(self.problem.n_dims) * (pop_new[id_partner][self.ID_POS] - pop_new[idx][self.ID_POS])
-            pos_new = self.amend_position_faster(temp)
-            pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
-        self.pop = self.greedy_selection_population(pop_new, pop_child)
+        ## Teaching Phrase
+        pop_new = self._teaching_phase(self.pop, self.g_best[self.ID_POS])
+        ## Learning Phrase
+        self.pop = self._learning_phase(pop_new)
 
 
 class OriginalTLO(BaseTLO):
@@ -79,7 +93,7 @@ class OriginalTLO(BaseTLO):
     This is slower version which inspired from this version:
         https://github.com/andaviaco/tblo
     Notes:
-        + Removed the third loop to make it faster
+        + Removed the third loop to make it faster: the class mean is updated incrementally when a learner changes
     """
 
     def __init__(self, problem, epoch=10000, pop_size=100, **kwargs):
@@ -99,22 +113,20 @@ class OriginalTLO(BaseTLO):
         Args:
             epoch (int): The current iteration
         """
+        pos_mean = np.mean([agent[self.ID_POS] for agent in self.pop], axis=0)
         for idx in range(0, self.pop_size):
             ## Teaching Phrase
             TF = np.random.randint(1, 3)  # 1 or 2 (never 3)
-            #### Remove third loop here
-            list_pos = np.array([item[self.ID_POS] for item in self.pop])
             pos_new = self.pop[idx][self.ID_POS] + np.random.uniform(0, 1, self.problem.n_dims) * \
-                      (self.g_best[self.ID_POS] - TF * np.mean(list_pos, axis=0))
+                      (self.g_best[self.ID_POS] - TF * pos_mean)
             pos_new = self.amend_position_faster(pos_new)
             fit_new = self.get_fitness_position(pos_new)
             if self.compare_agent([pos_new, fit_new], self.pop[idx]):
+                pos_mean += (pos_new - self.pop[idx][self.ID_POS]) / self.pop_size
                 self.pop[idx] = [pos_new, fit_new]
 
             ## Learning Phrase
             id_partner = np.random.choice(np.setxor1d(np.array(range(self.pop_size)), np.array([idx])))
-
-            #### Remove third loop here
             if self.compare_agent(self.pop[idx], self.pop[id_partner]):
                 diff = self.pop[idx][self.ID_POS] - self.pop[id_partner][self.ID_POS]
             else:
@@ -123,6 +135,7 @@ class OriginalTLO(BaseTLO):
             pos_new = self.amend_position_faster(pos_new)
             fit_new = self.get_fitness_position(pos_new)
             if self.compare_agent([pos_new, fit_new], self.pop[idx]):
+                pos_mean += (pos_new - self.pop[idx][self.ID_POS]) / self.pop_size
                 self.pop[idx] = [pos_new, fit_new]
 
 
@@ -133,6 +146,7 @@ class ITLO(BaseTLO):
         An improved teaching-learning-based optimization algorithm for solving unconstrained optimization problems
     Notes:
         + Kinda similar to the paper, but the pseudo-code in the paper is not clear.
+        + The population is [teachers + students], the team of each student is held in a team-id vector.
     """
 
     def __init__(self, problem, epoch=10000, pop_size=100, n_teachers=5, **kwargs):
@@ -145,78 +159,67 @@ class ITLO(BaseTLO):
             **kwargs ():
         """
         super().__init__(problem, epoch, pop_size, **kwargs)
-        self.nfe_per_epoch = 2 * pop_size
         self.n_teachers = n_teachers  # Number of teams / group
         self.n_students = pop_size - n_teachers
-        self.n_students_in_team = int(self.n_students / self.n_teachers)
-        self.teachers, self.teams = None, None
+        self.nfe_per_epoch = 2 * self.n_students
+        self.team_ids = None
 
     def classify(self, pop):
+        """
+        Returns:
+            The population sorted as [teachers + students], the team id of each student and the best solution
+        """
         sorted_pop, best = self.get_global_best_solution(pop)
-        teachers = sorted_pop[:self.n_teachers]
-        sorted_pop = sorted_pop[self.n_teachers:]
-        idx_list = np.random.permutation(range(0, self.n_students))
-        teams = []
-        for id_teacher in range(0, self.n_teachers):
-            group = []
-            for idx in range(0, self.n_students_in_team):
-                start_index = id_teacher * self.n_students_in_team + idx
-                group.append(sorted_pop[idx_list[start_index]])
-            teams.append(group)
-        return teachers, teams, best
+        list_sizes = np.full(self.n_teachers, self.n_students // self.n_teachers)
+        list_sizes[:self.n_students % self.n_teachers] += 1
+        team_ids = create_group_ids(list_sizes)
+        return sorted_pop, team_ids, best
 
     def initialization(self):
         self.pop = self.create_population(self.pop_size)
-        self.teachers, self.teams, self.g_best = self.classify(self.pop)
+        self.pop, self.team_ids, self.g_best = self.classify(self.pop)
 
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        for id_teach, teacher in enumerate(self.teachers):
-            team = self.teams[id_teach]
-            list_pos = np.array([student[self.ID_POS] for student in self.teams[id_teach]])  # Step 7
-            mean_team = np.mean(list_pos, axis=0)
-            pop_new = []
-            for id_stud, student in enumerate(team):
-                if teacher[self.ID_FIT][self.ID_TAR] == 0:
-                    TF = 1
-                else:
-                    TF = student[self.ID_FIT][self.ID_TAR] / teacher[self.ID_FIT][self.ID_TAR]
-                diff_mean = np.random.rand() * (teacher[self.ID_POS] - TF * mean_team)  # Step 8
-
-                id2 = np.random.choice(list(set(range(0, self.n_teachers)) - {id_teach}))
-                if self.compare_agent(teacher, team[id2]):
-                    pos_new = (student[self.ID_POS] + diff_mean) + np.random.rand() * (team[id2][self.ID_POS] - student[self.ID_POS])
-                else:
-                    pos_new = (student[self.ID_POS] + diff_mean) + np.random.rand() * (student[self.ID_POS] - team[id2][self.ID_POS])
-                pos_new = self.amend_position_faster(pos_new)
-                pop_new.append([pos_new, None])
-            pop_new = self.update_fitness_population(pop_new)
-            self.teams[id_teach] = self.greedy_selection_population(team, pop_new)
-
-        for id_teach, teacher in enumerate(self.teachers):
-            ef = round(1 + np.random.rand())
-            team = self.teams[id_teach]
-            pop_new = []
-            for id_stud, student in enumerate(team):
-                id2 = np.random.choice(list(set(range(0, self.n_students_in_team)) - {id_stud}))
-                if self.compare_agent(student, team[id2]):
-                    pos_new = student[self.ID_POS] + np.random.rand() * (student[self.ID_POS] - team[id2][self.ID_POS]) + \
-                              np.random.rand() * (teacher[self.ID_POS] - ef * team[id2][self.ID_POS])
-                else:
-                    pos_new = student[self.ID_POS] + np.random.rand() * (team[id2][self.ID_POS] - student[self.ID_POS]) + \
-                              np.random.rand() * (teacher[self.ID_POS] - ef * student[self.ID_POS])
-                pos_new = self.amend_position_faster(pos_new)
-                pop_new.append([pos_new, None])
-            pop_new = self.update_fitness_population(pop_new)
-            self.teams[id_teach] = self.greedy_selection_population(team, pop_new)
-
-        for id_teach, teacher in enumerate(self.teachers):
-            team = self.teams[id_teach] + [teacher]
-            team, local_best = self.get_global_best_solution(team)
-            self.teachers[id_teach] = local_best
-            self.teams[id_teach] = team[1:]
-
-        self.pop = self.teachers + reduce(lambda x, y: x + y, self.teams)
+        teachers, students = self.pop[:self.n_teachers], self.pop[self.n_teachers:]
+        pos_teacher, fit_teacher = self.get_position_matrix(teachers), self.get_fitness_vector(teachers)
+        pos_team_teacher, fit_team_teacher = pos_teacher[self.team_ids], fit_teacher[self.team_ids]
+
+        ## Teaching phase: each student learns from the teacher and the mean of its team
+        pos_student, fit_student = self.get_position_matrix(students), self.get_fitness_vector(students)
+        mean_team = get_group_mean(pos_student, self.team_ids, self.n_teachers)[self.team_ids]  # Step 7
+        TF = np.where(fit_team_teacher == 0, 1, fit_student / np.where(fit_team_teacher == 0, 1, fit_team_teacher))
+        diff_mean = np.random.rand(self.n_students, 1) * (pos_team_teacher - TF[:, None] * mean_team)  # Step 8
+        list_partner = get_random_partner(self.team_ids, self.n_teachers)
+        diff = pos_student[list_partner] - pos_student
+        list_better = self.compare_population([teachers[idx] for idx in self.team_ids], [students[idx] for idx in list_partner])
+        diff = np.where(list_better[:, None], diff, -diff)
+        pos_new = (pos_student + diff_mean) + np.random.rand(self.n_students, 1) * diff
+        pos_new = self.amend_position_faster(pos_new)
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], students)
+        students = self.greedy_selection_population(students, pop_new)
+
+        ## Learning phase: each student learns from a random teammate and its teacher
+        pos_student, fit_student = self.get_position_matrix(students), self.get_fitness_vector(students)
+        ef = np.round(1 + np.random.rand(self.n_teachers))[self.team_ids][:, None]
+        list_partner = get_random_partner(self.team_ids, self.n_teachers)
+        pos_partner = pos_student[list_partner]
+        list_better = self.compare_population(students, [students[idx] for idx in list_partner])[:, None]
+        r1, r2 = np.random.rand(self.n_students, 1), np.random.rand(self.n_students, 1)
+        pos_new = np.where(list_better,
+                           pos_student + r1 * (pos_student - pos_partner) + r2 * (pos_team_teacher - ef * pos_partner),
+                           pos_student + r1 * (pos_partner - pos_student) + r2 * (pos_team_teacher - ef * pos_student))
+        pos_new = self.amend_position_faster(pos_new)
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], students)
+        students = self.greedy_selection_population(students, pop_new)
+
+        ## The best student of a team replaces its teacher if it is better
+        list_best = get_group_best(self.get_fitness_vector(students), self.team_ids, self.n_teachers, self.problem.minmax)
+        for id_teach in np.where(list_best >= 0)[0]:
+            id_stud = list_best[id_teach]
+            if self.compare_agent(students[id_stud], teachers[id_teach]):
+                teachers[id_teach], students[id_stud] = students[id_stud], teachers[id_teach]
+        self.pop = teachers + students
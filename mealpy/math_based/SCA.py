@@ -58,7 +58,7 @@ class BaseSCA(Optimizer):
             # Check the bound
             pos_new = self.amend_position_random(pos_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
             # ## Update the global best
@@ -60,7 +60,8 @@ class BaseHS(Optimizer):
             pos_new = np.where(np.random.uniform(0, 1, self.problem.n_dims) < self.pa_r, x_new, pos_new)
             pos_new = self.amend_position_faster(pos_new)  # Check the bound
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        ## With a high c_r most variables of a new harmony are the ones of the global best
+        pop_new = self.update_fitness_population_delta(pop_new, [self.g_best[self.ID_POS]] * self.pop_size)
 
         # Update Damp Fret Width
         self.dyn_fw = self.dyn_fw * self.fw_damp
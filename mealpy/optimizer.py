@@ -10,11 +10,17 @@
 import numpy as np
 from math import gamma
 from copy import deepcopy
+from collections import OrderedDict
 from mealpy.utils.history import History
-from mealpy.problem import Problem
+from mealpy.problem import Problem, RejectedResult
 from mealpy.utils.termination import Termination
+from mealpy.utils.ask_tell import AskTellSession, BatchedCreator
+from mealpy.utils.worker_farm import WorkerFarm
+from mealpy.utils.surrogate import SurrogateModel
 import concurrent.futures as parallel
 import time
+import pickle
+import os
 
 
 class Optimizer:
@@ -28,6 +34,8 @@ class Optimizer:
     ID_OBJ = 1  # Index of objective list in fitness
 
     EPSILON = 10E-10
+    NOISE_RACING = True             # False when some selections of the algorithm can't use the racing of a noisy problem
+    AUTO_CALIBRATION_BUDGET = 1.0   # mode="auto": seconds of sequential evaluations of a batch that are measured in full
 
     def __init__(self, problem, kwargs):
         """
@@ -50,12 +58,29 @@ class Optimizer:
         super(Optimizer, self).__init__()
         self.epoch, self.pop_size, self.solution = None, None, None
         self.mode = "sequential"
+        self.session = None
+        self.state_cache = OrderedDict()        # Evaluation states of the incremental evaluation, see Problem
+        self.noise_stats = OrderedDict()        # Noisy problem: [n_samples, mean target, M2, mean objs] of each position
+        self.noise_pooled = [0.0, 0]            # Noisy problem: sum of M2 and degrees of freedom of all positions
+        self.nfe_resample = 0                   # Noisy problem: number of re-evaluations
+        self.surrogate = None                   # Surrogate pre-screening, see Problem
+        self.nfe_predicted = 0                  # Surrogate pre-screening: number of candidates not evaluated
+        self.fidelity = None                    # Multi-fidelity: the fidelity of the current evaluations (None: obj_func)
+        self.fidelity_pairs = {}                # Multi-fidelity: level -> list of (fitness at level, fitness at the top)
+        self.nfe_fidelity_saved = 0.0           # Multi-fidelity: evaluations saved, in units of a top-level evaluation
+        self.chunk_size = 1                     # Candidates sent to a worker process at once (process mode)
+        self.auto_info = None                   # mode="auto": the measurements and the chosen mode
+        self.batch_creator = None               # Vectorized mode: batches the evaluations of the initial population
         self.pop, self.g_best = None, None
         self.history = History()
+        self.list_diversity = []                # Diversity of the populations of History already measured
         if not isinstance(problem, Problem):
             problem = Problem(problem)
         self.problem = problem
         self.verbose = problem.verbose
+        if problem.noisy and not self.NOISE_RACING:
+            print(f"Warning: {self.__class__.__name__} selects some agents without the racing re-sampling of a noisy "
+                  f"problem, these selections use the current means.")
         self.termination_flag = False       # Check if exist object or not
         if "termination" in kwargs:
             termination = kwargs["termination"]
@@ -65,6 +90,13 @@ class Optimizer:
             else:
                 self.termination = termination
             self.termination_flag = True
+        self.farm, self.farm_creator = None, None
+        if "farm" in kwargs:
+            if not isinstance(kwargs["farm"], WorkerFarm):
+                print("Please create and input your WorkerFarm object!")
+                exit(0)
+            self.farm = kwargs["farm"]
+            self.farm_creator = BatchedCreator(self.farm.evaluate)
         self.nfe_per_epoch = self.pop_size
         self.sort_flag = False
 
@@ -101,60 +133,190 @@ class Optimizer:
                 + 'sequential': recommended for simple and small task (< 10 seconds for calculating objective)
                 + 'thread': recommended for IO bound task, or small computing task (< 2 minutes for calculating objective)
                 + 'process': recommended for hard and big task (> 2 minutes for calculating objective)
+                + 'ask_tell': used by ask() and tell(), the evaluations are done by the caller
+                + 'farm': the evaluations are sent to the workers of the WorkerFarm given as "farm" parameter
+                + 'vectorized': the batches of candidates are evaluated by obj_batch_func of Problem
+                + 'auto': one of 'sequential', 'vectorized', 'thread', 'process', picked by get_auto_mode()
 
         Returns:
             [position, fitness value]
         """
-        self.mode = mode
-        self.termination_start()
-        self.initialization()
-        self.history.save_initial_best(self.g_best)
+        for _ in self.solve_iter(mode, save_population=True):
+            pass
+        return self.solution[self.ID_POS], self.solution[self.ID_FIT][self.ID_TAR]
 
-        for epoch in range(0, self.epoch):
-            time_epoch = time.time()
+    def solve_iter(self, mode='sequential', save_population=False):
+        """
+        Generator version of solve(), it yields a small record after each epoch. Stop the optimization early by
+        simply not resuming it, self.solution and self.history are saved before each yield. Close it (or let it
+        be collected) to stop the WorkerFarm of mode='farm'.
 
-            ## Call before evolve function
-            self.before_evolve(epoch)
+            for record in model.solve_iter():
+                print(record["epoch"], record["global_best"][model.ID_FIT][model.ID_TAR])
 
-            ## Evolve method will be called in child class
-            self.evolve(epoch)
+        Args:
+            mode (str): same as solve()
+            save_population (bool): keep a copy of the population of each epoch in History (needed for the diversity
+                and trajectory charts), default = False
 
-            ## Call after evolve function
-            self.after_evolve(epoch)
+        Returns:
+            Generator of dict: {"epoch", "current_best", "global_best", "nfe", "runtime"}, the best agents are the ones
+            saved in History (not copied) and nfe is the number of function evaluations used so far (re-evaluations
+            of a noisy problem included, candidates with a surrogate fitness excluded, a low-fidelity evaluation
+            counted as fidelity / highest fidelity)
+        """
+        if mode == "auto":
+            mode = self.get_auto_mode()
+        self.mode = mode
+        if mode == "farm":
+            if self.farm is None:
+                print("Please create a WorkerFarm and input it as farm parameter of the model to use mode='farm'!")
+                exit(0)
+            self.farm.start(self.problem.obj_func)
+        try:
+            self.termination_start()
+            self.initialization()
+            self.history.save_initial_best(self.g_best)
+            self.list_diversity = []
+            nfe = self.pop_size
+            for epoch in range(0, self.epoch):
+                time_epoch = time.time()
+                nfe_resample, nfe_predicted, nfe_saved = self.nfe_resample, self.nfe_predicted, self.nfe_fidelity_saved
+
+                ## Call before evolve function
+                self.before_evolve(epoch)
+
+                ## Evolve method will be called in child class
+                self.evolve(epoch)
+
+                ## Call after evolve function
+                self.after_evolve(epoch)
+
+                # update global best position
+                if self.sort_flag:
+                    self.pop, self.g_best = self.update_global_best_solution(self.pop)  # We sort the population
+                else:
+                    _, self.g_best = self.update_global_best_solution(self.pop)  # We don't sort the population
+                ## Additional information for the framework
+                time_epoch = time.time() - time_epoch
+                nfe_epoch = self.nfe_per_epoch + self.nfe_resample - nfe_resample - (self.nfe_predicted - nfe_predicted)
+                if self.problem.fidelity_levels is not None:
+                    nfe_epoch -= self.nfe_fidelity_saved - nfe_saved
+                nfe += nfe_epoch
+                self.history.list_epoch_time.append(time_epoch)
+                if save_population:
+                    self.history.list_population.append(deepcopy(self.pop))
+                self.print_epoch(epoch + 1, time_epoch)
+                self.save_optimization_process()
+                yield {"epoch": epoch + 1, "current_best": self.history.list_current_best[-1],
+                       "global_best": self.history.list_global_best[-1], "nfe": nfe, "runtime": time_epoch}
+                if self.termination_flag:
+                    if self.termination.mode == 'TB':
+                        if time.time() - self.count_terminate >= self.termination.quantity:
+                            self.termination.logging(self.verbose)
+                            break
+                    elif self.termination.mode == 'FE':
+                        self.count_terminate += nfe_epoch
+                        if self.count_terminate >= self.termination.quantity:
+                            self.termination.logging(self.verbose)
+                            break
+                    elif self.termination.mode == 'MG':
+                        if epoch >= self.termination.quantity:
+                            self.termination.logging(self.verbose)
+                            break
+                    else:                       # Early Stopping
+                        temp = self.count_terminate + self.history.get_global_repeated_times(self.ID_FIT, self.ID_TAR, self.EPSILON)
+                        if temp >= self.termination.quantity:
+                            self.termination.logging(self.verbose)
+                            break
+        finally:
+            if mode == "farm":
+                self.farm.stop()
+            ## Additional information for the framework, nothing to save if the initialization failed
+            if len(self.history.list_global_best) > 0:
+                self.save_optimization_process()
+
+    def get_auto_mode(self):
+        """
+        Measure the objective function and pick the execution mode of solve(mode="auto"). The measurements start
+        from the probe evaluation of Problem. If a batch of pop_size candidates is cheap (< AUTO_CALIBRATION_BUDGET
+        seconds in sequence), the real population creation and evaluate_population() of every mode are timed on such a
+        batch, a mode costs its creation plus epoch times its evaluation. Otherwise the
+        thread mode is timed on a small batch to see if the evaluations overlap (the objective releases the GIL, e.g.
+        I/O or native code), the process mode is used if they don't. The calibration positions come from a private
+        random state and are not counted as function evaluations.
 
-            # update global best position
-            if self.sort_flag:
-                self.pop, self.g_best = self.update_global_best_solution(self.pop)  # We sort the population
+        Returns:
+            The chosen mode, self.chunk_size is set for the process mode and self.auto_info keeps the measurements
+        """
+        n_batch, n_cpus = self.pop_size, os.cpu_count() or 1
+        probe_time = max(self.problem.obj_probe_time, 1e-9)
+        info = {"probe_time": probe_time, "probe_cpu_ratio": self.problem.obj_probe_cpu_time / probe_time,
+                "n_batch": n_batch, "n_cpus": n_cpus, "batch_times": {}, "creation_times": {}}
+        if self.problem.delta_eval:
+            ## The incremental evaluation only exists in the sequential mode
+            mode = "sequential"
+        else:
+            cheap = probe_time * n_batch < self.AUTO_CALIBRATION_BUDGET
+            n_calibration = n_batch if cheap else min(n_batch, max(n_cpus, 4))
+            rng = np.random.RandomState()
+            pop = [[rng.uniform(self.problem.lb, self.problem.ub), None] for _ in range(n_calibration)]
+            list_modes = ["sequential", "vectorized", "thread", "process"] if cheap else ["vectorized", "thread"]
+            if self.problem.obj_batch_func is None:
+                list_modes.remove("vectorized")
+            for mode in list_modes:
+                if mode == "process":
+                    ## Each chunk sent to a worker process pickles the model, a chunk has to be worth it
+                    try:
+                        time_pickle = time.perf_counter()
+                        pickle.dumps(self)
+                        time_pickle = time.perf_counter() - time_pickle
+                    except Exception:
+                        continue
+                    time_call = info["batch_times"]["sequential"] / n_calibration
+                    self.chunk_size = int(min(np.ceil(10 * time_pickle / time_call), np.ceil(n_batch / n_cpus)))
+                self.mode = mode
+                time_mode = time.perf_counter()
+                self.evaluate_population(deepcopy(pop))
+                info["batch_times"][mode] = time.perf_counter() - time_mode
+                if cheap:
+                    ## The creation draws from the global random state, it is restored for the real run
+                    state = np.random.get_state()
+                    time_mode = time.perf_counter()
+                    self._create_population(n_calibration)
+                    info["creation_times"][mode] = time.perf_counter() - time_mode
+                    np.random.set_state(state)
+            if cheap:
+                ## A mode has to be clearly faster than the simpler ones
+                run_times = {key: info["creation_times"][key] + self.epoch * info["batch_times"][key]
+                             for key in info["batch_times"]}
+                mode = "sequential"
+                for candidate, time_mode in run_times.items():
+                    if time_mode < 0.8 * run_times[mode]:
+                        mode = candidate
             else:
-                _, self.g_best = self.update_global_best_solution(self.pop)  # We don't sort the population
-            ## Additional information for the framework
-            time_epoch = time.time() - time_epoch
-            self.history.list_epoch_time.append(time_epoch)
-            self.history.list_population.append(deepcopy(self.pop))
-            self.print_epoch(epoch + 1, time_epoch)
-            if self.termination_flag:
-                if self.termination.mode == 'TB':
-                    if time.time() - self.count_terminate >= self.termination.quantity:
-                        self.termination.logging(self.verbose)
-                        break
-                elif self.termination.mode == 'FE':
-                    self.count_terminate += self.nfe_per_epoch
-                    if self.count_terminate >= self.termination.quantity:
-                        self.termination.logging(self.verbose)
-                        break
-                elif self.termination.mode == 'MG':
-                    if epoch >= self.termination.quantity:
-                        self.termination.logging(self.verbose)
-                        break
-                else:                       # Early Stopping
-                    temp = self.count_terminate + self.history.get_global_repeated_times(self.ID_FIT, self.ID_TAR, self.EPSILON)
-                    if temp >= self.termination.quantity:
-                        self.termination.logging(self.verbose)
-                        break
-
-        ## Additional information for the framework
-        self.save_optimization_process()
-        return self.solution[self.ID_POS], self.solution[self.ID_FIT][self.ID_TAR]
+                info["thread_speedup"] = n_calibration * probe_time / info["batch_times"]["thread"]
+                if info["thread_speedup"] >= 0.5 * min(n_calibration, n_cpus, 4) and info["thread_speedup"] > 1.5:
+                    mode = "thread"
+                elif n_cpus > 1:
+                    mode, self.chunk_size = "process", 1
+                else:
+                    mode = "sequential"
+                if "vectorized" in info["batch_times"] and \
+                        info["batch_times"]["vectorized"] < n_calibration * probe_time / min(n_calibration, n_cpus):
+                    mode = "vectorized"
+        if mode != "process":
+            self.chunk_size = 1
+        self.mode = "sequential"
+        info["mode"], info["chunk_size"] = mode, self.chunk_size
+        self.auto_info = info
+        if self.verbose:
+            batch_times = ", ".join([f"{key}: {value:.5f}" for key, value in info["batch_times"].items()])
+            creation_times = ", ".join([f"{key}: {value:.5f}" for key, value in info["creation_times"].items()])
+            print(f"> Auto mode: {mode} (chunk size: {self.chunk_size}), probe evaluation: {probe_time:.6f} seconds, "
+                  f"CPU/wall: {info['probe_cpu_ratio']:.2f}, seconds per calibration batch: {{{batch_times}}}, "
+                  f"seconds per calibration creation: {{{creation_times}}}")
+        return mode
 
     def evolve(self, epoch):
         pass
@@ -186,6 +348,13 @@ class Optimizer:
         """
         if pop_size is None:
             pop_size = self.pop_size
+        pop = self._create_population(pop_size)
+        if self.problem.surrogate_ratio is not None:
+            self.get_surrogate().add([agent[self.ID_POS] for agent in pop], [agent[self.ID_FIT][self.ID_OBJ] for agent in pop])
+        return pop
+
+    def _create_population(self, pop_size):
+        ## The creation of each mode, also timed by get_auto_mode()
         pop = []
         if self.mode == "thread":
             with parallel.ThreadPoolExecutor() as executor:
@@ -199,10 +368,36 @@ class Optimizer:
                 # This method yield the result everytime a cpu finished their job (not by order).
                 for f in parallel.as_completed(list_executors):
                     pop.append(f.result())
+        elif self.mode == "ask_tell":
+            pop = self.create_population_batched(self.session.creator, pop_size)
+        elif self.mode == "farm":
+            pop = self.create_population_batched(self.farm_creator, pop_size)
+        elif self.mode == "vectorized":
+            self.batch_creator = BatchedCreator(self.get_objs_batch)
+            pop = self.create_population_batched(self.batch_creator, pop_size)
+            self.batch_creator = None           # Not kept: its locks can't be pickled for the process mode
         else:
             pop = [self.create_solution() for _ in range(0, pop_size)]
         return pop
 
+    def create_population_batched(self, creator, pop_size):
+        """
+        Creation of the population for the backends that evaluate whole position matrices.
+
+        Args:
+            creator (BatchedCreator): the creator of the backend
+            pop_size (int): number of solutions
+
+        Returns:
+            population: list of solutions/agents
+        """
+        if type(self).create_solution is Optimizer.create_solution:
+            ## Default solutions: all positions drawn first (same random numbers as the sequential mode), one batch
+            list_pos = [np.random.uniform(self.problem.lb, self.problem.ub) for _ in range(pop_size)]
+            list_objs = creator.evaluate(np.array(list_pos))
+            return [[pos, self.get_fitness_from_objs(objs)] for pos, objs in zip(list_pos, list_objs)]
+        return creator.create_population(self.create_solution, pop_size)
+
     def update_fitness_population(self, pop=None):
         """
         Args:
@@ -212,6 +407,145 @@ class Optimizer:
         Returns:
             population: with updated fitness value
         """
+        if self.problem.surrogate_ratio is not None and len(pop) > 1:
+            return self.update_fitness_population_surrogate(pop)
+        return self._update_fitness_population(pop)
+
+    def get_surrogate(self):
+        if self.surrogate is None:
+            self.surrogate = SurrogateModel(self.problem.lb, self.problem.ub, self.problem.surrogate_k,
+                                            self.problem.surrogate_archive_size)
+        return self.surrogate
+
+    def is_predicted_solution(self, agent: list):
+        """
+        Returns:
+            True if the fitness of the agent is a prediction of the surrogate, not an evaluation of obj_func
+        """
+        return self.surrogate is not None and self.surrogate.is_predicted(agent[self.ID_POS], agent[self.ID_FIT][self.ID_TAR])
+
+    def update_fitness_population_surrogate(self, pop=None):
+        """
+        Pre-screening with the surrogate: the predicted best part of pop (surrogate_ratio) and a random exploration
+        quota (surrogate_explore) are evaluated with obj_func, the others get their predicted fitness. A predicted
+        agent better than the best evaluated one is evaluated as well, so a prediction never leads the population.
+
+        Args:
+            pop (list): the population
+
+        Returns:
+            population: with updated fitness value
+        """
+        surrogate = self.get_surrogate()
+        if len(surrogate) < max(self.pop_size, surrogate.k + 1):
+            pop = self._update_fitness_population(pop)
+            surrogate.add([agent[self.ID_POS] for agent in pop], [agent[self.ID_FIT][self.ID_OBJ] for agent in pop])
+            return pop
+        pos_matrix = np.array([agent[self.ID_POS] for agent in pop])
+        objs_pred = surrogate.predict(pos_matrix)
+        fit_pred = objs_pred @ np.asarray(self.problem.obj_weight, dtype=float)
+        list_order = np.argsort(fit_pred if self.problem.minmax == "min" else -fit_pred, kind="stable")
+        n_real = int(np.ceil(self.problem.surrogate_ratio * len(pop)))
+        n_explore = min(int(round(self.problem.surrogate_explore * len(pop))), len(pop) - n_real)
+        list_explore = np.random.choice(list_order[n_real:], n_explore, replace=False)
+        list_real = np.concatenate((list_order[:n_real], list_explore)).astype(int)
+        list_pred = np.setdiff1d(np.arange(len(pop)), list_real)
+        self._update_fitness_population([pop[idx] for idx in list_real])
+
+        ## Promote the predictions better than the best evaluated candidate
+        fit_real = np.array([pop[idx][self.ID_FIT][self.ID_TAR] for idx in list_real])
+        fit_best = np.min(fit_real) if self.problem.minmax == "min" else np.max(fit_real)
+        list_promote = list_pred[self.compare_fitness_vector(fit_pred[list_pred], np.full(len(list_pred), fit_best))]
+        if len(list_promote) > 0:
+            self._update_fitness_population([pop[idx] for idx in list_promote])
+            list_real = np.concatenate((list_real, list_promote))
+            list_pred = np.setdiff1d(list_pred, list_promote)
+        for idx in list_pred:
+            pop[idx][self.ID_FIT] = [fit_pred[idx], list(objs_pred[idx])]
+        surrogate.add(pos_matrix[list_real], [pop[idx][self.ID_FIT][self.ID_OBJ] for idx in list_real])
+        surrogate.set_predicted(pos_matrix[list_real], [pop[idx][self.ID_FIT][self.ID_TAR] for idx in list_real], False)
+        surrogate.set_predicted(pos_matrix[list_pred], fit_pred[list_pred], True)
+        pop_alive = pop if self.pop is None else pop + self.pop
+        surrogate.prune_predicted([agent[self.ID_POS] for agent in pop_alive], self.get_fitness_vector(pop_alive))
+        self.nfe_predicted += len(list_pred)
+        return pop
+
+    def _update_fitness_population(self, pop=None):
+        if self.problem.fidelity_levels is not None and len(pop) > 1 and self.mode not in ("ask_tell", "farm"):
+            return self.update_fitness_population_fidelity(pop)
+        return self.evaluate_population(pop)
+
+    def update_fitness_population_fidelity(self, pop=None):
+        """
+        Successive halving over the fidelity_levels of Problem: all agents are evaluated at the lowest fidelity, the best
+        1/fidelity_eta part is promoted to the next level, and so on. The fitness of the agents stopped at a lower level
+        is mapped to the scale of the highest level, never better than the best agent of the highest level.
+
+        Args:
+            pop (list): the population
+
+        Returns:
+            population: with updated fitness value
+        """
+        list_levels = self.problem.fidelity_levels
+        list_idx = np.arange(len(pop))
+        list_level = np.zeros(len(pop), dtype=int)             # The highest level reached by each agent
+        list_fit = np.zeros((len(list_levels), len(pop)))      # Fitness of each agent at each level reached
+        cost = 0.0
+        for level, fidelity in enumerate(list_levels):
+            self.fidelity = fidelity
+            try:
+                self.evaluate_population([pop[idx] for idx in list_idx])
+            finally:
+                self.fidelity = None
+            cost += len(list_idx) * fidelity / list_levels[-1]
+            list_fit[level, list_idx] = [pop[idx][self.ID_FIT][self.ID_TAR] for idx in list_idx]
+            list_level[list_idx] = level
+            if level == len(list_levels) - 1:
+                break
+            fit_level = list_fit[level, list_idx]
+            n_promote = int(np.ceil(len(list_idx) / self.problem.fidelity_eta))
+            list_idx = list_idx[np.argsort(fit_level if self.problem.minmax == "min" else -fit_level, kind="stable")[:n_promote]]
+        self.nfe_fidelity_saved += len(pop) - cost
+
+        ## Learn the mapping of each lower level from the agents evaluated at the highest one, then map the others
+        top = len(list_levels) - 1
+        list_top = np.flatnonzero(list_level == top)
+        fit_best = np.min(list_fit[top, list_top]) if self.problem.minmax == "min" else np.max(list_fit[top, list_top])
+        fit_worse = np.nextafter(fit_best, np.inf if self.problem.minmax == "min" else -np.inf)
+        for level in range(top):
+            pairs = self.fidelity_pairs.setdefault(level, [])
+            pairs += list(zip(list_fit[level, list_top], list_fit[top, list_top]))
+            del pairs[:-500]
+            list_low = np.flatnonzero(list_level == level)
+            if len(list_low) == 0:
+                continue
+            fit_mapped = self.get_fidelity_mapping(level, list_fit[level, list_low])
+            fit_mapped = np.where(self.compare_fitness_vector(fit_mapped, fit_worse), fit_worse, fit_mapped)
+            for idx, fit in zip(list_low, fit_mapped):
+                pop[idx][self.ID_FIT] = [fit, pop[idx][self.ID_FIT][self.ID_OBJ]]
+        return pop
+
+    def get_fidelity_mapping(self, level, list_fitness):
+        """
+        Args:
+            level (int): index of a fidelity level
+            list_fitness (nd.array): fitness values at this level
+
+        Returns:
+            The fitness values mapped to the scale of the highest level: least-squares line of the pairs seen so far
+            (a constant offset when there are too few pairs or the slope is not positive)
+        """
+        pairs = np.array(self.fidelity_pairs.get(level, []), dtype=float).reshape(-1, 2)
+        if len(pairs) == 0:
+            return list_fitness
+        if len(pairs) >= 3 and np.std(pairs[:, 0]) > 0:
+            slope, intercept = np.polyfit(pairs[:, 0], pairs[:, 1], 1)
+            if slope > 0:
+                return slope * list_fitness + intercept
+        return list_fitness + np.mean(pairs[:, 1] - pairs[:, 0])
+
+    def evaluate_population(self, pop=None):
         if self.mode == "thread":
             with parallel.ThreadPoolExecutor() as executor:
                 list_results = executor.map(self.get_fitness_solution, pop)  # Return result not the future object
@@ -219,14 +553,92 @@ class Optimizer:
                     pop[idx][self.ID_FIT] = fit
         elif self.mode == "process":
             with parallel.ProcessPoolExecutor() as executor:
-                list_results = executor.map(self.get_fitness_solution, pop)  # Return result not the future object
+                list_results = executor.map(self.get_fitness_solution, pop, chunksize=self.chunk_size)
                 for idx, fit in enumerate(list_results):
                     pop[idx][self.ID_FIT] = fit
+        elif self.mode in ("ask_tell", "farm"):
+            ## The whole population is asked as one batch
+            evaluate = self.session.evaluate if self.mode == "ask_tell" else self.farm.evaluate
+            list_objs = evaluate(np.array([agent[self.ID_POS] for agent in pop]))
+            for idx, objs in enumerate(list_objs):
+                pop[idx][self.ID_FIT] = self.get_fitness_from_objs(objs)
+        elif self.mode == "vectorized" and self.fidelity is None:
+            list_objs = self.get_objs_batch(np.array([agent[self.ID_POS] for agent in pop]))
+            for idx, objs in enumerate(list_objs):
+                pop[idx][self.ID_FIT] = self.get_fitness_from_objs(objs)
         else:
             for idx, agent in enumerate(pop):
                 pop[idx][self.ID_FIT] = self.get_fitness_solution(agent)
         return pop
 
+    def update_fitness_population_delta(self, pop=None, list_parents=None):
+        """
+        Same as update_fitness_population(), with the incremental evaluation of Problem when it is defined
+        (sequential mode only).
+
+        Args:
+            pop (list): the population
+            list_parents (list): the parent position (nd.array) of each agent, None for an agent without parent
+
+        Returns:
+            population: with updated fitness value
+        """
+        if not self.problem.delta_eval or self.mode != "sequential":
+            return self.update_fitness_population(pop)
+        for idx, agent in enumerate(pop):
+            pop[idx][self.ID_FIT] = self.get_fitness_position_delta(agent[self.ID_POS], list_parents[idx])
+        return pop
+
+    def update_fitness_population_bound(self, pop=None, pop_bound=None):
+        """
+        Same as update_fitness_population() for candidates that only matter if they beat their parent (greedy
+        selection): with the obj_bound_func of Problem, the evaluation of agent i can stop as soon as it can't beat
+        pop_bound[i], the rejected agents get the worst possible fitness.
+
+        Args:
+            pop (list): the population
+            pop_bound (list): the population each agent has to beat (same length), e.g. the current population
+
+        Returns:
+            population: with updated fitness value
+        """
+        if self.problem.obj_bound_func is None or self.mode in ("ask_tell", "farm", "vectorized"):
+            return self.update_fitness_population(pop)
+        list_bounds = [agent[self.ID_FIT][self.ID_TAR] for agent in pop_bound]
+        list_positions = [agent[self.ID_POS] for agent in pop]
+        if self.mode == "thread":
+            with parallel.ThreadPoolExecutor() as executor:
+                list_results = executor.map(self.get_fitness_position_bound, list_positions, list_bounds)
+                for idx, fit in enumerate(list_results):
+                    pop[idx][self.ID_FIT] = fit
+        elif self.mode == "process":
+            with parallel.ProcessPoolExecutor() as executor:
+                list_results = executor.map(self.get_fitness_position_bound, list_positions, list_bounds,
+                                            chunksize=self.chunk_size)
+                for idx, fit in enumerate(list_results):
+                    pop[idx][self.ID_FIT] = fit
+        else:
+            for idx, agent in enumerate(pop):
+                pop[idx][self.ID_FIT] = self.get_fitness_position_bound(agent[self.ID_POS], list_bounds[idx])
+        return pop
+
+    def get_fitness_position_bound(self, position=None, bound=None):
+        """
+        Args:
+            position (nd.array): 1-D numpy array
+            bound (float): the fitness to beat
+
+        Returns:
+            [target, [obj1, obj2, ...]], the target is inf (min) or -inf (max) when the evaluation was rejected
+        """
+        objs = self.problem.obj_bound_func(position, bound)
+        if isinstance(objs, RejectedResult):
+            worst = np.inf if self.problem.minmax == "min" else -np.inf
+            if objs.objs is None:
+                return [worst, [worst] * self.problem.n_objs]
+            return [worst, objs.objs if self.problem.obj_is_list else [objs.objs]]
+        return self.get_fitness_from_objs(objs)
+
     def get_fitness_position(self, position=None):
         """
         Args:
@@ -235,12 +647,122 @@ class Optimizer:
         Returns:
             [target, [obj1, obj2, ...]]
         """
-        objs = self.problem.obj_func(position)
+        if self.mode == "ask_tell":
+            return self.get_fitness_from_objs(self.session.evaluate_one(position))
+        if self.mode == "farm":
+            return self.get_fitness_from_objs(self.farm_creator.evaluate_one(position))
+        if self.fidelity is not None:
+            return self.get_fitness_from_objs(self.problem.obj_fidelity_func(position, self.fidelity))
+        if self.mode == "vectorized":
+            if self.batch_creator is not None:
+                return self.get_fitness_from_objs(self.batch_creator.evaluate_one(position))
+            return self.get_fitness_from_objs(self.get_objs_batch(np.reshape(position, (1, -1)))[0])
+        if self.problem.delta_eval and self.mode == "sequential":
+            objs, state = self.problem.obj_state_func(position)
+            self.save_evaluation_state(position, state)
+            return self.get_fitness_from_objs(objs)
+        return self.get_fitness_from_objs(self.problem.obj_func(position))
+
+    def get_fitness_position_delta(self, position, parent_position=None, list_changed=None):
+        """
+        Incremental evaluation from the cached state of the parent, a full evaluation when there is no parent state.
+
+        Args:
+            position (nd.array): 1-D numpy array
+            parent_position (nd.array): 1-D numpy array, the evaluated position this one was made from (or None)
+            list_changed (nd.array): indices of the changed variables, default = where position differs from parent
+
+        Returns:
+            [target, [obj1, obj2, ...]]
+        """
+        state = None
+        if parent_position is not None and self.problem.delta_eval and self.mode == "sequential":
+            state = self.state_cache.get(parent_position.tobytes())
+        if state is None:
+            return self.get_fitness_position(position)
+        self.state_cache.move_to_end(parent_position.tobytes())
+        if list_changed is None:
+            list_changed = np.flatnonzero(position != parent_position)
+        objs, state = self.problem.obj_delta_func(position, list_changed, parent_position, state)
+        self.save_evaluation_state(position, state)
+        return self.get_fitness_from_objs(objs)
+
+    def save_evaluation_state(self, position, state):
+        """
+        Keep the evaluation state of position in the LRU cache of the incremental evaluation
+        """
+        cache_size = self.problem.delta_cache_size
+        if cache_size is None:
+            cache_size = max(1000, 2 * (self.pop_size + self.nfe_per_epoch))
+        self.state_cache[position.tobytes()] = state
+        self.state_cache.move_to_end(position.tobytes())
+        while len(self.state_cache) > cache_size:
+            self.state_cache.popitem(last=False)
+
+    def get_fitness_from_objs(self, objs):
+        """
+        Args:
+            objs (float, list): the value(s) returned by the objective function
+
+        Returns:
+            [target, [obj1, obj2, ...]]
+        """
         if not self.problem.obj_is_list:
             objs = [objs]
         fit = np.dot(objs, self.problem.obj_weight)
         return [fit, objs]
 
+    def get_objs_batch(self, pos_matrix):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n x n_dims)
+
+        Returns:
+            list of the objective value(s) of each row, computed by obj_batch_func of Problem
+        """
+        if self.problem.obj_batch_func is None:
+            print("Please define obj_batch_func in your problem to use mode='vectorized'!")
+            exit(0)
+        objs = np.asarray(self.problem.obj_batch_func(pos_matrix))
+        if len(objs) != len(pos_matrix):
+            print(f"obj_batch_func() should return {len(pos_matrix)} values, one for each row, got {len(objs)}!")
+            exit(0)
+        return list(objs)
+
+    def ask(self):
+        """
+        Ask/tell interface, the caller evaluates the candidates itself (e.g. on a cluster or with a simulator):
+
+            while True:
+                pos_matrix = model.ask()
+                if pos_matrix is None:
+                    break
+                model.tell([my_objective(pos) for pos in pos_matrix])
+
+        The normal solve() loop runs in the background with mode="ask_tell", so the termination, the global best
+        and the History behave exactly as in solve(). Problem still needs an obj_func for its checking, it can be
+        a cheap function that returns the same kind of value (float or list) as the real objective.
+
+        Returns:
+            2-D matrix (n_candidates x n_dims) of the next positions to evaluate, None when the optimization is
+            finished (then self.solution is ready)
+        """
+        if self.session is None:
+            self.session = AskTellSession(self)
+        return self.session.ask()
+
+    def tell(self, list_objs):
+        """
+        Args:
+            list_objs (list, nd.array): the objective value(s) of each candidate returned by the last ask()
+
+        It returns after the selection, the global best and the History are updated with these values.
+        """
+        if self.session is None:
+            print("Please call ask() before tell()!")
+            exit(0)
+        self.session.tell(list_objs)
+
     def get_fitness_solution(self, solution=None):
         """
         Args:
@@ -276,6 +798,7 @@ class Optimizer:
         Returns:
             The better solution between them
         """
+        self.race_population([agent1], [agent2])
         if self.problem.minmax == "min":
             if agent1[self.ID_FIT][self.ID_TAR] < agent2[self.ID_FIT][self.ID_TAR]:
                 return deepcopy(agent1)
@@ -294,6 +817,7 @@ class Optimizer:
         Returns:
             boolean: Return True if solution a better than solution b and otherwise
         """
+        self.race_population([agent_a], [agent_b])
         if self.problem.minmax == "min":
             if agent_a[self.ID_FIT][self.ID_TAR] < agent_b[self.ID_FIT][self.ID_TAR]:
                 return True
@@ -303,6 +827,154 @@ class Optimizer:
                 return False
             return True
 
+    def get_noise_stats(self, agent: list):
+        """
+        Args:
+            agent (list): A solution of a noisy problem
+
+        Returns:
+            [n_samples, mean target, M2, mean objs] of its position, started from its fitness the first time
+        """
+        key = agent[self.ID_POS].tobytes()
+        stats = self.noise_stats.get(key)
+        if stats is None:
+            stats = [1, agent[self.ID_FIT][self.ID_TAR], 0.0, np.array(agent[self.ID_FIT][self.ID_OBJ], dtype=float)]
+            self.noise_stats[key] = stats
+            while len(self.noise_stats) > max(1000, 2 * (self.pop_size + self.nfe_per_epoch)):
+                self.noise_stats.popitem(last=False)
+        else:
+            self.noise_stats.move_to_end(key)
+        return stats
+
+    def get_objs_samples(self, list_positions: list):
+        """
+        Args:
+            list_positions (list): positions to evaluate once more
+
+        Returns:
+            list of the objective value(s) of each position, evaluated with the current mode
+        """
+        if self.mode == "thread":
+            with parallel.ThreadPoolExecutor() as executor:
+                list_objs = list(executor.map(self.problem.obj_func, list_positions))
+        elif self.mode == "process":
+            with parallel.ProcessPoolExecutor() as executor:
+                list_objs = list(executor.map(self.problem.obj_func, list_positions, chunksize=self.chunk_size))
+        elif self.mode == "ask_tell":
+            list_objs = self.session.evaluate(np.array(list_positions))
+        elif self.mode == "farm":
+            list_objs = self.farm.evaluate(np.array(list_positions))
+        elif self.mode == "vectorized":
+            list_objs = self.get_objs_batch(np.array(list_positions))
+        else:
+            list_objs = [self.problem.obj_func(position) for position in list_positions]
+        return [objs if self.problem.obj_is_list else [objs] for objs in list_objs]
+
+    def race_population(self, pop_a: list, pop_b: list):
+        """
+        Noisy problem only: evaluate again the pairs (pop_a[i], pop_b[i]) whose comparison is not significant, until it
+        is or noise_max_samples is reached. The fitness of the agents becomes the mean of their evaluations.
+        A position with a single evaluation uses the pooled variance of all positions. A pair with a pseudo-agent
+        [None, fitness] (no position, e.g. the best fitness of PSO) is compared as it is.
+
+        Args:
+            pop_a (list): The first solutions
+            pop_b (list): The second solutions, same length
+        """
+        if not self.problem.noisy:
+            return
+        list_pairs = [(agent_a, agent_b) for agent_a, agent_b in zip(pop_a, pop_b)
+                      if agent_a[self.ID_POS] is not None and agent_b[self.ID_POS] is not None]
+        if len(list_pairs) == 0:
+            return
+        pop_a, pop_b = [pair[0] for pair in list_pairs], [pair[1] for pair in list_pairs]
+        n_max = self.problem.noise_max_samples
+        while True:
+            list_sa = [self.get_noise_stats(agent) for agent in pop_a]
+            list_sb = [self.get_noise_stats(agent) for agent in pop_b]
+            stats_a, stats_b = np.array([st[:3] for st in list_sa]), np.array([st[:3] for st in list_sb])
+            var_pooled = self.noise_pooled[0] / self.noise_pooled[1] if self.noise_pooled[1] > 0 else np.inf
+            var_a = np.where(stats_a[:, 0] > 1, stats_a[:, 2] / np.maximum(stats_a[:, 0] - 1, 1), var_pooled) / stats_a[:, 0]
+            var_b = np.where(stats_b[:, 0] > 1, stats_b[:, 2] / np.maximum(stats_b[:, 0] - 1, 1), var_pooled) / stats_b[:, 0]
+            list_ambiguous = (np.abs(stats_a[:, 1] - stats_b[:, 1]) <= self.problem.noise_z * np.sqrt(var_a + var_b)) & \
+                             ((stats_a[:, 0] < n_max) | (stats_b[:, 0] < n_max)) & \
+                             np.array([sa is not sb for sa, sb in zip(list_sa, list_sb)])
+            if not np.any(list_ambiguous):
+                break
+            ## Sample the side with the larger standard error (the other one when it has reached n_max)
+            list_pick_a = ((var_a >= var_b) & (stats_a[:, 0] < n_max)) | (stats_b[:, 0] >= n_max)
+            dict_sample = {}
+            for idx in np.flatnonzero(list_ambiguous):
+                stats, agent = (list_sa[idx], pop_a[idx]) if list_pick_a[idx] else (list_sb[idx], pop_b[idx])
+                dict_sample[id(stats)] = (stats, agent[self.ID_POS])
+            list_objs = self.get_objs_samples([pos for _, pos in dict_sample.values()])
+            self.nfe_resample += len(list_objs)
+            for (stats, _), objs in zip(dict_sample.values(), list_objs):
+                objs = np.array(objs, dtype=float)
+                target = np.dot(objs, self.problem.obj_weight)
+                delta = target - stats[1]
+                stats[0] += 1
+                stats[1] += delta / stats[0]
+                stats[2] += delta * (target - stats[1])
+                stats[3] += (objs - stats[3]) / stats[0]
+                self.noise_pooled[0] += delta * (target - stats[1])
+                self.noise_pooled[1] += 1
+            for agent, stats in zip(pop_a + pop_b, list_sa + list_sb):
+                if id(stats) in dict_sample:
+                    agent[self.ID_FIT] = [stats[1], list(stats[3])]
+
+    def compare_population(self, pop_a: list, pop_b: list):
+        """
+        Vectorized version of compare_agent() for the pairs (pop_a[i], pop_b[i]), with the racing re-sampling of a
+        noisy problem (see race_population()), use it instead of compare_fitness_vector() to select between agents
+
+        Args:
+            pop_a (list): The first solutions
+            pop_b (list): The second solutions, same length
+
+        Returns:
+            boolean array: True where pop_a[i] is strictly better than pop_b[i]
+        """
+        self.race_population(pop_a, pop_b)
+        return self.compare_fitness_vector(self.get_fitness_vector(pop_a), self.get_fitness_vector(pop_b))
+
+    def compare_fitness_vector(self, list_fitness_a: np.ndarray, list_fitness_b: np.ndarray):
+        """
+        Vectorized version of compare_agent(), it works on fitness (target) arrays with broadcasting.
+        No racing re-sampling: on a noisy problem it compares the current means
+
+        Args:
+            list_fitness_a (nd.array): fitness values of solutions a
+            list_fitness_b (nd.array): fitness values of solutions b
+
+        Returns:
+            boolean array: True where solution a is strictly better than solution b
+        """
+        if self.problem.minmax == "min":
+            return np.asarray(list_fitness_a) < np.asarray(list_fitness_b)
+        else:
+            return np.asarray(list_fitness_a) > np.asarray(list_fitness_b)
+
+    def get_position_matrix(self, pop: list):
+        """
+        Args:
+            pop (list): The population
+
+        Returns:
+            2-D numpy array (len(pop) x n_dims) of positions
+        """
+        return np.array([agent[self.ID_POS] for agent in pop])
+
+    def get_fitness_vector(self, pop: list):
+        """
+        Args:
+            pop (list): The population
+
+        Returns:
+            1-D numpy array of fitness (target) values
+        """
+        return np.array([agent[self.ID_FIT][self.ID_TAR] for agent in pop], dtype=float)
+
     def get_special_solutions(self, pop=None, best=3, worst=3):
         """
         Args:
@@ -328,6 +1000,68 @@ class Optimizer:
             else:
                 return pop, deepcopy(pop[:best]), deepcopy(pop[:-worst])
 
+    def get_index_best(self, list_fitness: np.ndarray, best=1):
+        """
+        Top-k extraction with np.argpartition, it does not sort the whole population.
+
+        Args:
+            list_fitness (nd.array): 1-D numpy array, the fitness (target) of each solution
+            best (int): number of best solutions
+
+        Returns:
+            1-D numpy array (best,) with the index of the best solutions, sorted from the best one
+        """
+        list_fitness = np.asarray(list_fitness, dtype=float)
+        list_key = list_fitness if self.problem.minmax == "min" else -list_fitness
+        best = min(best, len(list_key))
+        list_idx = np.argpartition(list_key, best - 1)[:best] if best < len(list_key) else np.arange(len(list_key))
+        return list_idx[np.argsort(list_key[list_idx], kind="stable")]
+
+    def get_index_worst(self, list_fitness: np.ndarray, worst=1):
+        """
+        Args:
+            list_fitness (nd.array): 1-D numpy array, the fitness (target) of each solution
+            worst (int): number of worst solutions
+
+        Returns:
+            1-D numpy array (worst,) with the index of the worst solutions, sorted from the worst one
+        """
+        list_fitness = np.asarray(list_fitness, dtype=float)
+        list_key = -list_fitness if self.problem.minmax == "min" else list_fitness
+        worst = min(worst, len(list_key))
+        list_idx = np.argpartition(list_key, worst - 1)[:worst] if worst < len(list_key) else np.arange(len(list_key))
+        return list_idx[np.argsort(list_key[list_idx], kind="stable")]
+
+    def get_leader_following_position(self, pos_matrix: np.ndarray, pos_leaders: np.ndarray, list_a: np.ndarray,
+                                      list_c: np.ndarray, pos_target=None):
+        """
+        Leader-following (encircling) update of the whole swarm, averaged over the leaders (GWO, WOA, ...):
+            X_new[i] = mean_k (L[i, k] - A[i, k] * |C[i, k] * T[i, k] - X[i]|)
+
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n_agents x n_dims), the followers X
+            pos_leaders (nd.array): the leaders L, (n_leaders x n_dims) shared by all followers or
+                (n_agents x n_leaders x n_dims) for one leader set per follower
+            list_a (nd.array): coefficients A, (n_agents x n_leaders) per row or (n_agents x n_leaders x n_dims) per dimension
+            list_c (nd.array): coefficients C, same shapes as list_a
+            pos_target (nd.array): the targets T, same shapes as pos_leaders, default = pos_leaders
+
+        Returns:
+            2-D matrix (n_agents x n_dims) of new positions
+        """
+        pos_leaders = np.asarray(pos_leaders, dtype=float)
+        pos_target = pos_leaders if pos_target is None else np.asarray(pos_target, dtype=float)
+        if pos_leaders.ndim == 2:
+            pos_leaders = pos_leaders[None, :, :]
+        if pos_target.ndim == 2:
+            pos_target = pos_target[None, :, :]
+        list_a, list_c = np.asarray(list_a, dtype=float), np.asarray(list_c, dtype=float)
+        if list_a.ndim == 2:
+            list_a = list_a[:, :, None]
+        if list_c.ndim == 2:
+            list_c = list_c[:, :, None]
+        return np.mean(pos_leaders - list_a * np.abs(list_c * pos_target - pos_matrix[:, None, :]), axis=1)
+
     def get_special_fitness(self, pop=None):
         """
         Args:
@@ -410,12 +1144,14 @@ class Optimizer:
         self.history.list_global_best_fit = [agent[self.ID_FIT][self.ID_TAR] for agent in self.history.list_global_best]
         self.history.list_current_best_fit = [agent[self.ID_FIT][self.ID_TAR] for agent in self.history.list_current_best]
 
-        # Draw the exploration and exploitation line with this data
-        self.history.list_diversity = np.ones(self.history.epoch)
-        for idx, pop in enumerate(self.history.list_population):
+        # Draw the exploration and exploitation line with this data, called after each epoch of solve_iter(): the
+        # saved populations are copies, only the new ones are measured
+        for pop in self.history.list_population[len(self.list_diversity):]:
             pos_matrix = np.array([agent[self.ID_POS] for agent in pop])
             div = np.mean(abs((np.median(pos_matrix, axis=0) - pos_matrix)), axis=0)
-            self.history.list_diversity[idx] = np.mean(div, axis=0)
+            self.list_diversity.append(np.mean(div, axis=0))
+        self.history.list_diversity = np.ones(self.history.epoch)
+        self.history.list_diversity[:len(self.list_diversity)] = self.list_diversity[:self.history.epoch]
         div_max = np.max(self.history.list_diversity)
         self.history.list_exploration = 100 * (self.history.list_diversity / div_max)
         self.history.list_exploitation = 100 - self.history.list_exploration
@@ -448,15 +1184,77 @@ class Optimizer:
         if 0 < k_way < 1:
             k_way = int(k_way * len(pop))
         k_way = round(k_way)
-        list_id = np.random.choice(range(len(pop)), k_way, replace=False)
-        list_parents = [pop[i] for i in list_id]
-        list_parents = sorted(list_parents, key=lambda agent: agent[self.ID_FIT][self.ID_TAR])
+        list_id = np.random.choice(len(pop), k_way, replace=False)
+        list_fitness = np.array([pop[i][self.ID_FIT][self.ID_TAR] for i in list_id])
+        list_id = list_id[np.argsort(list_fitness, kind="stable")]
         if self.problem.minmax == "min":
-            return list_parents[:output]
+            return [pop[i] for i in list_id[:output]]
         else:
-            return list_parents[-output:]
+            return [pop[i] for i in list_id[-output:]]
 
-    def get_levy_flight_step(self, beta=1.0, multiplier=0.001, case=0):
+    def get_winner_index_tournament(self, list_fitness: np.ndarray, list_contestants: np.ndarray):
+        """
+        Resolve a batch of tournaments at once.
+
+        Args:
+            list_fitness (nd.array): 1-D numpy array, the fitness (target) of each solution
+            list_contestants (nd.array): 2-D integer matrix (n_tournaments x k_way), each row holds the indices of
+                the contestants of one tournament
+
+        Returns:
+            1-D numpy array (n_tournaments,) with the index of the winner of each tournament
+        """
+        list_contestants = np.asarray(list_contestants)
+        fit_matrix = np.asarray(list_fitness)[list_contestants]
+        if self.problem.minmax == "min":
+            id_winner = np.argmin(fit_matrix, axis=1)
+        else:
+            id_winner = np.argmax(fit_matrix, axis=1)
+        return list_contestants[np.arange(len(list_contestants)), id_winner]
+
+    def get_index_kway_tournament_selection(self, list_fitness: np.ndarray, k_way=0.2, n_tournaments=1):
+        """
+        Vectorized k-way tournament selection, the contestants are drawn with replacement.
+
+        Args:
+            list_fitness (nd.array): 1-D numpy array, the fitness (target) of each solution
+            k_way (float/int): if float number --> percentage of population, int --> number of contestants
+            n_tournaments (int): number of tournaments (number of selected solutions)
+
+        Returns:
+            1-D numpy array (n_tournaments,) with the index of the selected solutions
+        """
+        if 0 < k_way < 1:
+            k_way = int(k_way * len(list_fitness))
+        k_way = max(int(round(k_way)), 1)
+        list_contestants = np.random.randint(0, len(list_fitness), (n_tournaments, k_way))
+        return self.get_winner_index_tournament(list_fitness, list_contestants)
+
+    def get_index_random_partner(self, n_agents: int, list_idx=None, n_partners=1):
+        """
+        Vectorized version of np.random.choice(np.setxor1d(range(n_agents), [idx]), n_partners, replace=False) for many agents
+
+        Args:
+            n_agents (int): number of agents (> n_partners)
+            list_idx (nd.array): 1-D integer array, the agents that need partners, default = all agents
+            n_partners (int): number of distinct partners of each agent
+
+        Returns:
+            numpy array, (len(list_idx),) for 1 partner or (len(list_idx), n_partners), random partner indexes of each
+            agent, different from each other and from the agent itself
+        """
+        list_idx = np.arange(n_agents) if list_idx is None else np.asarray(list_idx, dtype=int)
+        ## Distinct offsets in [1, n_agents - 1]: draw in a shrinking range, then skip the offsets already taken
+        list_offset = np.zeros((len(list_idx), n_partners), dtype=int)
+        for k in range(n_partners):
+            offset = np.random.randint(1, n_agents - k, len(list_idx))
+            for taken in np.sort(list_offset[:, :k], axis=1).T:
+                offset += offset >= taken
+            list_offset[:, k] = offset
+        list_partner = (list_idx[:, None] + list_offset) % n_agents
+        return list_partner[:, 0] if n_partners == 1 else list_partner
+
+    def get_levy_flight_step(self, beta=1.0, multiplier=0.001, case=0, size=None):
         """
         Parameters
         ----------
@@ -468,19 +1266,20 @@ class Optimizer:
             + 0: return multiplier * s * np.random.uniform()
             + 1: return multiplier * s * np.random.normal(0, 1)
             + -1: return multiplier * s
+        size (int, tuple, optional): None for a single step, otherwise the shape of the array of independent steps
         """
         # u and v are two random variables which follow np.random.normal distribution
         # sigma_u : standard deviation of u
         sigma_u = np.power(gamma(1 + beta) * np.sin(np.pi * beta / 2) / (gamma((1 + beta) / 2) * beta * np.power(2, (beta - 1) / 2)), 1 / beta)
         # sigma_v : standard deviation of v
         sigma_v = 1
-        u = np.random.normal(0, sigma_u ** 2)
-        v = np.random.normal(0, sigma_v ** 2)
+        u = np.random.normal(0, sigma_u ** 2, size)
+        v = np.random.normal(0, sigma_v ** 2, size)
         s = u / np.power(abs(v), 1 / beta)
         if case == 0:
-            step = multiplier * s * np.random.uniform()
+            step = multiplier * s * np.random.uniform(0, 1, size)
         elif case == 1:
-            step = multiplier * s * np.random.normal(0, 1)
+            step = multiplier * s * np.random.normal(0, 1, size)
         else:
             step = multiplier * s
         return step
@@ -547,7 +1346,7 @@ class Optimizer:
             Amended position
         """
         return np.where(np.logical_and(self.problem.lb <= position, position <= self.problem.ub),
-                        position, np.random.uniform(self.problem.lb, self.problem.ub))
+                        position, np.random.uniform(self.problem.lb, self.problem.ub, np.shape(position)))
 
     def get_global_best_global_worst_solution(self, pop=None):
         """
@@ -578,6 +1377,7 @@ class Optimizer:
         if len_old != len_new:
             print("Pop old and Pop new should be the same length!")
             exit(0)
+        self.race_population(pop_old, pop_new)
         if self.problem.minmax == "min":
             return [pop_new[i] if pop_new[i][self.ID_FIT][self.ID_TAR] < pop_old[i][self.ID_FIT][self.ID_TAR]
                     else pop_old[i] for i in range(len_old)]
@@ -614,10 +1414,10 @@ class Optimizer:
     def get_parent_kway_tournament_selection(self, pop=None, k_way=0.2, output=2):
         if 0 < k_way < 1:
             k_way = int(k_way * len(pop))
-        list_id = np.random.choice(range(len(pop)), k_way, replace=False)
-        list_parents = [pop[i] for i in list_id]
-        list_parents = sorted(list_parents, key=lambda temp: temp[self.ID_FIT])
-        return list_parents[:output]
+        list_id = np.random.choice(len(pop), k_way, replace=False)
+        list_fitness = np.array([pop[i][self.ID_FIT][self.ID_TAR] for i in list_id])
+        list_id = list_id[np.argsort(list_fitness, kind="stable")]
+        return [pop[i] for i in list_id[:output]]
 
     ### Crossover
     def crossover_arthmetic_recombination(self, dad_pos=None, mom_pos=None):
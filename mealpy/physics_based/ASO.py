@@ -10,6 +10,7 @@
 import numpy as np
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils.pairwise import get_distance_matrix, get_block_size, generate_row_blocks
 
 
 class BaseASO(Optimizer):
@@ -61,53 +62,58 @@ class BaseASO(Optimizer):
         return [position, fitness, velocity, mass]
 
     def _update_mass__(self, population):
+        """
+        Returns:
+            1-D array (pop_size,), the mass of each atom, it is also saved in each agent
+        """
+        list_fit = self.get_fitness_vector(population)
         fit_total, fit_best, fit_worst = self.get_special_fitness(population)
-        for agent in population:
-            agent[self.ID_MAS] = np.exp((agent[self.ID_FIT][self.ID_TAR] - fit_best)/(fit_worst - fit_best + self.EPSILON)) / fit_total
-        return population
+        list_mass = np.exp((list_fit - fit_best) / (fit_worst - fit_best + self.EPSILON)) / fit_total
+        for idx, agent in enumerate(population):
+            agent[self.ID_MAS] = list_mass[idx]
+        return list_mass
 
     def _find_LJ_potential__(self, iteration, average_dist, radius):
+        """
+        Args:
+            iteration (int): current iteration
+            average_dist (nd.array): distances to the k-best average, broadcastable with radius
+            radius (nd.array): distances between the atoms and the k-best atoms
+
+        Returns:
+            The Lennard-Jones potentials, same shape as radius
+        """
         c = (1 - iteration / self.epoch) ** 3
         # g0 = 1.1, u = 2.4
         rsmin = 1.1 + 0.1 * np.sin((iteration+1) / self.epoch * np.pi / 2)
         rsmax = 1.24
-        if radius/average_dist < rsmin:
-            rs = rsmin
-        else:
-            if radius/average_dist > rsmax:
-                rs = rsmax
-            else:
-                rs = radius / average_dist
-        potential = c * (12 * (-rs)**(-13) - 6 * (-rs)**(-7))
-        return potential
+        rs = np.clip(radius / average_dist, rsmin, rsmax)
+        ## (-rs)^(-13) = -rs^(-13) and (-rs)^(-7) = -rs^(-7)
+        return c * (-12 * rs ** (-13) + 6 * rs ** (-7))
 
     def _acceleration__(self, population, g_best, iteration):
         eps = 2**(-52)
-        pop = self._update_mass__(population)
+        list_mass = self._update_mass__(population)
+        pos_matrix = self.get_position_matrix(population)
 
         G = np.exp(-20.0 * (iteration+1) / self.epoch)
         k_best = int(self.pop_size - (self.pop_size - 2) * ((iteration + 1) / self.epoch) ** 0.5) + 1
-        if self.problem.minmax == "min":
-            k_best_pop = deepcopy(sorted(pop, key=lambda agent: agent[self.ID_MAS], reverse=True)[:k_best])
-        else:
-            k_best_pop = deepcopy(sorted(pop, key=lambda agent: agent[self.ID_MAS])[:k_best])
-        mk_average = np.mean([item[self.ID_POS] for item in k_best_pop])
-
-        acc_list = np.zeros((self.pop_size, self.problem.n_dims))
-        for i in range(0, self.pop_size):
-            dist_average = np.linalg.norm(pop[i][self.ID_POS] - mk_average)
-            temp = np.zeros((self.problem.n_dims))
-
-            for atom in k_best_pop:
-                # calculate LJ-potential
-                radius = np.linalg.norm(pop[i][self.ID_POS]-atom[self.ID_POS])
-                potential = self._find_LJ_potential__(iteration, dist_average, radius)
-                temp += potential * np.random.uniform(0, 1, self.problem.n_dims) * ((atom[self.ID_POS]-pop[i][self.ID_POS])/(radius + eps))
-            temp = self.alpha * temp + self.beta * (g_best[self.ID_POS] - pop[i][self.ID_POS])
-            # calculate acceleration
-            acc = G * temp / pop[i][self.ID_MAS]
-            acc_list[i] = acc
-        return acc_list
+        list_order = np.argsort(-list_mass if self.problem.minmax == "min" else list_mass, kind="stable")[:k_best]
+        pos_kbest = pos_matrix[list_order]
+        mk_average = np.mean(pos_kbest)
+
+        dist_average = np.linalg.norm(pos_matrix - mk_average, axis=1)
+        temp = np.zeros((self.pop_size, self.problem.n_dims))
+        for list_rows in generate_row_blocks(self.pop_size, get_block_size(len(pos_kbest), self.problem.n_dims)):
+            # calculate LJ-potential
+            radius = get_distance_matrix(pos_matrix[list_rows], pos_kbest)
+            potential = self._find_LJ_potential__(iteration, dist_average[list_rows, None], radius)
+            weights = (potential / (radius + eps))[:, :, None] * \
+                      np.random.uniform(0, 1, (len(list_rows), len(pos_kbest), self.problem.n_dims))
+            temp[list_rows] = np.einsum("ijd,jd->id", weights, pos_kbest) - np.sum(weights, axis=1) * pos_matrix[list_rows]
+        temp = self.alpha * temp + self.beta * (g_best[self.ID_POS] - pos_matrix)
+        # calculate acceleration
+        return G * temp / list_mass[:, None]
 
     def evolve(self, epoch):
         """
@@ -118,16 +124,13 @@ class BaseASO(Optimizer):
         atom_acc_list = self._acceleration__(self.pop, self.g_best, iteration=epoch)
 
         # Update velocity based on random dimensions and position of global best
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            agent = deepcopy(self.pop[idx])
-            velocity_rand = np.random.uniform(self.problem.lb, self.problem.ub)
-            velocity = velocity_rand * self.pop[idx][self.ID_VEL] + atom_acc_list[idx]
-            pos_new = self.pop[idx][self.ID_POS] + velocity
-            # Relocate atom out of range
-            agent[self.ID_POS] = self.amend_position_random(pos_new)
-            pop_new.append(agent)
-        pop_new = self.update_fitness_population(pop_new)
+        velocity_rand = np.random.uniform(self.problem.lb, self.problem.ub, (self.pop_size, self.problem.n_dims))
+        velocity = velocity_rand * np.array([agent[self.ID_VEL] for agent in self.pop]) + atom_acc_list
+        pos_new = self.get_position_matrix(self.pop) + velocity
+        # Relocate atom out of range
+        pos_new = self.amend_position_random(pos_new)
+        pop_new = [[pos_new[idx], None, agent[self.ID_VEL], agent[self.ID_MAS]] for idx, agent in enumerate(self.pop)]
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         pop_new = self.greedy_selection_population(self.pop, pop_new)
 
         _, current_best = self.get_global_best_solution(pop_new)
@@ -119,5 +119,5 @@ class OriginalArchOA(Optimizer):
                           ddf * (t * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
             solution[self.ID_POS] = self.amend_position_faster(pos_new)
             pop_new.append(solution)
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
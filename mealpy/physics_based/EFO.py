@@ -78,7 +78,7 @@ class BaseEFO(Optimizer):
             # checking whether the generated number is inside boundary or not
             pos_new = self.amend_position_random(pos_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
 
@@ -38,38 +38,55 @@ class BaseEO(Optimizer):
         self.a2 = 1
         self.GP = 0.5
 
-    def make_equilibrium_pool(self, list_equilibrium=None):
-        pos_list = [item[self.ID_POS] for item in list_equilibrium]
-        pos_mean = np.mean(pos_list, axis=0)
-        fit = self.get_fitness_position(pos_mean)
-        list_equilibrium.append([pos_mean, fit])
-        return list_equilibrium
+    def make_equilibrium_pool(self, pop=None):
+        """
+        Args:
+            pop (list): the population
 
-    def evolve(self, epoch):
+        Returns:
+            list_best (nd.array): index of the 4 best solutions in pop
+            pos_pool (nd.array): 2-D matrix (5 x n_dims), the 4 best positions and their mean
         """
+        list_best = self.get_index_best(self.get_fitness_vector(pop), best=4)
+        pos_best = self.get_position_matrix([pop[idx] for idx in list_best])
+        return list_best, np.concatenate((pos_best, np.mean(pos_best, axis=0, keepdims=True)), axis=0)
+
+    def _update_concentration(self, pos_matrix, pos_pool, epoch):
+        """
+        Eq. 9 and Eq. 11-16 for the whole population, each particle draws 1 candidate of the pool
+
         Args:
+            pos_matrix (nd.array): 2-D matrix (pop_size x n_dims) of the current positions
+            pos_pool (nd.array): 2-D matrix (n_pool x n_dims) of the equilibrium pool
             epoch (int): The current iteration
+
+        Returns:
+            2-D matrix (pop_size x n_dims) of new positions (not amended)
         """
-        # ---------------- Memory saving-------------------  make equilibrium pool
-        _, c_eq_list, _ = self.get_special_solutions(self.pop, best=4)
-        c_pool = self.make_equilibrium_pool(c_eq_list)
+        n_agents = len(pos_matrix)
         # Eq. 9
         t = (1 - epoch / self.epoch) ** (self.a2 * epoch / self.epoch)
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            lamda = np.random.uniform(0, 1, self.problem.n_dims)  # lambda in Eq. 11
-            r = np.random.uniform(0, 1, self.problem.n_dims)  # r in Eq. 11
-            c_eq = c_pool[np.random.randint(0, len(c_pool))][self.ID_POS]  # random selection 1 of candidate from the pool
-            f = self.a1 * np.sign(r - 0.5) * (np.exp(-lamda * t) - 1.0)  # Eq. 11
-            r1 = np.random.uniform()
-            r2 = np.random.uniform()  # r1, r2 in Eq. 15
-            gcp = 0.5 * r1 * np.ones(self.problem.n_dims) * (r2 >= self.GP)  # Eq. 15
-            g0 = gcp * (c_eq - lamda * self.pop[idx][self.ID_POS])  # Eq. 14
-            g = g0 * f  # Eq. 13
-            pos_new = c_eq + (self.pop[idx][self.ID_POS] - c_eq) * f + (g * self.V / lamda) * (1.0 - f)  # Eq. 16
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None])
-        self.pop = self.update_fitness_population(pop_new)
+        lamda = np.random.uniform(0, 1, (n_agents, self.problem.n_dims))  # lambda in Eq. 11
+        r = np.random.uniform(0, 1, (n_agents, self.problem.n_dims))  # r in Eq. 11
+        c_eq = pos_pool[np.random.randint(0, len(pos_pool), n_agents)]  # random selection 1 of candidate from the pool
+        f = self.a1 * np.sign(r - 0.5) * (np.exp(-lamda * t) - 1.0)  # Eq. 11
+        r1 = np.random.uniform(0, 1, (n_agents, 1))
+        r2 = np.random.uniform(0, 1, (n_agents, 1))  # r1, r2 in Eq. 15
+        gcp = 0.5 * r1 * (r2 >= self.GP)  # Eq. 15
+        g0 = gcp * (c_eq - lamda * pos_matrix)  # Eq. 14
+        g = g0 * f  # Eq. 13
+        return c_eq + (pos_matrix - c_eq) * f + (g * self.V / lamda) * (1.0 - f)  # Eq. 16
+
+    def evolve(self, epoch):
+        """
+        Args:
+            epoch (int): The current iteration
+        """
+        # ---------------- Memory saving-------------------  make equilibrium pool
+        _, pos_pool = self.make_equilibrium_pool(self.pop)
+        pos_new = self._update_concentration(self.get_position_matrix(self.pop), pos_pool, epoch)
+        pos_new = self.amend_position_faster(pos_new)
+        self.pop = self.update_fitness_population([[pos, None] for pos in pos_new])
 
 
 class ModifiedEO(BaseEO):
@@ -87,10 +104,10 @@ class ModifiedEO(BaseEO):
             pop_size (int): number of population size, default = 100
         """
         super().__init__(problem, epoch, pop_size, **kwargs)
-        self.nfe_per_epoch = 2*pop_size
         self.sort_flag = False
 
         self.pop_len = int(self.pop_size / 3)
+        self.nfe_per_epoch = pop_size + 1 + 2 * self.pop_len
 
     def evolve(self, epoch):
         """
@@ -98,52 +115,29 @@ class ModifiedEO(BaseEO):
             epoch (int): The current iteration
         """
         # ---------------- Memory saving-------------------  make equilibrium pool
-        _, c_eq_list, _ = self.get_special_solutions(self.pop, best=4)
-        c_pool = self.make_equilibrium_pool(c_eq_list)
-
-        # Eq. 9
-        t = (1 - epoch / self.epoch) ** (self.a2 * epoch / self.epoch)
-
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            lamda = np.random.uniform(0, 1, self.problem.n_dims)  # lambda in Eq. 11
-            r = np.random.uniform(0, 1, self.problem.n_dims)  # r in Eq. 11
-            c_eq = c_pool[np.random.randint(0, len(c_pool))][self.ID_POS]  # random selection 1 of candidate from the pool
-            f = self.a1 * np.sign(r - 0.5) * (np.exp(-lamda * t) - 1.0)  # Eq. 11
-            r1 = np.random.uniform()
-            r2 = np.random.uniform()  # r1, r2 in Eq. 15
-            gcp = 0.5 * r1 * np.ones(self.problem.n_dims) * (r2 >= self.GP)  # Eq. 15
-            g0 = gcp * (c_eq - lamda * self.pop[idx][self.ID_POS])  # Eq. 14
-            g = g0 * f  # Eq. 13
-            pos_new = c_eq + (self.pop[idx][self.ID_POS] - c_eq) * f + (g * self.V / lamda) * (1.0 - f)  # Eq. 16
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        list_best, pos_pool = self.make_equilibrium_pool(self.pop)
+        pos_new = self._update_concentration(self.get_position_matrix(self.pop), pos_pool, epoch)
+        pos_new = self.amend_position_faster(pos_new)
+        ## The mean of the pool is evaluated in the same batch as the new population
+        pop_new = self.update_fitness_population([[pos, None] for pos in pos_new] + [[pos_pool[-1], None]])
+        c_pool = [self.pop[idx] for idx in list_best] + [pop_new.pop()]
 
         ## Sort the updated population based on fitness
-        _, pop_s1, _ = self.get_special_solutions(pop_new, best=self.pop_len)
+        pop_s1 = [pop_new[idx] for idx in self.get_index_best(self.get_fitness_vector(pop_new), best=self.pop_len)]
+        pos_s1 = self.get_position_matrix(pop_s1)
 
         ## Mutation scheme
-        pop_s2_new = []
-        for i in range(0, self.pop_len):
-            pos_new = pop_s1[i][self.ID_POS] * (1 + np.random.normal(0, 1, self.problem.n_dims))  # Eq. 12
-            pos_new = self.amend_position_faster(pos_new)
-            pop_s2_new.append([pos_new, None])
-        pop_s2 = self.update_fitness_population(pop_s2_new)
+        pos_s2 = pos_s1 * (1 + np.random.normal(0, 1, (self.pop_len, self.problem.n_dims)))  # Eq. 12
 
         ## Search Mechanism
-        pos_s1_list = [item[self.ID_POS] for item in pop_s1]
-        pos_s1_mean = np.mean(pos_s1_list, axis=0)
-        pop_s3 = []
-        for i in range(0, self.pop_len):
-            pos_new = (c_pool[0][self.ID_POS] - pos_s1_mean) - np.random.random() * \
-                      (self.problem.lb + np.random.random() * (self.problem.ub - self.problem.lb))
-            pos_new = self.amend_position_faster(pos_new)
-            pop_s3.append([pos_new, None])
-        pop_s3 = self.update_fitness_population(pop_s3)
+        pos_s1_mean = np.mean(pos_s1, axis=0)
+        pos_s3 = (pos_pool[0] - pos_s1_mean) - np.random.random((self.pop_len, 1)) * \
+                 (self.problem.lb + np.random.random((self.pop_len, 1)) * (self.problem.ub - self.problem.lb))
+        pos_s23 = self.amend_position_faster(np.concatenate((pos_s2, pos_s3), axis=0))
+        pop_s23 = self.update_fitness_population([[pos, None] for pos in pos_s23])
 
         ## Construct a new population
-        self.pop = pop_s1 + pop_s2 + pop_s3
+        self.pop = pop_s1 + pop_s23
         n_left = self.pop_size - len(self.pop)
         idx_selected = np.random.choice(range(0, len(c_pool)), n_left, replace=False)
         for i in range(0, n_left):
@@ -176,33 +170,15 @@ class AdaptiveEO(BaseEO):
             epoch (int): The current iteration
         """
         # ---------------- Memory saving-------------------  make equilibrium pool
-        _, c_eq_list, _ = self.get_special_solutions(self.pop, best=4)
-        c_pool = self.make_equilibrium_pool(c_eq_list)
-
-        # Eq. 9
-        t = (1 - epoch / self.epoch) ** (self.a2 * epoch / self.epoch)
+        _, pos_pool = self.make_equilibrium_pool(self.pop)
 
         ## Memory saving, Eq 20, 21
-        t = (1 - epoch / self.epoch) ** (self.a2 * epoch / self.epoch)
-
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            lamda = np.random.uniform(0, 1, self.problem.n_dims)
-            r = np.random.uniform(0, 1, self.problem.n_dims)
-            c_eq = c_pool[np.random.randint(0, len(c_pool))][self.ID_POS]  # random selection 1 of candidate from the pool
-            f = self.a1 * np.sign(r - 0.5) * (np.exp(-lamda * t) - 1.0)  # Eq. 14
-
-            r1 = np.random.uniform()
-            r2 = np.random.uniform()
-            gcp = 0.5 * r1 * np.ones(self.problem.n_dims) * (r2 >= self.GP)
-            g0 = gcp * (c_eq - lamda * self.pop[idx][self.ID_POS])
-            g = g0 * f
-
-            fit_average = np.mean([item[self.ID_FIT][self.ID_TAR] for item in self.pop])  # Eq. 19
-            pos_new = c_eq + (self.pop[idx][self.ID_POS] - c_eq) * f + (g * self.V / lamda) * (1.0 - f)  # Eq. 9
-            if self.pop[idx][self.ID_FIT][self.ID_TAR] >= fit_average:
-                pos_new = np.multiply(pos_new, (0.5 + np.random.uniform(0, 1, self.problem.n_dims)))
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None])
-        self.pop = self.update_fitness_population(pop_new)
-
+        pos_new = self._update_concentration(self.get_position_matrix(self.pop), pos_pool, epoch)  # Eq. 9, 14
+
+        ## The particles worse than the average fitness are perturbed
+        list_fit = self.get_fitness_vector(self.pop)
+        fit_average = np.mean(list_fit)  # Eq. 19
+        list_worse = ~self.compare_fitness_vector(list_fit, fit_average)
+        pos_new[list_worse] *= 0.5 + np.random.uniform(0, 1, (np.sum(list_worse), self.problem.n_dims))
+        pos_new = self.amend_position_faster(pos_new)
+        self.pop = self.update_fitness_population([[pos, None] for pos in pos_new])
@@ -10,6 +10,7 @@
 import numpy as np
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils import group
 
 
 class BaseHGSO(Optimizer):
@@ -51,32 +52,18 @@ class BaseHGSO(Optimizer):
         self.P_ij = self.l2 * np.random.uniform()
         self.C_j = self.l3 * np.random.uniform()
 
-        self.pop_group, self.p_best = None, None
-
-    def _create_group(self, pop):
-        pop_group = []
-        for idx in range(0, self.n_clusters):
-            pop_group.append(pop[idx*self.n_elements:(idx+1)*self.n_elements])
-        return pop_group
-
-    def _flatten_group(self, group):
-        pop = []
-        for idx in range(0, self.n_clusters):
-            pop += group[idx]
-        return pop
+        ## group_ids[k] is the gas type (cluster) of the k-th agent, the last cluster also gets the remaining agents
+        self.group_ids = np.minimum(np.arange(0, self.pop_size) // self.n_elements, self.n_clusters - 1)
+        self.p_best = None
 
     def initialization(self):
         self.pop = self.create_population(self.pop_size)
         _, self.g_best = self.get_global_best_solution(self.pop)
-        self.pop_group = self._create_group(self.pop)
-        self.p_best = self._get_best_solution_in_team(self.pop_group)  # multiple element
+        self.p_best = self._get_best_solution_in_team(self.pop)  # multiple element
 
-    def _get_best_solution_in_team(self, group=None):
-        list_best = []
-        for i in range(len(group)):
-            _, best_agent = self.get_global_best_solution(group[i])
-            list_best.append(best_agent)
-        return list_best
+    def _get_best_solution_in_team(self, pop=None):
+        list_best = group.get_group_best(self.get_fitness_vector(pop), self.group_ids, self.n_clusters, self.problem.minmax)
+        return [deepcopy(pop[idx]) for idx in list_best]
 
     def evolve(self, epoch):
         """
@@ -84,48 +71,34 @@ class BaseHGSO(Optimizer):
             epoch (int): The current iteration
         """
         nfe_epoch = 0
-        ## Loop based on the number of cluster in swarm (number of gases type)
-        for i in range(self.n_clusters):
-            ### Loop based on the number of individual in each gases type
-            pop_new = []
-            for j in range(self.n_elements):
-                F = -1.0 if np.random.uniform() < 0.5 else 1.0
-
-                ##### Based on Eq. 8, 9, 10
-                self.H_j = self.H_j * np.exp(-self.C_j * (1.0 / np.exp(-epoch / self.epoch) - 1.0 / self.T0))
-                S_ij = self.K * self.H_j * self.P_ij
-                gama = self.beta * np.exp(- ((self.p_best[i][self.ID_FIT][self.ID_TAR] + self.epxilon) /
-                                             (self.pop_group[i][j][self.ID_FIT][self.ID_TAR] + self.epxilon)))
-                X_ij = self.pop_group[i][j][self.ID_POS] + F * np.random.uniform() * gama * \
-                       (self.p_best[i][self.ID_POS] - self.pop_group[i][j][self.ID_POS]) + \
-                       F * np.random.uniform() * self.alpha * (S_ij * self.g_best[self.ID_POS] - self.pop_group[i][j][self.ID_POS])
-                pos_new = self.amend_position_faster(X_ij)
-                pop_new.append([pos_new, None])
-                nfe_epoch += 1
-            self.pop_group[i] = self.update_fitness_population(pop_new)
-        self.pop = self._flatten_group(self.pop_group)
+        pos_matrix = self.get_position_matrix(self.pop)
+        list_fitness = self.get_fitness_vector(self.pop)
+        pos_best = self.get_position_matrix(self.p_best)[self.group_ids]
+        fit_best = self.get_fitness_vector(self.p_best)[self.group_ids]
+        F = np.where(np.random.uniform(0, 1, (self.pop_size, 1)) < 0.5, -1.0, 1.0)
+
+        ##### Based on Eq. 8, 9, 10: Henry's coefficient is updated once for each agent
+        factor = np.exp(-self.C_j * (1.0 / np.exp(-epoch / self.epoch) - 1.0 / self.T0))
+        list_H_j = self.H_j * factor ** np.arange(1, self.pop_size + 1)
+        self.H_j = list_H_j[-1]
+        S_ij = (self.K * list_H_j * self.P_ij)[:, None]
+        gama = self.beta * np.exp(- ((fit_best + self.epxilon) / (list_fitness + self.epxilon)))[:, None]
+        X_ij = pos_matrix + F * np.random.uniform(0, 1, (self.pop_size, 1)) * gama * (pos_best - pos_matrix) + \
+               F * np.random.uniform(0, 1, (self.pop_size, 1)) * self.alpha * (S_ij * self.g_best[self.ID_POS] - pos_matrix)
+        pos_new = self.amend_position_faster(X_ij)
+        self.pop = self.update_fitness_population([[pos, None] for pos in pos_new])
+        nfe_epoch += self.pop_size
 
         ## Update Henry's coefficient using Eq.8
-        self.H_j = self.H_j * np.exp(-self.C_j * (1.0 / np.exp(-epoch / self.epoch) - 1.0 / self.T0))
-        ## Update the solubility of each gas using Eq.9
-        S_ij = self.K * self.H_j * self.P_ij
+        self.H_j = self.H_j * factor
         ## Rank and select the number of worst agents using Eq. 11
         N_w = int(self.pop_size * (np.random.uniform(0, 0.1) + 0.1))
         ## Update the position of the worst agents using Eq. 12
-        sorted_id_pos = np.argsort([x[self.ID_FIT][self.ID_TAR] for x in self.pop])
-
-        pop_new = []
-        pop_idx = []
-        for item in range(N_w):
-            id = sorted_id_pos[item]
-            X_new = np.random.uniform(self.problem.lb, self.problem.ub)
-            pos_new = self.amend_position_faster(X_new)
-            pop_new.append([pos_new, None])
-            pop_idx.append(id)
-            nfe_epoch += 1
-        pop_new = self.update_fitness_population(pop_new)
-        for idx, id_selected in enumerate(pop_idx):
-            self.pop[id_selected] = deepcopy(pop_new[idx])
-        self.pop_group = self._create_group(self.pop)
-        self.p_best = self._get_best_solution_in_team(self.pop_group)
+        list_fitness = self.get_fitness_vector(self.pop)
+        sorted_id_pos = np.argsort(-list_fitness if self.problem.minmax == "min" else list_fitness)
+        pop_new = self.create_population(N_w)
+        for idx, id_selected in enumerate(sorted_id_pos[:N_w]):
+            self.pop[id_selected] = pop_new[idx]
+        nfe_epoch += N_w
+        self.p_best = self._get_best_solution_in_team(self.pop)
         self.nfe_per_epoch = nfe_epoch
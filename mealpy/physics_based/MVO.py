@@ -65,7 +65,7 @@ class BaseMVO(Optimizer):
                 black_hole_pos = np.random.uniform(self.problem.lb, self.problem.ub)
             pos_new = self.amend_position_faster(black_hole_pos)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
 
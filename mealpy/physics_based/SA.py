@@ -8,7 +8,6 @@
 # ------------------------------------------------------------------------------------------------------%
 
 import numpy as np
-from copy import deepcopy
 from mealpy.optimizer import Optimizer
 
 
@@ -50,12 +49,22 @@ class BaseSA(Optimizer):
         self.dyn_t, self.t_damp, self.dyn_sigma = None, None, None
 
     def _mutate(self, position, sigma):
-        # Select Mutating Variables
-        pos_new = position + sigma * np.random.uniform(self.problem.lb, self.problem.ub)
-        pos_new = np.where(np.random.uniform(0, 1, self.problem.n_dims) < self.mutation_rate, position, pos_new)
+        """
+        Args:
+            position (nd.array): positions with shape (..., n_dims), e.g. (pop_size, move_count, n_dims)
+            sigma (float): mutation step size
 
-        if np.all(pos_new == position):  # Select at least one variable to _mutate
-            pos_new[np.random.randint(0, self.problem.n_dims)] = np.random.uniform()
+        Returns:
+            Mutated positions with the same shape, at least one variable of each position is mutated
+        """
+        position = np.asarray(position)
+        # Select Mutating Variables
+        mask = np.random.uniform(0, 1, position.shape) < self.mutation_rate
+        list_none = np.flatnonzero(~np.any(mask.reshape(-1, self.problem.n_dims), axis=1))
+        if len(list_none) > 0:  # Select at least one variable to _mutate
+            mask.reshape(-1, self.problem.n_dims)[list_none, np.random.randint(0, self.problem.n_dims, len(list_none))] = True
+        pos_new = position + sigma * np.random.uniform(self.problem.lb, self.problem.ub, position.shape)
+        pos_new = np.where(mask, pos_new, position)
         return self.amend_position_faster(pos_new)
 
     def initialization(self):
@@ -71,33 +80,32 @@ class BaseSA(Optimizer):
         Args:
             epoch (int): The current iteration
         """
+        pos_matrix = self.get_position_matrix(self.pop)
+        list_idx = np.arange(0, self.pop_size)
         # Sub-Iterations
         for g in range(0, self.max_sub_iter):
 
-            # Create new population
-            pop_new = []
-            for i in range(0, self.pop_size):
-                for j in range(0, self.move_count):
-                    # Perform Mutation (Move)
-                    pos_new = self._mutate(self.pop[i][self.ID_POS], self.dyn_sigma)
-                    pos_new = self.amend_position_faster(pos_new)
-                    pop_new.append([pos_new, None])
-            pop_new = self.update_fitness_population(pop_new)
+            # Create new population: all moves of all individuals as one (pop_size x move_count x n_dims) tensor
+            pos_new = self._mutate(np.repeat(pos_matrix[:, None, :], self.move_count, axis=1), self.dyn_sigma)
+            pos_new = pos_new.reshape(-1, self.problem.n_dims)
+            pop_new = self.update_fitness_population_delta([[pos, None] for pos in pos_new],
+                                                           np.repeat(pos_matrix, self.move_count, axis=0))
 
-            # Columnize and Sort Newly Created Population
-            pop_new = self.get_sorted_strim_population(pop_new, self.pop_size)
+            # Best move of each individual
+            fit_new = self.get_fitness_vector(pop_new).reshape(self.pop_size, self.move_count)
+            if self.problem.minmax == "min":
+                list_best = np.argmin(fit_new, axis=1)
+            else:
+                list_best = np.argmax(fit_new, axis=1)
+            pop_best = [pop_new[i * self.move_count + list_best[i]] for i in list_idx]
 
-            # Randomized Selection
-            for i in range(0, self.pop_size):
-                # Check if new solution is better than current
-                if self.compare_agent(pop_new[i], self.pop[i]):
-                    self.pop[i] = deepcopy(pop_new[i])
-                else:
-                    # Compute difference according to problem type
-                    delta = abs(pop_new[i][self.ID_FIT][self.ID_TAR] - self.pop[i][self.ID_FIT][self.ID_TAR])
-                    p = np.exp(-delta / self.dyn_t)  # Compute Acceptance Probability
-                    if np.random.uniform() <= p:  # Accept / Reject
-                        self.pop[i] = deepcopy(pop_new[i])
+            # Randomized Selection: accept better moves, accept worse moves with probability exp(-delta / T)
+            list_better = self.compare_population(pop_best, self.pop)
+            delta = np.abs(self.get_fitness_vector(pop_best) - self.get_fitness_vector(self.pop))
+            list_accept = list_better | (np.random.uniform(0, 1, self.pop_size) <= np.exp(-delta / self.dyn_t))
+            for i in np.flatnonzero(list_accept):
+                self.pop[i] = pop_best[i]
+            pos_matrix[list_accept] = pos_new[list_idx * self.move_count + list_best][list_accept]
         # Update Temperature
         self.dyn_t = self.t_damp * self.dyn_t
         self.dyn_sigma = self.mutation_step_size_damp * self.dyn_sigma
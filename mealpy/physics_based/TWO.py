@@ -10,6 +10,7 @@
 import numpy as np
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils.pairwise import get_weighted_displacement, get_block_size, generate_row_blocks
 
 
 class BaseTWO(Optimizer):
@@ -51,15 +52,14 @@ class BaseTWO(Optimizer):
         return [solution, fitness, weight]
 
     def _update_weight(self, teams):
-        _, best, worst = self.get_special_solutions(teams, best=1, worst=1)
-        best_fit = best[0][self.ID_FIT][self.ID_TAR]
-        worst_fit = worst[0][self.ID_FIT][self.ID_TAR]
+        list_fit = self.get_fitness_vector(teams)
+        best_fit, worst_fit = (np.min(list_fit), np.max(list_fit)) if self.problem.minmax == "min" else (np.max(list_fit), np.min(list_fit))
         if best_fit == worst_fit:
-            for i in range(self.pop_size):
-                teams[i][self.ID_WEIGHT] = np.random.uniform(0.5, 1.5)
+            list_weight = np.random.uniform(0.5, 1.5, len(teams))
         else:
-            for i in range(self.pop_size):
-                teams[i][self.ID_WEIGHT] = (teams[i][self.ID_FIT][self.ID_TAR] - worst_fit)/(best_fit - worst_fit + self.EPSILON) + 1
+            list_weight = (list_fit - worst_fit)/(best_fit - worst_fit + self.EPSILON) + 1
+        for i in range(len(teams)):
+            teams[i][self.ID_WEIGHT] = list_weight[i]
         return teams
 
     def initialization(self):
@@ -67,38 +67,85 @@ class BaseTWO(Optimizer):
         _, self.g_best = self.get_global_best_solution(self.pop)
         self.pop = self._update_weight(self.pop)
 
+    def _pull_teams(self, epoch):
+        """
+        Every team i is pulled by all heavier teams j. The displacement is
+            sum_j acceleration_ij / 2 + sum_j alpha^(t+1) * beta * (ub - lb) * N(0, 1)
+        The first sum is a (masked pop_size x pop_size) coefficient matrix times the position matrix, the second one is
+        a sum of n_i independent normal vectors, drawn directly as sqrt(n_i) * N(0, 1).
+
+        Returns:
+            2-D matrix (pop_size x n_dims) of the pulled positions (not amended)
+        """
+        pos_matrix = self.get_position_matrix(self.pop)
+        list_weight = np.array([agent[self.ID_WEIGHT] for agent in self.pop], dtype=float)
+        pos_new = pos_matrix.copy()
+        list_count = np.zeros(self.pop_size)
+        for list_rows in generate_row_blocks(self.pop_size, get_block_size(self.pop_size)):
+            w_i = list_weight[list_rows, None]
+            mask = w_i < list_weight[None, :]
+            force = np.maximum(w_i * self.muy_s, list_weight[None, :] * self.muy_s)
+            resultant_force = force - w_i * self.muy_k
+            coef = np.where(mask, 0.5 * resultant_force / (w_i * self.muy_k), 0)
+            pos_new[list_rows] += get_weighted_displacement(coef, pos_matrix[list_rows], pos_matrix)
+            list_count[list_rows] = np.sum(mask, axis=1)
+        noise = np.random.normal(0, 1, (self.pop_size, self.problem.n_dims)) * np.sqrt(list_count)[:, None]
+        return pos_new + np.power(self.alpha, epoch + 1) * self.beta * (self.problem.ub - self.problem.lb) * noise
+
+    def _amend_teams(self, pos_new, pos_old, epoch):
+        """
+        The out-of-bound dimensions are, with the same probability, either moved around the global best solution
+        (kept at the old value if still out of bound), or clipped to the bounds.
+
+        Args:
+            pos_new (nd.array): 2-D matrix (pop_size x n_dims), the pulled positions
+            pos_old (nd.array): 2-D matrix (pop_size x n_dims), the positions before pulling
+
+        Returns:
+            2-D matrix (pop_size x n_dims) of amended positions
+        """
+        lb, ub, g_best = self.problem.lb, self.problem.ub, self.g_best[self.ID_POS]
+        out_bound = (pos_new < lb) | (pos_new > ub)
+        pos_gb = g_best + np.random.normal(0, 1, pos_new.shape) / (epoch + 1) * (g_best - pos_new)
+        pos_gb = np.where((pos_gb < lb) | (pos_gb > ub), pos_old, pos_gb)
+        pos_amend = np.where(np.random.uniform(0, 1, pos_new.shape) <= 0.5, pos_gb, np.clip(pos_new, lb, ub))
+        return np.where(out_bound, pos_amend, pos_new)
+
+    def _create_pulled_population(self, epoch):
+        pos_new = self._amend_teams(self._pull_teams(epoch), self.get_position_matrix(self.pop), epoch)
+        return self.update_fitness_population_bound([[pos, None, 0.0] for pos in pos_new], self.pop)
+
+    def _replace_population(self, list_idx, pop_candidate):
+        """
+        Greedy replacement of the agents at list_idx by the candidates (same order)
+        """
+        list_better = self.compare_population(pop_candidate, [self.pop[idx] for idx in list_idx])
+        for k in np.where(list_better)[0]:
+            self.pop[list_idx[k]] = pop_candidate[k]
+        return list_idx[~list_better]
+
+    def _create_opposition_population(self, list_idx):
+        pos_matrix = self.get_position_matrix([self.pop[idx] for idx in list_idx]).reshape(-1, self.problem.n_dims)
+        g_best = self.g_best[self.ID_POS]
+        pos_op = self.problem.lb + self.problem.ub - g_best + np.random.uniform(0, 1, (len(list_idx), 1)) * (g_best - pos_matrix)
+        pos_op = self.amend_position_random(pos_op)
+        return self.update_fitness_population([[pos, None, 0.0] for pos in pos_op])
+
+    def _create_levy_population(self, list_idx, epoch):
+        pos_matrix = self.get_position_matrix([self.pop[idx] for idx in list_idx]).reshape(-1, self.problem.n_dims)
+        levy_step = self.get_levy_flight_step(beta=1.0, multiplier=0.001, case=-1, size=(len(list_idx), 1))
+        pos_new = pos_matrix + 1.0 / np.sqrt(epoch + 1) * np.sign(np.random.random((len(list_idx), 1)) - 0.5) * levy_step
+        pos_new = self.amend_position_faster(pos_new)
+        return self.update_fitness_population([[pos, None, 0.0] for pos in pos_new])
+
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        pop_new = deepcopy(self.pop)
-        for i in range(self.pop_size):
-            for j in range(self.pop_size):
-                if self.pop[i][self.ID_WEIGHT] < self.pop[j][self.ID_WEIGHT]:
-                    force = max(self.pop[i][self.ID_WEIGHT] * self.muy_s, self.pop[j][self.ID_WEIGHT] * self.muy_s)
-                    resultant_force = force - self.pop[i][self.ID_WEIGHT] * self.muy_k
-                    g = self.pop[j][self.ID_POS] - self.pop[i][self.ID_POS]
-                    acceleration = resultant_force * g / (self.pop[i][self.ID_WEIGHT] * self.muy_k)
-                    delta_x = 1 / 2 * acceleration + np.power(self.alpha, epoch + 1) * self.beta * \
-                              (self.problem.ub - self.problem.lb) * np.random.randn(self.problem.n_dims)
-                    pop_new[i][self.ID_POS] += delta_x
-        for i in range(self.pop_size):
-            for j in range(self.problem.n_dims):
-                if pop_new[i][self.ID_POS][j] < self.problem.lb[j] or pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                    if np.random.random() <= 0.5:
-                        pop_new[i][self.ID_POS][j] = self.g_best[self.ID_POS][j] + np.random.randn() / (epoch + 1) * \
-                                                     (self.g_best[self.ID_POS][j] - pop_new[i][self.ID_POS][j])
-                        if pop_new[i][self.ID_POS][j] < self.problem.lb[j] or pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                            pop_new[i][self.ID_POS][j] = self.pop[i][self.ID_POS][j]
-                    else:
-                        if pop_new[i][self.ID_POS][j] < self.problem.lb[j]:
-                            pop_new[i][self.ID_POS][j] = self.problem.lb[j]
-                        if pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                            pop_new[i][self.ID_POS][j] = self.problem.ub[j]
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self._create_pulled_population(epoch)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
-        self.pop = self._update_weight(pop_new)
+        self.pop = self._update_weight(self.pop)
 
 
 class OppoTWO(BaseTWO):
@@ -121,6 +168,7 @@ class OppoTWO(BaseTWO):
         for i in range(len(pop_temp)):
             item_oppo = self.problem.ub + self.problem.lb - pop_temp[i][self.ID_POS]
             pop_oppo.append([item_oppo, None, 0.0])
+        pop_oppo += self.create_population(self.pop_size - 2 * len(pop_temp))
         pop_oppo = self.update_fitness_population(pop_oppo)
         self.pop = pop_temp + pop_oppo
         self.pop = self._update_weight(self.pop)
@@ -131,39 +179,14 @@ class OppoTWO(BaseTWO):
         Args:
             epoch (int): The current iteration
         """
-        ## Apply force of others solution on each individual solution
-        pop_new = deepcopy(self.pop)
-        for i in range(self.pop_size):
-            for j in range(self.pop_size):
-                if self.pop[i][self.ID_WEIGHT] < self.pop[j][self.ID_WEIGHT]:
-                    force = max(self.pop[i][self.ID_WEIGHT] * self.muy_s, self.pop[j][self.ID_WEIGHT] * self.muy_s)
-                    resultant_force = force - self.pop[i][self.ID_WEIGHT] * self.muy_k
-                    g = self.pop[j][self.ID_POS] - self.pop[i][self.ID_POS]
-                    acceleration = resultant_force * g / (self.pop[i][self.ID_WEIGHT] * self.muy_k)
-                    delta_x = 1 / 2 * acceleration + np.power(self.alpha, epoch + 1) * self.beta * \
-                              (self.problem.ub - self.problem.lb) * np.random.randn(self.problem.n_dims)
-                    self.pop[i][self.ID_POS] += delta_x
-
-        ## Amend solution and update fitness value
-        for i in range(self.pop_size):
-            pos_new = self.g_best[self.ID_POS] + np.random.normal(0, 1, self.problem.n_dims) / (epoch + 1) * \
-                      (self.g_best[self.ID_POS] - pop_new[i][self.ID_POS])
-            conditions = np.logical_or(pop_new[i][self.ID_POS] < self.problem.lb, pop_new[i][self.ID_POS] > self.problem.ub)
-            conditions = np.logical_and(conditions, np.random.uniform(0, 1, self.problem.n_dims) < 0.5)
-            pos_new = np.where(conditions, pos_new, self.pop[i][self.ID_POS])
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new[i][self.ID_POS] = pos_new
-        pop_new = self.update_fitness_population(pop_new)
-
-        ## Opposition-based here
-        for i in range(self.pop_size):
-            if self.compare_agent(self.pop[i], pop_new[i]):
-                self.pop[i] = deepcopy(pop_new[i])
-            else:
-                C_op = self.create_opposition_position(self.pop[i][self.ID_POS], self.g_best[self.ID_POS])
-                fit_op = self.get_fitness_position(C_op)
-                if self.compare_agent(self.pop[i], [C_op, fit_op]):
-                    self.pop[i] = [C_op, fit_op, 0.0]
+        ## Apply force of others solution on each individual solution, amend solution and update fitness value
+        pop_new = self._create_pulled_population(epoch)
+        list_idx = self._replace_population(np.arange(self.pop_size), pop_new)
+
+        ## Opposition-based here, for the teams that were not improved
+        pop_op = self._create_opposition_population(list_idx)
+        self._replace_population(list_idx, pop_op)
+        self.nfe_per_epoch = self.pop_size + len(list_idx)
         self.pop = self._update_weight(self.pop)
 
 
@@ -186,46 +209,14 @@ class LevyTWO(BaseTWO):
         Args:
             epoch (int): The current iteration
         """
-        pop_new = deepcopy(self.pop)
-        for i in range(self.pop_size):
-            for k in range(self.pop_size):
-                if self.pop[i][self.ID_WEIGHT] < self.pop[k][self.ID_WEIGHT]:
-                    force = max(self.pop[i][self.ID_WEIGHT] * self.muy_s, self.pop[k][self.ID_WEIGHT] * self.muy_s)
-                    resultant_force = force - self.pop[i][self.ID_WEIGHT] * self.muy_k
-                    g = self.pop[k][self.ID_POS] - self.pop[i][self.ID_POS]
-                    acceleration = resultant_force * g / (self.pop[i][self.ID_WEIGHT] * self.muy_k)
-                    delta_x = 1 / 2 * acceleration + np.power(self.alpha, epoch + 1) * self.beta * \
-                              (self.problem.ub - self.problem.lb) * np.random.randn(self.problem.n_dims)
-                    pop_new[i][self.ID_POS] += delta_x
-        for i in range(self.pop_size):
-            for j in range(self.problem.n_dims):
-                if pop_new[i][self.ID_POS][j] < self.problem.lb[j] or pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                    if np.random.random() <= 0.5:
-                        pop_new[i][self.ID_POS][j] = self.g_best[self.ID_POS][j] + np.random.randn() / (epoch + 1) * \
-                                                     (self.g_best[self.ID_POS][j] - pop_new[i][self.ID_POS][j])
-                        if pop_new[i][self.ID_POS][j] < self.problem.lb[j] or pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                            pop_new[i][self.ID_POS][j] = self.pop[i][self.ID_POS][j]
-                    else:
-                        if pop_new[i][self.ID_POS][j] < self.problem.lb[j]:
-                            pop_new[i][self.ID_POS][j] = self.problem.lb[j]
-                        if pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                            pop_new[i][self.ID_POS][j] = self.problem.ub[j]
-
-        pop_new = self.update_fitness_population(pop_new)
-        self.pop = self.greedy_selection_population(self.pop, pop_new)
-        self.pop = self._update_weight(pop_new)
+        pop_new = self._create_pulled_population(epoch)
+        list_idx = self._replace_population(np.arange(self.pop_size), pop_new)
 
-        ### Apply levy-flight here
-        for i in range(self.pop_size):
-            if self.compare_agent(self.pop[i], pop_new[i]):
-                self.pop[i] = deepcopy(pop_new[i])
-            else:
-                levy_step = self.get_levy_flight_step(beta=1.0, multiplier=0.001, case=-1)
-                pos_new = pop_new[i][self.ID_POS] + 1.0 / np.sqrt(epoch + 1) * np.sign(np.random.random() - 0.5) * levy_step
-                pos_new = self.amend_position_faster(pos_new)
-                fit_new = self.get_fitness_position(pos_new)
-                self.pop[i] = [pos_new, fit_new, 0.0]
-        self.pop = self._update_weight(pop_new)
+        ### Apply levy-flight here, for the teams that were not improved
+        pop_levy = self._create_levy_population(list_idx, epoch)
+        self._replace_population(list_idx, pop_levy)
+        self.nfe_per_epoch = self.pop_size + len(list_idx)
+        self.pop = self._update_weight(self.pop)
 
 
 class ImprovedTWO(OppoTWO, LevyTWO):
@@ -251,53 +242,20 @@ class ImprovedTWO(OppoTWO, LevyTWO):
         pop_oppo = self.update_fitness_population(pop_oppo)
         self.pop = self.get_sorted_strim_population(pop_temp + pop_oppo, self.pop_size)
         self.pop = self._update_weight(self.pop)
-        self.g_best = deepcopy(self.pop[0])
+        _, self.g_best = self.get_global_best_solution(self.pop)
 
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        pop_new = deepcopy(self.pop)
-        for i in range(self.pop_size):
-            for k in range(self.pop_size):
-                if self.pop[i][self.ID_WEIGHT] < self.pop[k][self.ID_WEIGHT]:
-                    force = max(self.pop[i][self.ID_WEIGHT] * self.muy_s, self.pop[k][self.ID_WEIGHT] * self.muy_s)
-                    resultant_force = force - self.pop[i][self.ID_WEIGHT] * self.muy_k
-                    g = self.pop[k][self.ID_POS] - self.pop[i][self.ID_POS]
-                    acceleration = resultant_force * g / (self.pop[i][self.ID_WEIGHT] * self.muy_k)
-                    delta_x = 1 / 2 * acceleration + np.power(self.alpha, epoch + 1) * self.beta * \
-                              (self.problem.ub - self.problem.lb) * np.random.randn(self.problem.n_dims)
-                    pop_new[i][self.ID_POS] += delta_x
-        for i in range(self.pop_size):
-            for j in range(self.problem.n_dims):
-                if pop_new[i][self.ID_POS][j] < self.problem.lb[j] or pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                    if np.random.random() <= 0.5:
-                        pop_new[i][self.ID_POS][j] = self.g_best[self.ID_POS][j] + np.random.randn() / (epoch + 1) * \
-                                                     (self.g_best[self.ID_POS][j] - pop_new[i][self.ID_POS][j])
-                        if pop_new[i][self.ID_POS][j] < self.problem.lb[j] or pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                            pop_new[i][self.ID_POS][j] = self.pop[i][self.ID_POS][j]
-                    else:
-                        if pop_new[i][self.ID_POS][j] < self.problem.lb[j]:
-                            pop_new[i][self.ID_POS][j] = self.problem.lb[j]
-                        if pop_new[i][self.ID_POS][j] > self.problem.ub[j]:
-                            pop_new[i][self.ID_POS][j] = self.problem.ub[j]
-        pop_new = self.update_fitness_population(pop_new)
-        self.pop = self.greedy_selection_population(self.pop, pop_new)
-        self.pop = self._update_weight(pop_new)
+        pop_new = self._create_pulled_population(epoch)
+        list_idx = self._replace_population(np.arange(self.pop_size), pop_new)
 
-        for i in range(self.pop_size):
-            if self.compare_agent(self.pop[i], pop_new[i]):
-                self.pop[i] = deepcopy(pop_new[i])
-            else:
-                C_op = self.create_opposition_position(self.pop[i][self.ID_POS], self.g_best[self.ID_POS])
-                fit_op = self.get_fitness_position(C_op)
-                if self.compare_agent([C_op, fit_op], self.pop[i]):
-                    self.pop[i] = [C_op, fit_op, 0.0]
-                else:
-                    levy_step = self.get_levy_flight_step(beta=1.0, multiplier=0.001, case=-1)
-                    pos_new = pop_new[i][self.ID_POS] + 1.0 / np.sqrt(epoch + 1) * np.sign(np.random.random() - 0.5) * levy_step
-                    pos_new = self.amend_position_faster(pos_new)
-                    fit_new = self.get_fitness_position(pos_new)
-                    self.pop[i] = [pos_new, fit_new, 0.0]
-        self.pop = self._update_weight(pop_new)
+        ## Opposition-based learning, then levy-flight for the teams that are still not improved
+        pop_op = self._create_opposition_population(list_idx)
+        list_levy = self._replace_population(list_idx, pop_op)
+        pop_levy = self._create_levy_population(list_levy, epoch)
+        self._replace_population(list_levy, pop_levy)
+        self.nfe_per_epoch = self.pop_size + len(list_idx) + len(list_levy)
+        self.pop = self._update_weight(self.pop)
@@ -58,6 +58,6 @@ class BaseCEM(Optimizer):
         for idx in range(0, self.pop_size):
             pos_new = np.random.normal(self.means, self.stdevs)
             pop_new.append([self.amend_position_faster(pos_new), None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
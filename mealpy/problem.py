@@ -8,6 +8,21 @@
 # ------------------------------------------------------------------------------------------------------%
 
 import numpy as np
+import time
+
+
+class RejectedResult:
+    """
+    Returned by obj_bound_func when the evaluation is stopped because the candidate can't beat its bound.
+    The candidate gets the worst possible fitness, so it is never selected.
+    """
+
+    def __init__(self, objs=None):
+        """
+        Args:
+            objs (float, list): the partial objective value(s) when the evaluation was stopped (Optional)
+        """
+        self.objs = objs
 
 
 class Problem:
@@ -35,7 +50,49 @@ class Problem:
                 "batch_idea": True or False (Optional)
                 "batch_size": int (Optional, smaller than population size)
                 "obj_weight": list weights for all your objectives (Optional, default = [1, 1, ...1])
+                "obj_state_func": full evaluation that also returns its state: f(position) -> (objs, state) (Optional)
+                "obj_delta_func": incremental evaluation from the state of a parent position (Optional):
+                    f(position, list_changed, parent_position, parent_state) -> (objs, state)
+                "delta_cache_size": number of states kept for the incremental evaluation (Optional)
+                "obj_bound_func": evaluation that can stop early (Optional): f(position, bound) -> objs or RejectedResult
+                "noisy": True if obj_func is stochastic (Optional, default = False)
+                "noise_max_samples": maximum number of evaluations of a candidate (Optional, default = 10)
+                "noise_z": z-score of a clear comparison (Optional, default = 2.0)
+                "surrogate_ratio": fraction of each batch of candidates evaluated by obj_func (Optional, default = None: all)
+                "surrogate_explore": extra fraction of the batch picked at random for obj_func (Optional, default = 0.1)
+                "surrogate_k": number of neighbours of the surrogate (Optional, default = 5)
+                "surrogate_archive_size": number of evaluated samples kept by the surrogate (Optional, default = 5000)
+                "obj_fidelity_func": evaluation at a fidelity (Optional): f(position, fidelity) -> objs
+                "fidelity_levels": increasing list of fidelities, e.g. training epochs [1, 3, 9] (Optional)
+                "fidelity_eta": only the best 1/eta part of a level is promoted to the next one (Optional, default = 3)
+                "obj_batch_func": vectorized obj_func (Optional): f(pos_matrix) -> (n,) or (n x n_objs) values
              }
+
+        The incremental evaluation is used when both obj_state_func and obj_delta_func are given, e.g. for an objective
+        that is a sum of per-variable terms the state can be the vector of terms, and obj_delta_func only recomputes
+        the terms of list_changed (indices of the variables that differ from the parent). They must return the same
+        objs as obj_func.
+
+        The obj_bound_func is used when a candidate only matters if it beats a known fitness (greedy selection against
+        its parent). bound is that fitness, the function can return RejectedResult(partial_objs) as soon as its fitness
+        can't be strictly better than bound any more (e.g. an accumulated cost already >= bound for a min problem),
+        or the same objs as obj_func otherwise.
+
+        With noisy=True the fitness of a candidate is the running mean of its evaluations. Before the comparisons of
+        the selection, the pairs whose difference is not significant (|mean_a - mean_b| <= noise_z * standard error)
+        are evaluated again, racing-style, until the comparison is clear or noise_max_samples is reached.
+
+        With surrogate_ratio, a k-NN surrogate trained on the evaluated candidates pre-screens every batch: only the
+        predicted best surrogate_ratio part (plus the surrogate_explore quota) goes to obj_func, the others keep
+        their predicted fitness (see Optimizer.is_predicted_solution()).
+
+        With obj_fidelity_func and fidelity_levels, every batch of candidates is evaluated at the lowest fidelity and
+        the best 1/fidelity_eta part is promoted to the next one (successive halving). obj_fidelity_func(position,
+        fidelity_levels[-1]) must be the same as obj_func. The fitness of the candidates stopped at a lower level is
+        mapped to the scale of the highest one (linear fit on the candidates evaluated at both levels).
+
+        The obj_batch_func evaluates a whole batch of candidates in one call (solve(mode="vectorized"), or picked by
+        solve(mode="auto") when it is faster). It must return the same objs as obj_func for each row.
         """
         self.minmax = "min"
         self.batch_size = 10
@@ -45,11 +102,26 @@ class Problem:
         self.obj_weight = None
         self.multi_objs = False
         self.obj_is_list = False
+        self.obj_state_func, self.obj_delta_func = None, None
+        self.delta_eval = False
+        self.delta_cache_size = None
+        self.obj_bound_func = None
+        self.noisy, self.noise_max_samples, self.noise_z = False, 10, 2.0
+        self.surrogate_ratio, self.surrogate_explore, self.surrogate_k, self.surrogate_archive_size = None, 0.1, 5, 5000
+        self.obj_fidelity_func, self.fidelity_levels, self.fidelity_eta = None, None, 3
+        self.obj_batch_func = None
+        self.obj_probe_time, self.obj_probe_cpu_time = None, None     # Wall and CPU time of the probe evaluation
         self.n_dims, self.lb, self.ub = None, None, None
         self.__set_parameters__(problem)
         self.__check_parameters__(problem)
         self.__check_optional_parameters__(problem)
         self.__check_objective_function__(problem)
+        self.__check_delta_function__(problem)
+        self.__check_bound_function__(problem)
+        self.__check_noise_parameters__(problem)
+        self.__check_surrogate_parameters__(problem)
+        self.__check_fidelity_parameters__(problem)
+        self.__check_batch_function__(problem)
 
     def __set_parameters__(self, kwargs):
         for key, value in kwargs.items():
@@ -139,7 +211,10 @@ class Problem:
                 exit(0)
         tested_solution = np.random.uniform(self.lb, self.ub)
         try:
+            time_probe, cpu_probe = time.perf_counter(), time.process_time()
             result = self.obj_func(tested_solution)
+            self.obj_probe_time = time.perf_counter() - time_probe
+            self.obj_probe_cpu_time = time.process_time() - cpu_probe
         except Exception as err:
             print(f"Error: {err}\n")
             print("Please check your defined objective function!")
@@ -178,3 +253,68 @@ class Problem:
             else:
                 print("Please check your objective function. It needs to return value!")
                 exit(0)
+
+    def __check_delta_function__(self, kwargs):
+        if "obj_state_func" in kwargs or "obj_delta_func" in kwargs:
+            if callable(kwargs.get("obj_state_func")) and callable(kwargs.get("obj_delta_func")):
+                self.delta_eval = True
+            else:
+                print("Please define both obj_state_func and obj_delta_func as functions for the incremental evaluation!")
+                exit(0)
+
+    def __check_bound_function__(self, kwargs):
+        if "obj_bound_func" in kwargs and not callable(kwargs["obj_bound_func"]):
+            print("Please check your obj_bound_func. It needs to be a function!")
+            exit(0)
+
+    def __check_noise_parameters__(self, kwargs):
+        if type(self.noisy) != bool:
+            print("noisy needs to be True or False!")
+            exit(0)
+        if type(self.noise_max_samples) != int or self.noise_max_samples < 1:
+            print("noise_max_samples needs to be an integer >= 1!")
+            exit(0)
+        if not self.noise_z > 0:
+            print("noise_z needs to be a positive number!")
+            exit(0)
+
+    def __check_surrogate_parameters__(self, kwargs):
+        if self.surrogate_ratio is not None:
+            if not 0 < self.surrogate_ratio <= 1:
+                print("surrogate_ratio needs to be in (0, 1]!")
+                exit(0)
+            if not 0 <= self.surrogate_explore <= 1:
+                print("surrogate_explore needs to be in [0, 1]!")
+                exit(0)
+            if type(self.surrogate_k) != int or self.surrogate_k < 1 or type(self.surrogate_archive_size) != int \
+                    or self.surrogate_archive_size < self.surrogate_k:
+                print("surrogate_k needs to be an integer >= 1 and surrogate_archive_size an integer >= surrogate_k!")
+                exit(0)
+
+    def __check_fidelity_parameters__(self, kwargs):
+        if self.obj_fidelity_func is not None or self.fidelity_levels is not None:
+            if not callable(self.obj_fidelity_func) or self.fidelity_levels is None:
+                print("Please define both obj_fidelity_func as a function and fidelity_levels for the multi-fidelity evaluation!")
+                exit(0)
+            if len(self.fidelity_levels) < 1 or np.any(np.diff(self.fidelity_levels) <= 0) or self.fidelity_levels[0] <= 0:
+                print("fidelity_levels needs to be an increasing list of positive values!")
+                exit(0)
+            if not self.fidelity_eta > 1:
+                print("fidelity_eta needs to be > 1!")
+                exit(0)
+
+    def __check_batch_function__(self, kwargs):
+        if self.obj_batch_func is not None:
+            if not callable(self.obj_batch_func):
+                print("Please check your obj_batch_func. It needs to be a function!")
+                exit(0)
+            tested_matrix = np.random.RandomState().uniform(self.lb, self.ub, (2, len(self.lb)))
+            try:
+                result = np.asarray(self.obj_batch_func(tested_matrix))
+            except Exception as err:
+                print(f"Error: {err}\n")
+                print("Please check your defined obj_batch_func!")
+                exit(0)
+            if len(result) != 2 or (result.ndim > 1 and result.shape[1] != self.n_objs):
+                print(f"obj_batch_func() should return one value (or {self.n_objs} objs) for each row of the matrix!")
+                exit(0)
@@ -9,6 +9,7 @@
 
 import numpy as np
 from mealpy.optimizer import Optimizer
+from mealpy.utils import pairwise
 
 
 class BaseACOR(Optimizer):
@@ -56,24 +57,14 @@ class BaseACOR(Optimizer):
         matrix_p = matrix_w / np.sum(matrix_w)  # Normalize to find the probability.
 
         # Means and Standard Deviations
-        matrix_pos = np.array([solution[self.ID_POS] for solution in pop])
-        matrix_sigma = []
-        for i in range(0, self.pop_size):
-            matrix_i = np.repeat(pop[i][self.ID_POS].reshape((1, -1)), self.pop_size, axis=0)
-            D = np.sum(np.abs(matrix_pos - matrix_i), axis=0)
-            temp = self.zeta * D / (self.pop_size - 1)
-            matrix_sigma.append(temp)
-        matrix_sigma = np.array(matrix_sigma)
+        matrix_pos = self.get_position_matrix(pop)
+        matrix_sigma = self.zeta * pairwise.get_sum_abs_deviation(matrix_pos) / (self.pop_size - 1)
 
-        # Generate Samples
-        pop_new = []
-        for idx in range(0, self.sample_count):
-            # Generate Samples
-            child = np.zeros(self.problem.n_dims)
-            for j in range(0, self.problem.n_dims):
-                idx = self.get_index_roulette_wheel_selection(matrix_p)
-                child[j] = pop[idx][self.ID_POS][j] + np.random.normal() * matrix_sigma[idx, j]  # (1)
-            pos_new = self.amend_position_faster(child)  # (2)
-            pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        # Generate Samples: the Gaussian kernel of each (sample, dimension) is chosen with probability matrix_p
+        list_kernel = np.random.choice(self.pop_size, (self.sample_count, self.problem.n_dims), p=matrix_p)
+        list_dims = np.arange(0, self.problem.n_dims)
+        child = matrix_pos[list_kernel, list_dims] + \
+                np.random.normal(0, 1, (self.sample_count, self.problem.n_dims)) * matrix_sigma[list_kernel, list_dims]  # (1)
+        pos_new = self.amend_position_faster(child)  # (2)
+        pop_new = self.update_fitness_population([[pos, None] for pos in pos_new])
         self.pop = pop + pop_new
@@ -10,6 +10,7 @@
 import numpy as np
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils import pairwise
 
 
 class OriginalBFO(Optimizer):
@@ -68,28 +69,30 @@ class OriginalBFO(Optimizer):
         sum_nutrients = 0.0
         return [position, fitness, cost, interaction, sum_nutrients]
 
-    def _compute_cell_interaction(self, cell, cells, d, w):
-        sum_inter = 0.0
-        for other in cells:
-            diff = self.problem.n_dims * ((cell[self.ID_POS] - other[self.ID_POS]) ** 2).mean(axis=None)
-            sum_inter += d * np.exp(w * diff)
-        return sum_inter
-
-    def _attract_repel(self, idx, cells):
-        attract = self._compute_cell_interaction(cells[idx], cells, -self.d_attr, -self.w_attr)
-        repel = self._compute_cell_interaction(cells[idx], cells, self.h_rep, -self.w_rep)
-        return attract + repel
-
-    def _evaluate(self, idx, cells):
-        cells[idx][self.ID_INTER] = self._attract_repel(idx, cells)
-        cells[idx][self.ID_COST] = cells[idx][self.ID_FIT][self.ID_TAR] + cells[idx][self.ID_INTER]
-        return cells
-
-    def _tumble_cell(self, cell, step_size):
-        delta_i = np.random.uniform(self.problem.lb, self.problem.ub)
-        unit_vector = delta_i / np.sqrt(np.abs(np.dot(delta_i, delta_i.T)))
-        vector = cell[self.ID_POS] + step_size * unit_vector
-        return [vector, 0.0, 0.0, 0.0, 0.0]
+    def _compute_cell_interaction(self, pos_matrix):
+        """
+        Attract and repel interaction of every cell with the whole swarm, computed from blocks of the pairwise
+        squared-distance matrix instead of a double loop over cells.
+
+        Args:
+            pos_matrix (nd.array): 2-D matrix (pop_size x n_dims) of cell positions
+
+        Returns:
+            1-D numpy array (pop_size,) of interaction values
+        """
+        list_inter = np.zeros(len(pos_matrix))
+        block_size = pairwise.get_block_size(len(pos_matrix))
+        for list_rows in pairwise.generate_row_blocks(len(pos_matrix), block_size):
+            diff = pairwise.get_squared_distance_matrix(pos_matrix[list_rows], pos_matrix)
+            attract = -self.d_attr * np.exp(-self.w_attr * diff)
+            repel = self.h_rep * np.exp(-self.w_rep * diff)
+            list_inter[list_rows] = np.sum(attract + repel, axis=1)
+        return list_inter
+
+    def _tumble_cell(self, pos_matrix, step_size):
+        delta_i = np.random.uniform(self.problem.lb, self.problem.ub, pos_matrix.shape)
+        unit_vector = delta_i / np.sqrt(np.abs(np.sum(delta_i * delta_i, axis=1)))[:, None]
+        return pos_matrix + step_size * unit_vector
 
     def evolve(self, epoch):
         """
@@ -98,32 +101,43 @@ class OriginalBFO(Optimizer):
         """
         nfe_epoch = 0
         for j in range(0, self.chem_steps):
+            pos_matrix = self.get_position_matrix(self.pop)
+            list_inter = self._compute_cell_interaction(pos_matrix)
+            list_cost = self.get_fitness_vector(self.pop) + list_inter
+            list_nutrients = deepcopy(list_cost)
+            for idx in range(0, self.pop_size):
+                self.pop[idx][self.ID_INTER] = list_inter[idx]
+                self.pop[idx][self.ID_COST] = list_cost[idx]
+
+            ## All cells swim together, a cell stops swimming as soon as it found a better position
+            list_active = np.arange(0, self.pop_size)
+            for m in range(0, self.swim_length):
+                pos_new = self._tumble_cell(pos_matrix[list_active], self.step_size)
+                pos_new = self.amend_position_faster(pos_new)
+                pop_new = self.update_fitness_population([[pos, None] for pos in pos_new])
+                nfe_epoch += len(pop_new)
+                list_better = self.compare_population(pop_new, [self.pop[idx] for idx in list_active])
+                for k in np.flatnonzero(list_better):
+                    idx = list_active[k]
+                    self.pop[idx][self.ID_POS] = pop_new[k][self.ID_POS]
+                    self.pop[idx][self.ID_FIT] = pop_new[k][self.ID_FIT]
+                list_active = list_active[~list_better]
+                list_nutrients[list_active] += list_cost[list_active]
+                if len(list_active) == 0:
+                    break
             for idx in range(0, self.pop_size):
-                sum_nutrients = 0.0
-                self.pop = self._evaluate(idx, self.pop)
-                sum_nutrients += self.pop[idx][self.ID_COST]
-
-                for m in range(0, self.swim_length):
-                    delta_i = np.random.uniform(self.problem.lb, self.problem.ub)
-                    unit_vector = delta_i / np.sqrt(np.abs(np.dot(delta_i, delta_i.T)))
-                    pos_new = self.pop[idx][self.ID_POS] + self.step_size * unit_vector
-                    pos_new = self.amend_position_faster(pos_new)
-                    fit_new = self.get_fitness_position(pos_new)
-                    nfe_epoch += 1
-                    if self.compare_agent([pos_new, fit_new], self.pop[idx]):
-                        self.pop[idx][self.ID_POS] = pos_new
-                        self.pop[idx][self.ID_FIT] = fit_new
-                        break
-                    sum_nutrients += self.pop[idx][self.ID_COST]
-                self.pop[idx][self.ID_SUM_NUTRIENTS] = sum_nutrients
-
-            cells = sorted(self.pop, key=lambda cell: cell[self.ID_SUM_NUTRIENTS])
-            self.pop = deepcopy(cells[0:self.half_pop_size]) + deepcopy(cells[0:self.half_pop_size])
-
-            for idc in range(self.pop_size):
-                if np.random.rand() < self.p_eliminate:
-                    self.pop[idc] = self.create_solution()
-                    nfe_epoch += 1
+                self.pop[idx][self.ID_SUM_NUTRIENTS] = list_nutrients[idx]
+
+            list_idx = np.argsort(list_nutrients, kind="stable")
+            self.pop = [deepcopy(self.pop[idx]) for idx in list_idx[:self.half_pop_size]] + \
+                       [deepcopy(self.pop[idx]) for idx in list_idx[:self.pop_size - self.half_pop_size]]
+
+            list_eliminate = np.flatnonzero(np.random.rand(self.pop_size) < self.p_eliminate)
+            if len(list_eliminate) > 0:
+                pop_new = self.create_population(len(list_eliminate))
+                for idx, agent in zip(list_eliminate, pop_new):
+                    self.pop[idx] = agent
+                nfe_epoch += len(list_eliminate)
         self.nfe_per_epoch = nfe_epoch
 
 
@@ -177,11 +191,11 @@ class ABFO(Optimizer):
         local_fit_best = deepcopy(fitness)
         return [vector, fitness, nutrient, local_pos_best, local_fit_best]
 
-    def _update_step_size(self, pop=None, idx=None):
-        total_fitness = np.sum(temp[self.ID_FIT][self.ID_TAR] for temp in pop)
-        step_size = self.C_s - (self.C_s - self.C_e) * pop[idx][self.ID_FIT][self.ID_TAR] / total_fitness
-        step_size = step_size / self.pop[idx][self.ID_NUT] if self.pop[idx][self.ID_NUT] > 0 else step_size
-        return step_size
+    def _update_step_size(self, pop=None):
+        list_fitness = self.get_fitness_vector(pop)
+        list_nutrient = np.array([agent[self.ID_NUT] for agent in pop])
+        step_size = self.C_s - (self.C_s - self.C_e) * list_fitness[:, None] / np.sum(list_fitness)
+        return np.where(list_nutrient[:, None] > 0, step_size / np.maximum(list_nutrient, 1)[:, None], step_size)
 
     def evolve(self, epoch):
         """
@@ -189,60 +203,65 @@ class ABFO(Optimizer):
             epoch (int): The current iteration
         """
         nfe_epoch = 0
-        for i in range(0, self.pop_size):
-            step_size = self._update_step_size(self.pop, i)
-            for m in range(0, self.swim_length):        # Ns
-                delta_i = (self.g_best[self.ID_POS] - self.pop[i][self.ID_POS]) + \
-                          (self.pop[i][self.ID_LOC_POS] - self.pop[i][self.ID_POS])
-                delta = np.sqrt(np.abs(np.dot(delta_i, delta_i.T)))
-                unit_vector = np.random.uniform(self.problem.lb, self.problem.ub) if delta == 0 else (delta_i / delta)
-                pos_new = self.pop[i][self.ID_POS] + step_size * unit_vector
-                pos_new = self.amend_position_faster(pos_new)
-                fit_new = self.get_fitness_position(pos_new)
-                nfe_epoch += 1
-                if self.compare_agent([pos_new, fit_new], self.pop[i]):
-                    self.pop[i][self.ID_POS] = pos_new
-                    self.pop[i][self.ID_FIT] = fit_new
+        step_size = self._update_step_size(self.pop[:self.pop_size])
+
+        ## All bacteria swim at the same time, each swim step is evaluated as one batch
+        for m in range(0, self.swim_length):        # Ns
+            pos_matrix = self.get_position_matrix(self.pop[:self.pop_size])
+            pos_local = np.array([agent[self.ID_LOC_POS] for agent in self.pop[:self.pop_size]])
+            delta_i = (self.g_best[self.ID_POS] - pos_matrix) + (pos_local - pos_matrix)
+            delta = np.sqrt(np.abs(np.sum(delta_i * delta_i, axis=1)))[:, None]
+            unit_vector = np.where(delta == 0, np.random.uniform(self.problem.lb, self.problem.ub, pos_matrix.shape),
+                                   delta_i / np.where(delta == 0, 1, delta))
+            pos_new = self.amend_position_faster(pos_matrix + step_size * unit_vector)
+            pop_new = self.update_fitness_population([[pos, None] for pos in pos_new])
+            nfe_epoch += len(pop_new)
+            list_better = self.compare_population(pop_new, self.pop[:self.pop_size])
+            fit_new = self.get_fitness_vector(pop_new)
+            list_local_better = self.compare_fitness_vector(fit_new, [agent[self.ID_LOC_FIT][self.ID_TAR] for agent in self.pop[:self.pop_size]])
+            for i in range(0, self.pop_size):
+                if list_better[i]:
+                    self.pop[i][self.ID_POS] = pop_new[i][self.ID_POS]
+                    self.pop[i][self.ID_FIT] = pop_new[i][self.ID_FIT]
                     self.pop[i][self.ID_NUT] += 1
                     # Update personal best
-                    if self.compare_agent([pos_new, fit_new], [None, self.pop[i][self.ID_LOC_FIT]]):
-                        self.pop[i][self.ID_LOC_POS] = deepcopy(pos_new)
-                        self.pop[i][self.ID_LOC_FIT] =  deepcopy(fit_new)
+                    if list_local_better[i]:
+                        self.pop[i][self.ID_LOC_POS] = deepcopy(pop_new[i][self.ID_POS])
+                        self.pop[i][self.ID_LOC_FIT] = deepcopy(pop_new[i][self.ID_FIT])
                 else:
                     self.pop[i][self.ID_NUT] -= 1
 
-            if self.pop[i][self.ID_NUT] > max(self.N_split, self.N_split + (len(self.pop) - self.pop_size) / self.N_adapt):
-                pos_new = self.pop[i][self.ID_POS] + np.random.normal(self.problem.lb, self.problem.ub) * \
-                                        (self.g_best[self.ID_POS] - self.pop[i][self.ID_POS])
-                pos_new = self.amend_position_faster(pos_new)
-                fit_new = self.get_fitness_position(pos_new)
-                self.pop.append([pos_new, fit_new, 0, deepcopy(pos_new), deepcopy(fit_new)])
-                nfe_epoch += 1
+        list_nutrient = np.array([agent[self.ID_NUT] for agent in self.pop[:self.pop_size]])
+        list_split = np.flatnonzero(list_nutrient > max(self.N_split, self.N_split + (len(self.pop) - self.pop_size) / self.N_adapt))
+        if len(list_split) > 0:
+            pos_matrix = self.get_position_matrix([self.pop[i] for i in list_split])
+            pos_new = pos_matrix + np.random.normal(self.problem.lb, self.problem.ub, pos_matrix.shape) * \
+                      (self.g_best[self.ID_POS] - pos_matrix)
+            pos_new = self.amend_position_faster(pos_new)
+            pop_new = self.update_fitness_population([[pos, None] for pos in pos_new])
+            self.pop += [[agent[self.ID_POS], agent[self.ID_FIT], 0, deepcopy(agent[self.ID_POS]), deepcopy(agent[self.ID_FIT])]
+                         for agent in pop_new]
+            nfe_epoch += len(pop_new)
 
-            nut_min = min(self.N_adapt, self.N_adapt + (len(self.pop) - self.pop_size) / self.N_adapt)
-            if self.pop[i][self.ID_NUT] < nut_min or np.random.rand() < self.p_eliminate:
-                self.pop[i] = self.create_solution()
-                nfe_epoch += 1
+        nut_min = min(self.N_adapt, self.N_adapt + (len(self.pop) - self.pop_size) / self.N_adapt)
+        list_dead = np.flatnonzero((list_nutrient < nut_min) | (np.random.rand(self.pop_size) < self.p_eliminate))
+        if len(list_dead) > 0:
+            pop_new = self.create_population(len(list_dead))
+            for i, agent in zip(list_dead, pop_new):
+                self.pop[i] = agent
+            nfe_epoch += len(list_dead)
 
         ## Make sure the population does not have duplicates.
-        new_set = set()
-        for idx, obj in enumerate(self.pop):
-            if tuple(obj[self.ID_POS].tolist()) in new_set:
-                self.pop.pop(idx)
-            else:
-                new_set.add(tuple(obj[self.ID_POS].tolist()))
+        _, list_idx = np.unique(self.get_position_matrix(self.pop), axis=0, return_index=True)
+        self.pop = [self.pop[idx] for idx in np.sort(list_idx)]
 
         ## Balance the population by adding more agents or remove some agents
         n_agents = len(self.pop) - self.pop_size
         if n_agents < 0:
-            for idx in range(0, n_agents):
-                self.pop.append(self.create_solution())
-                nfe_epoch += 1
+            self.pop += self.create_population(-n_agents)
+            nfe_epoch += -n_agents
         elif n_agents > 0:
             list_idx_removed = np.random.choice(range(0, len(self.pop)), n_agents, replace=False)
-            pop_new = []
-            for idx in range(0, len(self.pop)):
-                if idx not in list_idx_removed:
-                    pop_new.append(self.pop[idx])
-            self.pop = pop_new
+            list_keep = np.setdiff1d(np.arange(0, len(self.pop)), list_idx_removed)
+            self.pop = [self.pop[idx] for idx in list_keep]
         self.nfe_per_epoch = nfe_epoch
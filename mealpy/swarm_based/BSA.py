@@ -40,6 +40,9 @@ class BaseBSA(Optimizer):
             **kwargs ():
         """
         super().__init__(problem, kwargs)
+        self.nfe_per_epoch = pop_size
+        self.sort_flag = False
+
         self.epoch = epoch
         self.pop_size = pop_size
         self.ff = ff
@@ -94,7 +97,7 @@ class BaseBSA(Optimizer):
                             A2 * np.random.uniform(-1, 1) * (self.g_best[self.ID_POS] - self.pop[i][self.ID_POS])
                 agent[self.ID_POS] = self.amend_position_faster(x_new)
                 pop_new.append(agent)
-            pop_new = self.update_fitness_population(pop_new)
+            pop_new = self.update_fitness_population_bound(pop_new, self.pop)
             self.pop = self.greedy_selection_population(self.pop, pop_new)
         else:
             pop_new = deepcopy(self.pop)
@@ -148,5 +151,5 @@ class BaseBSA(Optimizer):
                         x_new = self.pop[i][self.ID_POS] + (self.pop[idx][self.ID_POS] - self.pop[i][self.ID_POS]) * FL
                         agent[self.ID_POS] = self.amend_position_faster(x_new)
                         pop_new[i] = agent
-            pop_new = self.update_fitness_population(pop_new)
+            pop_new = self.update_fitness_population_bound(pop_new, self.pop)
             self.pop = self.greedy_selection_population(self.pop, pop_new)
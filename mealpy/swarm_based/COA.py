@@ -88,7 +88,7 @@ class BaseCOA(Optimizer):
                 pos_new = self.amend_position_faster(pos_new)
                 pop_new.append([pos_new, None, self.pop_group[p][i][self.ID_AGE]])
             # Evaluate the new social condition (Eq. 13)
-            pop_new = self.update_fitness_population(pop_new)
+            pop_new = self.update_fitness_population_bound(pop_new, self.pop_group[p])
             # Adaptation (Eq. 14)
             self.pop_group[p] = self.greedy_selection_population(self.pop_group[p], pop_new)
 
@@ -43,6 +43,9 @@ class BaseCSO(Optimizer):
         """
 
         super().__init__(problem, kwargs)
+        self.nfe_per_epoch = pop_size
+        self.sort_flag = False
+
         self.epoch = epoch
         self.pop_size = pop_size
         self.mixture_ratio = mixture_ratio
@@ -97,7 +97,7 @@ class BaseFOA(OriginalFOA):
             pos_new = self.norm_consecutive_adjacent(pos_new)
             pos_new = self.amend_position_faster(pos_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
 
@@ -8,8 +8,8 @@
 # ------------------------------------------------------------------------------------------------------%
 
 import numpy as np
-from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils import pairwise
 
 
 class BaseFireflyA(Optimizer):
@@ -59,29 +59,40 @@ class BaseFireflyA(Optimizer):
         """
         # Maximum Distance
         dmax = np.sqrt(self.problem.n_dims)
+        pos_matrix = self.get_position_matrix(self.pop[:self.pop_size])
+        list_fitness = self.get_fitness_vector(self.pop[:self.pop_size])
+        list_cols = np.arange(0, self.pop_size)
+        block_size = pairwise.get_block_size(self.pop_size, self.problem.n_dims)
 
-        for idx in range(0, self.pop_size):
-            agent = deepcopy(self.pop[idx])
-            pop_child = []
-            for j in range(idx+1, self.pop_size):
-                # Move Towards Better Solutions
-                if self.compare_agent(self.pop[j], agent):
-                    # Calculate Radius and Attraction Level
-                    rij = np.linalg.norm(agent[self.ID_POS] - self.pop[j][self.ID_POS]) / dmax
-                    beta = self.beta_base * np.exp(-self.gamma * rij ** self.exponent)
-                    # Mutation Vector
-                    mutation_vector = self.delta * np.random.uniform(0, 1, self.problem.n_dims)
-                    temp = np.matmul((self.pop[j][self.ID_POS] - agent[self.ID_POS]),
-                                     np.random.uniform(0, 1, (self.problem.n_dims, self.problem.n_dims)))
-                    pos_new = agent[self.ID_POS] + self.dyn_alpha * mutation_vector + beta * temp
-                    pos_new = self.amend_position_faster(pos_new)
-                    pop_child.append([pos_new, None])
-            if len(pop_child) < 2:
+        for list_rows in pairwise.generate_row_blocks(self.pop_size, block_size):
+            # Move Towards Better Solutions: firefly i is attracted by every brighter firefly j > i
+            mask = (list_cols[None, :] > list_rows[:, None]) & \
+                   self.compare_fitness_vector(list_fitness[None, :], list_fitness[list_rows, None])
+            ## Firefly with less than 2 candidates is kept unchanged
+            mask[np.sum(mask, axis=1) < 2] = False
+            id_rows, id_cols = np.nonzero(mask)
+            if len(id_rows) == 0:
                 continue
-            pop_child = self.update_fitness_population(pop_child)
-            _, local_best = self.get_global_best_solution(pop_child)
+            id_rows = list_rows[id_rows]
+            # Calculate Radius and Attraction Level
+            dist = pairwise.get_distance_matrix(pos_matrix[list_rows], pos_matrix)
+            rij = dist[id_rows - list_rows[0], id_cols] / dmax
+            beta = self.beta_base * np.exp(-self.gamma * rij ** self.exponent)
+            # Mutation Vector
+            mutation_vector = self.delta * np.random.uniform(0, 1, (len(id_rows), self.problem.n_dims))
+            temp = np.random.uniform(0, 1, (len(id_rows), self.problem.n_dims)) * \
+                   pairwise.get_pair_displacement(pos_matrix, id_rows, id_cols)
+            pos_new = pos_matrix[id_rows] + self.dyn_alpha * mutation_vector + beta[:, None] * temp
+            pos_new = self.amend_position_faster(pos_new)
+            pop_child = self.update_fitness_population([[pos, None] for pos in pos_new])
+            fit_child = self.get_fitness_vector(pop_child)
+
+            ## Local best child of each firefly (children are grouped by row in id_rows)
+            order = np.lexsort((fit_child if self.problem.minmax == "min" else -fit_child, id_rows))
+            id_first = order[np.r_[True, id_rows[order][1:] != id_rows[order][:-1]]]
             # Compare to Previous Solution
-            if self.compare_agent(local_best, agent):
-                self.pop[idx] = local_best
+            list_better = self.compare_population([pop_child[idx] for idx in id_first], [self.pop[idx] for idx in id_rows[id_first]])
+            for idx in id_first[list_better]:
+                self.pop[id_rows[idx]] = pop_child[idx]
         self.pop.append(self.g_best)
         self.dyn_alpha = self.alpha_damp * self.alpha
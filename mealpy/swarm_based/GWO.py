@@ -43,19 +43,15 @@ class BaseGWO(Optimizer):
         """
         # linearly decreased from 2 to 0
         a = 2 - 2 * epoch / (self.epoch - 1)
-        _, list_best, _ = self.get_special_solutions(self.pop, best=3)
+        list_best = self.get_index_best(self.get_fitness_vector(self.pop), best=3)
+        pos_matrix = self.get_position_matrix(self.pop)
 
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            A1, A2, A3 = a * (2 * np.random.uniform() - 1), a * (2 * np.random.uniform() - 1), a * (2 * np.random.uniform() - 1)
-            C1, C2, C3 = 2 * np.random.uniform(), 2 * np.random.uniform(), 2 * np.random.uniform()
-            X1 = list_best[0][self.ID_POS] - A1 * np.abs(C1 * list_best[0][self.ID_POS] - self.pop[idx][self.ID_POS])
-            X2 = list_best[1][self.ID_POS] - A2 * np.abs(C2 * list_best[1][self.ID_POS] - self.pop[idx][self.ID_POS])
-            X3 = list_best[2][self.ID_POS] - A3 * np.abs(C3 * list_best[2][self.ID_POS] - self.pop[idx][self.ID_POS])
-            pos_new = (X1 + X2 + X3) / 3.0
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        ## One row of (A1, A2, A3) and (C1, C2, C3) per wolf
+        list_a = a * (2 * np.random.uniform(0, 1, (self.pop_size, len(list_best))) - 1)
+        list_c = 2 * np.random.uniform(0, 1, (self.pop_size, len(list_best)))
+        pos_new = self.get_leader_following_position(pos_matrix, pos_matrix[list_best], list_a, list_c)
+        pos_new = self.amend_position_faster(pos_new)
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
 
@@ -93,29 +89,23 @@ class RW_GWO(Optimizer):
         # linearly decreased from 2 to 0
         a = 2 - 2 * epoch / (self.epoch - 1)
 
-        _, leaders, _ = self.get_special_solutions(self.pop, best=3)
+        list_best = self.get_index_best(self.get_fitness_vector(self.pop), best=3)
+        leaders = [self.pop[idx] for idx in list_best]
         ## Random walk here
-        leaders_new = []
-        for i in range(0, len(leaders)):
-            pos_new = leaders[i][self.ID_POS] + a * np.random.standard_cauchy(self.problem.n_dims)
-            pos_new = self.amend_position_faster(pos_new)
-            leaders_new.append([pos_new, None])
-        leaders_new = self.update_fitness_population(leaders_new)
+        pos_leaders = self.get_position_matrix(leaders) + a * np.random.standard_cauchy((len(leaders), self.problem.n_dims))
+        pos_leaders = self.amend_position_faster(pos_leaders)
+        leaders_new = self.update_fitness_population_bound([[pos, None] for pos in pos_leaders], leaders)
         leaders = self.greedy_selection_population(leaders, leaders_new)
 
         ## Update other wolfs
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            # Eq. 3
-            miu1, miu2, miu3 = b * (2 * np.random.uniform() - 1), b * (2 * np.random.uniform() - 1), b * (2 * np.random.uniform() - 1)
-            # Eq. 4
-            c1, c2, c3 = 2 * np.random.uniform(), 2 * np.random.uniform(), 2 * np.random.uniform()
-            X1 = leaders[0][self.ID_POS] - miu1 * np.abs(c1 * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-            X2 = leaders[1][self.ID_POS] - miu2 * np.abs(c2 * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-            X3 = leaders[2][self.ID_POS] - miu3 * np.abs(c3 * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-            pos_new = (X1 + X2 + X3) / 3.0
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
-        pop_new = self.greedy_selection_population(self.pop, pop_new)
-        self.pop = self.get_sorted_strim_population(pop_new + leaders, self.pop_size)
+        # Eq. 3
+        list_miu = b * (2 * np.random.uniform(0, 1, (self.pop_size, len(leaders))) - 1)
+        # Eq. 4
+        list_c = 2 * np.random.uniform(0, 1, (self.pop_size, len(leaders)))
+        pos_new = self.get_leader_following_position(self.get_position_matrix(self.pop), self.get_position_matrix(leaders),
+                                                     list_miu, list_c, pos_target=self.g_best[self.ID_POS][None, :])
+        pos_new = self.amend_position_faster(pos_new)
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], self.pop)
+        pop_new = self.greedy_selection_population(self.pop, pop_new) + leaders
+        list_best = self.get_index_best(self.get_fitness_vector(pop_new), best=self.pop_size)
+        self.pop = [pop_new[idx] for idx in list_best]
@@ -9,7 +9,6 @@
 
 import numpy as np
 from math import gamma
-from copy import deepcopy
 from mealpy.optimizer import Optimizer
 
 
@@ -36,63 +35,59 @@ class BaseHHO(Optimizer):
 
     def evolve(self, epoch):
         """
+        The exploration/exploitation strategies of all hawks are selected by masks, the positions of all hawks (and the
+        levy dives of the rapid-dive hawks) are evaluated in one batch.
+
         Args:
             epoch (int): The current iteration
         """
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            # -1 < E0 < 1
-            E0 = 2 * np.random.uniform() - 1
-            # factor to show the decreasing energy of rabbit
-            E = 2 * E0 * (1 - (epoch + 1) * 1.0 / self.epoch)
-            J = 2 * (1 - np.random.uniform())
+        pos_matrix = self.get_position_matrix(self.pop)
+        g_best = self.g_best[self.ID_POS]
+        lb, ub = self.problem.lb, self.problem.ub
+        shape_row = (self.pop_size, 1)
+        # -1 < E0 < 1
+        E0 = 2 * np.random.uniform(0, 1, shape_row) - 1
+        # factor to show the decreasing energy of rabbit
+        E = 2 * E0 * (1 - (epoch + 1) * 1.0 / self.epoch)
+        J = 2 * (1 - np.random.uniform(0, 1, shape_row))
+        X_m = np.mean(pos_matrix)
+
+        # -------- Exploration phase Eq. (1) in paper -------------------
+        # Harris' hawks perch randomly based on 2 strategy: based on other family members or on a random tall tree
+        X_rand = pos_matrix[np.random.randint(0, self.pop_size, self.pop_size)]
+        pos_family = X_rand - np.random.uniform(0, 1, shape_row) * np.abs(X_rand - 2 * np.random.uniform(0, 1, shape_row) * pos_matrix)
+        pos_tree = (g_best - X_m) - np.random.uniform(0, 1, shape_row) * (lb + np.random.uniform(0, 1, shape_row) * (ub - lb))
+        pos_explore = np.where(np.random.rand(*shape_row) >= 0.5, pos_family, pos_tree)
 
-            # -------- Exploration phase Eq. (1) in paper -------------------
-            if (np.abs(E) >= 1):
-                # Harris' hawks perch randomly based on 2 strategy:
-                if np.random.rand() >= 0.5:  # perch based on other family members
-                    X_rand = deepcopy(self.pop[np.random.randint(0, self.pop_size)][self.ID_POS])
-                    pos_new = X_rand - np.random.uniform() * np.abs(X_rand - 2 * np.random.uniform() * self.pop[idx][self.ID_POS])
+        # -------- Exploitation phase -------------------
+        # phase 1: ----- surprise pounce (seven kills): multiple, short rapid dives by different hawks ----------
+        delta_X = g_best - pos_matrix
+        pos_pounce = np.where(np.abs(E) >= 0.5, delta_X - E * np.abs(J * g_best - pos_matrix),  # Hard besiege Eq. (6)
+                              g_best - E * np.abs(delta_X))  # Soft besiege Eq. (4) in paper
+        # phase 2: ----- progressive rapid dives with levy flight ----------
+        pos_Y = np.where(np.abs(E) >= 0.5, g_best - E * np.abs(J * g_best - pos_matrix),  # Soft besiege Eq. (10)
+                         g_best - E * np.abs(J * g_best - X_m))  # Hard besiege Eq. (11) in paper
+        list_pounce = np.random.rand(self.pop_size) >= 0.5
+        pos_exploit = np.where(list_pounce[:, None], pos_pounce, pos_Y)
 
-                else:  # perch on a random tall tree (random site inside group's home range)
-                    X_m = np.mean([x[self.ID_POS] for x in self.pop])
-                    pos_new = (self.g_best[self.ID_POS] - X_m) - np.random.uniform() * \
-                              (self.problem.lb + np.random.uniform() * (self.problem.ub - self.problem.lb))
-                pos_new = self.amend_position_faster(pos_new)
-                pop_new.append([pos_new, None])
-            # -------- Exploitation phase -------------------
-            else:
-                # Attacking the rabbit using 4 strategies regarding the behavior of the rabbit
-                # phase 1: ----- surprise pounce (seven kills) ----------
-                # surprise pounce (seven kills): multiple, short rapid dives by different hawks
-                if (np.random.rand() >= 0.5):
-                    delta_X = self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS]
-                    if np.abs(E) >= 0.5:  # Hard besiege Eq. (6) in paper
-                        pos_new = delta_X - E * np.abs(J * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-                    else:  # Soft besiege Eq. (4) in paper
-                        pos_new = self.g_best[self.ID_POS] - E * np.abs(delta_X)
-                    pos_new = self.amend_position_faster(pos_new)
-                    pop_new.append([pos_new, None])
-                else:
-                    xichma = np.power((gamma(1 + 1.5) * np.sin(np.pi * 1.5 / 2.0)) /
-                                      (gamma((1 + 1.5) * 1.5 * np.power(2, (1.5 - 1) / 2)) / 2.0), 1.0 / 1.5)
-                    LF_D = 0.01 * np.random.uniform() * xichma / np.power(np.abs(np.random.uniform()), 1.0 / 1.5)
-                    if np.abs(E) >= 0.5:  # Soft besiege Eq. (10) in paper
-                        Y = self.g_best[self.ID_POS] - E * np.abs(J * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-                    else:  # Hard besiege Eq. (11) in paper
-                        X_m = np.mean([x[self.ID_POS] for x in self.pop])
-                        Y = self.g_best[self.ID_POS] - E * np.abs(J * self.g_best[self.ID_POS] - X_m)
-                    pos_Y = self.amend_position_faster(Y)
-                    fit_Y = self.get_fitness_position(pos_Y)
-                    Z = Y + np.random.uniform(self.problem.lb, self.problem.ub) * LF_D
-                    pos_Z = self.amend_position_faster(Z)
-                    fit_Z = self.get_fitness_position(pos_Z)
+        list_explore = np.abs(E[:, 0]) >= 1
+        pos_new = self.amend_position_faster(np.where(list_explore[:, None], pos_explore, pos_exploit))
+        list_dive = np.where(~list_explore & ~list_pounce)[0]
+        xichma = np.power((gamma(1 + 1.5) * np.sin(np.pi * 1.5 / 2.0)) /
+                          (gamma((1 + 1.5) * 1.5 * np.power(2, (1.5 - 1) / 2)) / 2.0), 1.0 / 1.5)
+        LF_D = 0.01 * np.random.uniform(0, 1, (len(list_dive), 1)) * xichma / \
+               np.power(np.abs(np.random.uniform(0, 1, (len(list_dive), 1))), 1.0 / 1.5)
+        pos_Z = pos_Y[list_dive] + np.random.uniform(lb, ub, (len(list_dive), self.problem.n_dims)) * LF_D
+        pos_Z = self.amend_position_faster(pos_Z)
+        pop_new = self.update_fitness_population([[pos, None] for pos in np.concatenate((pos_new, pos_Z), axis=0)])
+        pop_new, pop_Z = pop_new[:self.pop_size], pop_new[self.pop_size:]
+        self.nfe_per_epoch = self.pop_size + len(list_dive)
 
-                    if self.compare_agent([pos_Y, fit_Y], self.pop[idx]):
-                        pop_new.append([pos_Y, fit_Y])
-                        continue
-                    if self.compare_agent([pos_Z, fit_Z], self.pop[idx]):
-                        pop_new.append([pos_Z, fit_Z])
-                        continue
-                    pop_new.append(deepcopy(self.pop[idx]))
-        self.pop = self.update_fitness_population(pop_new)
+        ## The diving hawk takes Y if it is better, else Z if it is better, else keeps its position
+        pop_old = [self.pop[idx] for idx in list_dive]
+        list_better_Y = self.compare_population([pop_new[idx] for idx in list_dive], pop_old)
+        list_better_Z = self.compare_population(pop_Z, pop_old)
+        for k, idx in enumerate(list_dive):
+            if not list_better_Y[k]:
+                pop_new[idx] = pop_Z[k] if list_better_Z[k] else self.pop[idx]
+        self.pop = pop_new
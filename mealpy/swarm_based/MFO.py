@@ -69,7 +69,7 @@ class BaseMFO(Optimizer):
             ## This is the way I make this algorithm working. I tried to run matlab code with large dimension and it doesn't convergence.
             pos_new = self.amend_position_faster(pos_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
 
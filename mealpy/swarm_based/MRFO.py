@@ -75,7 +75,7 @@ class BaseMRFO(Optimizer):
                            alpha * (self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
             pos_new = self.amend_position_faster(x_t1)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         pop_new = self.greedy_selection_population(self.pop, pop_new)
         _, g_best = self.update_global_best_solution(pop_new, save=False)
         pop_child = []
@@ -85,5 +85,5 @@ class BaseMRFO(Optimizer):
                    (np.random.uniform() * g_best[self.ID_POS] - np.random.uniform() * pop_new[idx][self.ID_POS])
             pos_new = self.amend_position_faster(x_t1)
             pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
@@ -64,5 +64,5 @@ class BasePFA(Optimizer):
             pos_new = (pos_new + t1) / self.pop_size
             pos_new = self.amend_position_faster(pos_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
@@ -78,7 +78,7 @@ class BaseSHO(Optimizer):
                 pos_new = np.mean(np.array(circle_list))
             pos_new = self.amend_position_faster(pos_new)
             pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pop_new = self.update_fitness_population_bound(pop_new, self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
         nfe_epoch += self.pop_size
         self.nfe_per_epoch = nfe_epoch
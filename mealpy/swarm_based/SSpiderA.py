@@ -9,8 +9,8 @@
 
 import numpy as np
 from copy import deepcopy
-from scipy.spatial.distance import cdist
 from mealpy.optimizer import Optimizer
+from mealpy.utils.pairwise import get_distance_matrix, get_block_size, generate_row_blocks
 
 
 class BaseSSpiderA(Optimizer):
@@ -80,43 +80,59 @@ class BaseSSpiderA(Optimizer):
         dimension_mask = np.zeros(self.problem.n_dims)
         return [position, fitness, intensity, target_position, previous_movement_vector, dimension_mask]
 
+    def _get_intensity_receive(self, pos_matrix, intensity_source):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (pop_size x n_dims)
+            intensity_source (nd.array): 1-D array (pop_size,), the vibration intensity generated by each spider
+
+        Returns:
+            1-D array (pop_size,), the vibration intensity received by each spider, the attenuation matrix is computed
+            in blocks of rows so the whole (pop_size x pop_size) matrix is never stored
+        """
+        base_distance = max(np.mean(np.std(pos_matrix, axis=0)), self.EPSILON)  ## Number
+        intensity_receive = np.zeros(len(pos_matrix))
+        for list_rows in generate_row_blocks(len(pos_matrix), get_block_size(len(pos_matrix))):
+            dist = get_distance_matrix(pos_matrix[list_rows], pos_matrix)
+            intensity_receive += intensity_source[list_rows] @ np.exp(-dist / (base_distance * self.r_a))
+        return intensity_receive
+
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        all_pos = np.array([it[self.ID_POS] for it in self.pop])  ## Matrix (pop_size, problem_size)
-        base_distance = np.mean(np.std(all_pos, axis=0))  ## Number
-        dist = cdist(all_pos, all_pos, 'euclidean')
-
-        intensity_source = np.array([it[self.ID_INT] for it in self.pop])
-        intensity_attenuation = np.exp(-dist / (base_distance * self.r_a))  ## vector (pop_size)
-        intensity_receive = np.dot(np.reshape(intensity_source, (1, self.pop_size)), intensity_attenuation)  ## vector (1, pop_size)
+        all_pos = self.get_position_matrix(self.pop)  ## Matrix (pop_size, problem_size)
+        intensity_source = np.array([agent[self.ID_INT] for agent in self.pop])
+        intensity_receive = self._get_intensity_receive(all_pos, intensity_source)
         id_best_intennsity = np.argmax(intensity_receive)
 
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            agent = deepcopy(self.pop[idx])
-            if self.pop[id_best_intennsity][self.ID_INT] > self.pop[idx][self.ID_INT]:
-                agent[self.ID_TARGET_POS] = self.pop[id_best_intennsity][self.ID_TARGET_POS]
-            if np.random.uniform() > self.p_c:  ## changing mask
-                agent[self.ID_MASK] = np.where(np.random.uniform(0, 1, self.problem.n_dims) < self.p_m, 0, 1)
-            pos_new = np.where(self.pop[idx][self.ID_MASK] == 0, self.pop[idx][self.ID_TARGET_POS],
-                               self.pop[np.random.randint(0, self.pop_size)][self.ID_POS])
-            ## Perform random walk
-            pos_new = self.pop[idx][self.ID_POS] + np.random.normal() * \
-                      (self.pop[idx][self.ID_POS] - self.pop[idx][self.ID_PREV_MOVE_VEC]) + \
-                      (pos_new - self.pop[idx][self.ID_POS]) * np.random.normal()
-            agent[self.ID_POS] = self.amend_position_faster(pos_new)
-            pop_new.append(agent)
+        ## The target vibration and the dimension mask of each new spider
+        target_pos = np.array([agent[self.ID_TARGET_POS] for agent in self.pop])
+        list_follow = intensity_source[id_best_intennsity] > intensity_source
+        target_pos[list_follow] = self.pop[id_best_intennsity][self.ID_TARGET_POS]
+        mask = np.array([agent[self.ID_MASK] for agent in self.pop])
+        list_change = np.random.uniform(0, 1, self.pop_size) > self.p_c  ## changing mask
+        mask[list_change] = np.where(np.random.uniform(0, 1, (np.sum(list_change), self.problem.n_dims)) < self.p_m, 0, 1)
+        pos_new = np.where(np.array([agent[self.ID_MASK] for agent in self.pop]) == 0,
+                           np.array([agent[self.ID_TARGET_POS] for agent in self.pop]),
+                           all_pos[np.random.randint(0, self.pop_size, self.pop_size)])
+        ## Perform random walk
+        prev_move = np.array([agent[self.ID_PREV_MOVE_VEC] for agent in self.pop])
+        pos_new = all_pos + np.random.normal(0, 1, (self.pop_size, 1)) * (all_pos - prev_move) + \
+                  (pos_new - all_pos) * np.random.normal(0, 1, (self.pop_size, 1))
+        pos_new = self.amend_position_faster(pos_new)
+        pop_new = [[pos_new[idx], None, agent[self.ID_INT], target_pos[idx], agent[self.ID_PREV_MOVE_VEC], mask[idx]]
+                   for idx, agent in enumerate(self.pop)]
         pop_new = self.update_fitness_population(pop_new)
 
-        for idx in range(0, self.pop_size):
-            if self.compare_agent(pop_new[idx], self.pop[idx]):
-                self.pop[idx][self.ID_PREV_MOVE_VEC] = pop_new[idx][self.ID_POS] - self.pop[idx][self.ID_POS]
-                self.pop[idx][self.ID_INT] = np.log(1. / (abs(pop_new[idx][self.ID_FIT][self.ID_TAR]) + self.EPSILON) + 1)
-                self.pop[idx][self.ID_POS] = pop_new[idx][self.ID_POS]
-                self.pop[idx][self.ID_FIT] = pop_new[idx][self.ID_FIT]
+        list_better = self.compare_population(pop_new, self.pop)
+        list_fit_new = self.get_fitness_vector(pop_new)
+        for idx in np.where(list_better)[0]:
+            self.pop[idx][self.ID_PREV_MOVE_VEC] = pos_new[idx] - all_pos[idx]
+            self.pop[idx][self.ID_INT] = np.log(1. / (abs(list_fit_new[idx]) + self.EPSILON) + 1)
+            self.pop[idx][self.ID_POS] = pos_new[idx]
+            self.pop[idx][self.ID_FIT] = pop_new[idx][self.ID_FIT]
 
 
 # class OriginalSSA(Root):
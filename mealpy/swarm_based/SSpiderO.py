@@ -8,8 +8,8 @@
 #-------------------------------------------------------------------------------------------------------%
 
 import numpy as np
-from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils.pairwise import get_nearest_neighbour, get_squared_distance_matrix, get_block_size, generate_row_blocks
 
 
 class BaseSSpiderO(Optimizer):
@@ -33,6 +33,9 @@ class BaseSSpiderO(Optimizer):
             **kwargs ():
         """
         super().__init__(problem, kwargs)
+        self.nfe_per_epoch = pop_size
+        self.sort_flag = False
+
         self.epoch = epoch
         self.pop_size = pop_size
         self.fp = fp
@@ -63,144 +66,118 @@ class BaseSSpiderO(Optimizer):
 
         self.pop_males = self.create_population(self.n_m)
         self.pop_females = self.create_population(self.n_f)
-        pop = deepcopy(self.pop_females) + deepcopy(self.pop_males)
-        self.pop = self._recalculate_weights(pop)
+        self.pop = self._recalculate_weights(self.pop_females + self.pop_males)
+        self.pop_females, self.pop_males = self.pop[:self.n_f], self.pop[self.n_f:]
         _, self.g_best = self.get_global_best_solution(self.pop)
 
+    def _get_weight_vector(self, pop):
+        return np.array([agent[self.ID_WEI] for agent in pop], dtype=float)
+
     def _move_females(self, epoch=None):
         scale_distance = np.sum(self.problem.ub - self.problem.lb)
         pop = self.pop_females + self.pop_males
-        # Start looking for any stronger vibration
-        for i in range(0, self.n_f):    # Move the females
-            ## Find the position s
-            id_min = None
-            dist_min = 2**16
-            for j in range(0, self.pop_size):
-                if self.pop_females[i][self.ID_WEI] < pop[j][self.ID_WEI]:
-                    dt = np.linalg.norm(pop[j][self.ID_POS] - self.pop_females[i][self.ID_POS]) / scale_distance
-                    if dt < dist_min and dt != 0:
-                        dist_min = dt
-                        id_min = j
-            x_s = np.zeros(self.problem.n_dims)
-            vibs = 0
-            if id_min is not None:
-                vibs = 2*(pop[id_min][self.ID_WEI]*np.exp(-(np.random.uniform()*dist_min**2)))  # Vib for the shortest
-                x_s = pop[id_min][self.ID_POS]
-
-            ## Find the position b
-            dtb = np.linalg.norm(self.g_best[self.ID_POS] - self.pop_females[i][self.ID_POS]) / scale_distance
-            vibb = 2 * (self.g_best[self.ID_WEI] * np.exp(-(np.random.uniform() * dtb ** 2)))
-
-            ## Do attraction or repulsion
-            beta = np.random.uniform(0, 1, self.problem.n_dims)
-            gamma = np.random.uniform(0, 1, self.problem.n_dims)
-            random = 2 * self.p_m[epoch] * (np.random.uniform(0, 1, self.problem.n_dims) - 0.5)
-            if np.random.uniform() >= self.p_m[epoch]:       # Do an attraction
-                pos_new = self.pop_females[i][self.ID_POS] + vibs * (x_s - self.pop_females[i][self.ID_POS]) * beta + \
-                    vibb * (self.g_best[self.ID_POS] - self.pop_females[i][self.ID_POS]) * gamma + random
-            else:                               # Do a repulsion
-                pos_new = self.pop_females[i][self.ID_POS] - vibs * (x_s - self.pop_females[i][self.ID_POS]) * beta - \
-                       vibb * (self.g_best[self.ID_POS] - self.pop_females[i][self.ID_POS]) * gamma + random
-            pos_new = self.amend_position_random(pos_new)
-            self.pop_females[i][self.ID_POS] = pos_new
-        self.pop_females = self.update_fitness_population(self.pop_females)
+        pos_female, wei_female = self.get_position_matrix(self.pop_females), self._get_weight_vector(self.pop_females)
+        pos_all, wei_all = self.get_position_matrix(pop), self._get_weight_vector(pop)
+        ## Find the position s: the nearest spider with a stronger vibration (higher weight)
+        list_idx, list_dist = get_nearest_neighbour(pos_female, pos_all, wei_female, wei_all)
+        list_found = list_idx != -1
+        dist_min = np.where(list_found, list_dist / scale_distance, 0)
+        vibs = np.where(list_found, 2 * wei_all[list_idx] * np.exp(-(np.random.uniform(0, 1, self.n_f) * dist_min ** 2)), 0)
+        x_s = np.where(list_found[:, None], pos_all[list_idx], 0)
+
+        ## Find the position b
+        dtb = np.linalg.norm(self.g_best[self.ID_POS] - pos_female, axis=1) / scale_distance
+        vibb = 2 * (self.g_best[self.ID_WEI] * np.exp(-(np.random.uniform(0, 1, self.n_f) * dtb ** 2)))
+
+        ## Do attraction or repulsion
+        beta = np.random.uniform(0, 1, (self.n_f, self.problem.n_dims))
+        gamma = np.random.uniform(0, 1, (self.n_f, self.problem.n_dims))
+        random = 2 * self.p_m[epoch] * (np.random.uniform(0, 1, (self.n_f, self.problem.n_dims)) - 0.5)
+        sign = np.where(np.random.uniform(0, 1, self.n_f) >= self.p_m[epoch], 1, -1)[:, None]
+        pos_new = pos_female + sign * (vibs[:, None] * (x_s - pos_female) * beta +
+                                       vibb[:, None] * (self.g_best[self.ID_POS] - pos_female) * gamma) + random
+        pos_new = self.amend_position_random(pos_new)
+        pop_new = [[pos_new[i], None, agent[self.ID_WEI]] for i, agent in enumerate(self.pop_females)]
+        self.pop_females = self.update_fitness_population(pop_new)
         self.nfe_epoch += self.n_f
 
     def _move_males(self, epoch=None):
         scale_distance = np.sum(self.problem.ub - self.problem.lb)
-        my_median =np.median([it[self.ID_WEI] for it in self.pop_males])
-        pop = self.pop_females + self.pop_males
-        all_pos = np.array([it[self.ID_POS] for it in pop])
-        all_wei = np.array([it[self.ID_WEI] for it in pop]).reshape((self.pop_size, 1))
+        pos_male, wei_male = self.get_position_matrix(self.pop_males), self._get_weight_vector(self.pop_males)
+        pos_female, wei_female = self.get_position_matrix(self.pop_females), self._get_weight_vector(self.pop_females)
+        my_median = np.median(wei_male)
+        all_pos = np.concatenate((pos_female, pos_male), axis=0)
+        all_wei = np.concatenate((wei_female, wei_male))
         total_wei = np.sum(all_wei)
         if total_wei == 0:
             mean = np.mean(all_pos, axis=0)
         else:
-            mean = np.sum(all_wei * all_pos, axis=0) / total_wei
-        for i in range(0, self.n_m):
-            delta = 2 * np.random.uniform(0, 1, self.problem.n_dims) - 0.5
-            random = 2 * self.p_m[epoch] * (np.random.uniform(0, 1, self.problem.n_dims) - 0.5)
-
-            if self.pop_males[i][self.ID_WEI] >= my_median:         # Spider above the median
-                # Start looking for a female with stronger vibration
-                id_min = None
-                dist_min = 99999999
-                for j in range(0, self.n_f):
-                    if self.pop_females[j][self.ID_WEI] > self.pop_males[i][self.ID_WEI]:
-                        dt = np.linalg.norm(self.pop_females[j][self.ID_POS] - self.pop_males[i][self.ID_POS]) / scale_distance
-                        if dt < dist_min and dt != 0:
-                            dist_min = dt
-                            id_min = j
-                x_s = np.zeros(self.problem.n_dims)
-                vibs = 0
-                if id_min != None:
-                    # Vib for the shortest
-                    vibs = 2 * (self.pop_females[id_min][self.ID_WEI] * np.exp(-(np.random.uniform() * dist_min ** 2)))
-                    x_s = self.pop_females[id_min][self.ID_POS]
-                pos_new = self.pop_males[i][self.ID_POS] + vibs * (x_s - self.pop_males[i][self.ID_POS])*delta + random
-            else:
-                # Spider below median, go to weighted mean
-                pos_new = self.pop_males[i][self.ID_POS] + delta * (mean - self.pop_males[i][self.ID_POS]) + random
-            pos_new = self.amend_position_random(pos_new)
-            self.pop_males[i][self.ID_POS] = pos_new
-        self.pop_males = self.update_fitness_population(self.pop_males)
+            mean = np.sum(all_wei[:, None] * all_pos, axis=0) / total_wei
+        delta = 2 * np.random.uniform(0, 1, (self.n_m, self.problem.n_dims)) - 0.5
+        random = 2 * self.p_m[epoch] * (np.random.uniform(0, 1, (self.n_m, self.problem.n_dims)) - 0.5)
+
+        # Spider below median, go to weighted mean
+        pos_new = pos_male + delta * (mean - pos_male) + random
+        # Spider above the median, start looking for a female with stronger vibration
+        list_above = np.where(wei_male >= my_median)[0]
+        list_idx, list_dist = get_nearest_neighbour(pos_male[list_above], pos_female, wei_male[list_above], wei_female)
+        list_found = list_idx != -1
+        dist_min = np.where(list_found, list_dist / scale_distance, 0)
+        # Vib for the shortest
+        vibs = np.where(list_found, 2 * wei_female[list_idx] * np.exp(-(np.random.uniform(0, 1, len(list_above)) * dist_min ** 2)), 0)
+        x_s = np.where(list_found[:, None], pos_female[list_idx], 0)
+        pos_new[list_above] = pos_male[list_above] + vibs[:, None] * (x_s - pos_male[list_above]) * delta[list_above] + random[list_above]
+        pos_new = self.amend_position_random(pos_new)
+        pop_new = [[pos_new[i], None, agent[self.ID_WEI]] for i, agent in enumerate(self.pop_males)]
+        self.pop_males = self.update_fitness_population(pop_new)
         self.nfe_epoch += self.n_m
 
     ### Crossover
     def _crossover__(self, mom=None, dad=None, id=0):
-        child1 = np.zeros(self.problem.n_dims)
-        child2 = np.zeros(self.problem.n_dims)
+        """
+        Args:
+            mom (nd.array): 2-D matrix (n_couples x n_dims) of the first parents
+            dad (nd.array): 2-D matrix (n_couples x n_dims) of the second parents
+            id (int): 0 - arithmetic recombination, 1 - two-point crossover, 2 - one-point crossover at the middle
+
+        Returns:
+            2 matrices (n_couples x n_dims) of children
+        """
         if id == 0:         # arithmetic recombination
-            r = np.random.uniform(0.5, 1)             # w1 = w2 when r =0.5
-            child1 = np.multiply(r, mom) + np.multiply((1 - r), dad)
-            child2 = np.multiply(r, dad) + np.multiply((1 - r), mom)
-
-        elif id == 1:
-            id1 = np.random.randint(1, int(self.problem.n_dims / 2))
-            id2 = int(id1 + self.problem.n_dims / 2)
-
-            child1[:id1] = mom[:id1]
-            child1[id1:id2] = dad[id1:id2]
-            child1[id2:] = mom[id2:]
-
-            child2[:id1] = dad[:id1]
-            child2[id1:id2] = mom[id1:id2]
-            child2[id2:] = dad[id2:]
-        elif id == 2:
-            temp = int(self.problem.n_dims/2)
-            child1[:temp] = mom[:temp]
-            child1[temp:] = dad[temp:]
-            child2[:temp] = dad[:temp]
-            child2[temp:] = mom[temp:]
-
-        return child1, child2
+            r = np.random.uniform(0.5, 1, (len(mom), 1))             # w1 = w2 when r =0.5
+            return r * mom + (1 - r) * dad, r * dad + (1 - r) * mom
+        list_dims = np.arange(self.problem.n_dims)
+        if id == 1:
+            id1 = np.random.randint(1, max(2, int(self.problem.n_dims / 2)), (len(mom), 1))
+            id2 = (id1 + self.problem.n_dims / 2).astype(int)
+            mask = (list_dims >= id1) & (list_dims < id2)
+        else:
+            mask = np.broadcast_to(list_dims >= int(self.problem.n_dims/2), mom.shape)
+        return np.where(mask, dad, mom), np.where(mask, mom, dad)
 
     def _mating(self):
         # Check whether a spider is good or not (above median)
-        my_median = np.median([it[self.ID_WEI] for it in self.pop_males])
-        pop_males_new = [self.pop_males[i] for i in range(self.n_m) if self.pop_males[i][self.ID_WEI] > my_median]
+        pos_male, wei_male = self.get_position_matrix(self.pop_males), self._get_weight_vector(self.pop_males)
+        pos_female = self.get_position_matrix(self.pop_females)
+        pos_good = pos_male[wei_male > np.median(wei_male)]
 
         # Calculate the radio
-        pop = self.pop_females + self.pop_males
-        all_pos = np.array([it[self.ID_POS] for it in pop])
+        all_pos = np.concatenate((pos_female, pos_male), axis=0)
         rad = np.max(all_pos, axis=1) - np.min(all_pos, axis=1)
         r = np.sum(rad)/(2*self.problem.n_dims)
 
         # Start looking if there's a good female near
-        list_child = []
-        couples = []
-        for i in range(0, len(pop_males_new)):
-            for j in range(0, self.n_f):
-                dist = np.linalg.norm(pop_males_new[i][self.ID_POS] - self.pop_females[j][self.ID_POS])
-                if dist < r:
-                    couples.append([pop_males_new[i], self.pop_females[j]])
-        if couples:
-            n_child = len(couples)
-            for k in range(n_child):
-                child1, child2 = self._crossover__(couples[k][0][self.ID_POS], couples[k][1][self.ID_POS], 0)
-                list_child.append([child1, None, 0.0])
-                list_child.append([child2, None, 0.0])
-
+        list_male, list_female = [], []
+        for list_rows in generate_row_blocks(len(pos_good), get_block_size(self.n_f)):
+            id_male, id_female = np.nonzero(get_squared_distance_matrix(pos_good[list_rows], pos_female) < r ** 2)
+            list_male.append(list_rows[id_male])
+            list_female.append(id_female)
+        list_male = np.concatenate(list_male) if list_male else np.array([], dtype=int)
+        list_female = np.concatenate(list_female) if list_female else np.array([], dtype=int)
+        if len(list_male) > 0:
+            child1, child2 = self._crossover__(pos_good[list_male], pos_female[list_female], 0)
+            pos_child = np.stack((child1, child2), axis=1).reshape(-1, self.problem.n_dims)
+            list_child = [[pos, None, 0.0] for pos in pos_child]
         else:
             list_child = self.create_population(self.pop_size)
         list_child = self.update_fitness_population(list_child)
@@ -208,20 +185,24 @@ class BaseSSpiderO(Optimizer):
         return list_child
 
     def _survive(self, pop=None, pop_child=None):
-        n_child = len(pop)
-        pop_child = self.get_sorted_strim_population(pop_child, n_child)
-        for i in range(0, n_child):
-            if self.compare_agent(pop_child[i], pop[i]):
-                pop[i] = deepcopy(pop_child[i])
+        ## The k-th best child replaces the k-th spider if it is better
+        n_child = min(len(pop), len(pop_child))
+        fit_child = self.get_fitness_vector(pop_child)
+        list_order = np.argsort(fit_child if self.problem.minmax == "min" else -fit_child, kind="stable")[:n_child]
+        list_better = self.compare_population([pop_child[idx] for idx in list_order], pop[:n_child])
+        for i in np.where(list_better)[0]:
+            pop[i] = pop_child[list_order[i]]
         return pop
 
     def _recalculate_weights(self, pop=None):
-        fit_total, fit_best, fit_worst = self.get_special_fitness(pop)
+        list_fit = self.get_fitness_vector(pop)
+        fit_best, fit_worst = (np.min(list_fit), np.max(list_fit)) if self.problem.minmax == "min" else (np.max(list_fit), np.min(list_fit))
+        if fit_best == fit_worst:
+            list_weight = np.random.uniform(0.2, 0.8, len(pop))
+        else:
+            list_weight = 0.001 + (list_fit - fit_worst) / (fit_best - fit_worst)
         for i in range(len(pop)):
-            if fit_best == fit_worst:
-                pop[i][self.ID_WEI] = np.random.uniform(0.2, 0.8)
-            else:
-                pop[i][self.ID_WEI] = 0.001 + (pop[i][self.ID_FIT][self.ID_TAR] - fit_worst) / (fit_best - fit_worst)
+            pop[i][self.ID_WEI] = list_weight[i]
         return pop
 
     def evolve(self, epoch):
@@ -242,4 +223,5 @@ class BaseSSpiderO(Optimizer):
         pop_child = self._mating()
         pop = self._survive(pop, pop_child)
         self.pop = self._recalculate_weights(pop)
+        self.pop_females, self.pop_males = self.pop[:self.n_f], self.pop[self.n_f:]
         self.nfe_per_epoch = self.nfe_epoch
\ No newline at end of file
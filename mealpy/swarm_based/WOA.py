@@ -34,39 +34,47 @@ class BaseWOA(Optimizer):
         self.epoch = epoch
         self.pop_size = pop_size
 
+    def _move_whales(self, a):
+        """
+        Move the whole pod, the 3 behaviours are selected by masks:
+            + p < 0.5 and |A| < 1: encircling the prey (global best)
+            + p < 0.5 and |A| >= 1: search for prey around a random position
+            + p >= 0.5: bubble-net attacking (spiral)
+
+        Args:
+            a (float): coefficient a of the current iteration
+
+        Returns:
+            2-D matrix (pop_size x n_dims) of amended new positions
+        """
+        pos_matrix = self.get_position_matrix(self.pop)
+        g_best = self.g_best[self.ID_POS]
+        r = np.random.rand(self.pop_size, 1)
+        A = 2 * a * r - a
+        C = 2 * r
+        l = np.random.uniform(-1, 1, (self.pop_size, 1))
+        p = 0.5
+        b = 1
+        ## Leader of each whale: the prey or a random position
+        x_rand = np.random.uniform(self.problem.lb, self.problem.ub, (self.pop_size, self.problem.n_dims))
+        pos_leader = np.where(np.abs(A) < 1, g_best, x_rand)
+        pos_encircle = self.get_leader_following_position(pos_matrix, pos_leader[:, None, :], A, C)
+        pos_spiral = g_best + np.exp(b * l) * np.cos(2 * np.pi * l) * np.abs(g_best - pos_matrix)
+        pos_new = np.where(np.random.uniform(0, 1, (self.pop_size, 1)) < p, pos_encircle, pos_spiral)
+        return self.amend_position_faster(pos_new)
+
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
         a = 2 - 2 * epoch / (self.epoch - 1)  # linearly decreased from 2 to 0
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            r = np.random.rand()
-            A = 2 * a * r - a
-            C = 2 * r
-            l = np.random.uniform(-1, 1)
-            p = 0.5
-            b = 1
-            if np.random.uniform() < p:
-                if np.abs(A) < 1:
-                    D = np.abs(C * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-                    pos_new = self.g_best[self.ID_POS] - A * D
-                else:
-                    # x_rand = pop[np.random.np.random.randint(self.pop_size)]         # select random 1 position in pop
-                    x_rand = self.create_solution()
-                    D = np.abs(C * x_rand[self.ID_POS] - self.pop[idx][self.ID_POS])
-                    pos_new = x_rand[self.ID_POS] - A * D
-            else:
-                D1 = np.abs(self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-                pos_new = self.g_best[self.ID_POS] + np.exp(b * l) * np.cos(2 * np.pi * l) * D1
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pos_new = self._move_whales(a)
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], self.pop)
         self.pop = self.greedy_selection_population(self.pop, pop_new)
 
 
-class HI_WOA(Optimizer):
+class HI_WOA(BaseWOA):
     """
         The original version of: Hybrid Improved Whale Optimization Algorithm (HI-WOA)
             A hybrid improved whale optimization algorithm
@@ -82,12 +90,10 @@ class HI_WOA(Optimizer):
             pop_size (int): number of population size, default = 100
             **kwargs ():
         """
-        super().__init__(problem, kwargs)
+        super().__init__(problem, epoch, pop_size, **kwargs)
         self.nfe_per_epoch = pop_size
         self.sort_flag = True
 
-        self.epoch = epoch
-        self.pop_size = pop_size
         self.feedback_max = feedback_max
         # The maximum of times g_best doesn't change -> need to change half of population
         self.n_changes = int(pop_size/2)
@@ -102,34 +108,13 @@ class HI_WOA(Optimizer):
         """
         nfe_epoch = 0
         a = 2 + 2 * np.cos(np.pi / 2 * (1 + epoch / self.epoch))    # Eq. 8
-        pop_new = []
-        for idx in range(0, self.pop_size):
-            r = np.random.rand()
-            A = 2 * a * r - a
-            C = 2 * r
-            l = np.random.uniform(-1, 1)
-            p = 0.5
-            b = 1
-            if np.random.uniform() < p:
-                if np.abs(A) < 1:
-                    D = np.abs(C * self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-                    pos_new = self.g_best[self.ID_POS] - A * D
-                else:
-                    # x_rand = pop[np.random.np.random.randint(self.pop_size)]         # select random 1 position in pop
-                    x_rand = self.create_solution()
-                    D = np.abs(C * x_rand[self.ID_POS] - self.pop[idx][self.ID_POS])
-                    pos_new = x_rand[self.ID_POS] - A * D
-            else:
-                D1 = np.abs(self.g_best[self.ID_POS] - self.pop[idx][self.ID_POS])
-                pos_new = self.g_best[self.ID_POS] + np.exp(b * l) * np.cos(2 * np.pi * l) * D1
-            pos_new = self.amend_position_faster(pos_new)
-            pop_new.append([pos_new, None])
-        pop_new = self.update_fitness_population(pop_new)
+        pos_new = self._move_whales(a)
+        pop_new = self.update_fitness_population([[pos, None] for pos in pos_new])
         nfe_epoch += self.pop_size
 
         ## Feedback Mechanism
-        _, current_best = self.get_global_best_solution(pop_new)
-        if current_best[self.ID_FIT][self.ID_TAR] == self.g_best[self.ID_FIT][self.ID_TAR]:
+        list_fit = self.get_fitness_vector(pop_new)
+        if list_fit[self.get_index_best(list_fit)[0]] == self.g_best[self.ID_FIT][self.ID_TAR]:
             self.dyn_feedback_count += 1
         else:
             self.dyn_feedback_count = 0
@@ -92,7 +92,7 @@ class OriginalAEO(Optimizer):
             x_t1 = best[self.ID_POS] + d * (e * best[self.ID_POS] - h * pop_new[idx][self.ID_POS])
             pos_new = self.amend_position_faster(x_t1)
             pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
 
 
@@ -180,7 +180,7 @@ class ImprovedAEO(OriginalAEO):
                 best[self.ID_POS] = best[self.ID_POS] + np.random.normal() * best[self.ID_POS]
             pos_new = self.amend_position_faster(x_new)
             pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
 
 
@@ -287,7 +287,7 @@ class EnhancedAEO(Optimizer):
                 # x_new = best[self.ID_POS] + np.random.normal() * best[self.ID_POS]
             pos_new = self.amend_position_faster(x_new)
             pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
 
 
@@ -382,7 +382,7 @@ class ModifiedAEO(Optimizer):
                 # x_new = best[self.ID_POS] + np.random.normal() * best[self.ID_POS]
             pos_new = self.amend_position_faster(x_new)
             pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
 
 
@@ -467,7 +467,7 @@ class AdaptiveAEO(Optimizer):
                           1.0 / np.sqrt(epoch + 1) * np.sign(np.random.random() - 0.5) * (best[self.ID_POS] - pop_new[idx][self.ID_POS])
             pos_new = self.amend_position_faster(pos_new)
             pop_child.append([pos_new, None])
-        pop_child = self.update_fitness_population(pop_child)
+        pop_child = self.update_fitness_population_bound(pop_child, pop_new)
         self.pop = self.greedy_selection_population(pop_new, pop_child)
 
 
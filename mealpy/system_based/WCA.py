@@ -10,6 +10,7 @@
 import numpy as np
 from copy import deepcopy
 from mealpy.optimizer import Optimizer
+from mealpy.utils import group
 
 
 class BaseWCA(Optimizer):
@@ -42,7 +43,7 @@ class BaseWCA(Optimizer):
         self.C = C
         self.dmax = dmax
 
-        self.streams, self.pop_bset, self.pop_stream = None, None, None
+        self.pop_best, self.pop_stream, self.stream_ids = None, None, None
 
     def initialization(self):
         pop = self.create_population(self.pop_size)
@@ -50,67 +51,58 @@ class BaseWCA(Optimizer):
 
         self.ecc = self.dmax    # Evaporation condition constant - variable
         n_stream = self.pop_size - self.nsr
-        g_best = deepcopy(pop[0])  # Global best solution (sea)
-        self.pop_best = deepcopy(pop[:self.nsr])  # Including sea and river (1st solution is sea)
-        self.pop_stream = deepcopy(pop[self.nsr:])  # Forming Stream
+        self.pop_best = deepcopy(self.pop[:self.nsr])  # Including sea and river (1st solution is sea)
+        self.pop_stream = deepcopy(self.pop[self.nsr:])  # Forming Stream
 
-        # Designate streams to rivers and sea
-        cost_river_list = np.array([solution[self.ID_FIT][self.ID_TAR] for solution in self.pop_best])
+        # Designate streams to rivers and sea: stream_ids[k] is the river (or sea) that the k-th stream flows to
+        cost_river_list = self.get_fitness_vector(self.pop_best)
         num_child_in_river_list = np.round(np.abs(cost_river_list / np.sum(cost_river_list)) * n_stream).astype(int)
-        if np.sum(num_child_in_river_list) < n_stream:
-            num_child_in_river_list[-1] += n_stream - np.sum(num_child_in_river_list)
-        streams = {}
-        idx_already_selected = []
-        for i in range(0, self.nsr - 1):
-            streams[i] = []
-            idx_list = np.random.choice(list(set(range(0, n_stream)) - set(idx_already_selected)), num_child_in_river_list[i], replace=False).tolist()
-            idx_already_selected += idx_list
-            for idx in idx_list:
-                streams[i].append(self.pop_stream[idx])
-        idx_last = list(set(range(0, n_stream)) - set(idx_already_selected))
-        streams[self.nsr - 1] = []
-        for idx in idx_last:
-            streams[self.nsr - 1].append(self.pop_stream[idx])
-        self.streams = streams
+        stream_ids = group.create_group_ids(num_child_in_river_list[:-1], shuffle=False)[:n_stream]
+        stream_ids = np.concatenate((stream_ids, (self.nsr - 1) * np.ones(n_stream - len(stream_ids), dtype=int)))
+        self.stream_ids = np.random.permutation(stream_ids)
 
     def evolve(self, epoch):
         """
         Args:
             epoch (int): The current iteration
         """
-        # Update stream and river
-        for idx, stream_list in self.streams.items():
-            # Update stream
-            stream_new = []
-            for idx_stream, stream in enumerate(stream_list):
-                pos_new = stream[self.ID_POS] + np.random.uniform() * self.C * (self.pop_best[idx][self.ID_POS] - stream[self.ID_POS])
-                pos_new = self.amend_position_faster(pos_new)
-                stream_new.append([pos_new, None])
-            stream_new = self.update_fitness_population(stream_new)
-            stream_new, stream_best = self.get_global_best_solution(stream_new)
-            self.streams[idx] = stream_new
-            if self.compare_agent(stream_best, self.pop_best[idx]):
-                self.pop_best[idx] = deepcopy(stream_best)
+        # Update stream: all streams flow to their river (or sea) at the same time
+        pos_best = self.get_position_matrix(self.pop_best)
+        pos_stream = self.get_position_matrix(self.pop_stream)
+        pos_new = pos_stream + np.random.uniform(0, 1, (len(pos_stream), 1)) * self.C * (pos_best[self.stream_ids] - pos_stream)
+        pos_new = self.amend_position_faster(pos_new)
+        self.pop_stream = self.update_fitness_population([[pos, None] for pos in pos_new])
+        list_stream_best = group.get_group_best(self.get_fitness_vector(self.pop_stream), self.stream_ids, self.nsr, self.problem.minmax)
+        for idx, id_stream in enumerate(list_stream_best):
+            if id_stream >= 0 and self.compare_agent(self.pop_stream[id_stream], self.pop_best[idx]):
+                self.pop_best[idx] = deepcopy(self.pop_stream[id_stream])
 
-            # Update river
-            pos_new = self.pop_best[idx][self.ID_POS] + np.random.uniform() * self.C * (self.g_best[self.ID_POS] - self.pop_best[idx][self.ID_POS])
-            pos_new = self.amend_position_faster(pos_new)
-            fit_new = self.get_fitness_position(pos_new)
-            if self.compare_agent([pos_new, fit_new], self.pop_best[idx]):
-                self.pop_best[idx] = [pos_new, fit_new]
+        # Update river
+        pos_best = self.get_position_matrix(self.pop_best)
+        pos_new = pos_best + np.random.uniform(0, 1, (self.nsr, 1)) * self.C * (self.g_best[self.ID_POS] - pos_best)
+        pos_new = self.amend_position_faster(pos_new)
+        pop_new = self.update_fitness_population_bound([[pos, None] for pos in pos_new], self.pop_best)
+        self.pop_best = self.greedy_selection_population(self.pop_best, pop_new)
 
-        # Evaporation
-        for i in range(1, self.nsr):
-            distance = np.sqrt(np.sum((self.g_best[self.ID_POS] - self.pop_best[i][self.ID_POS]) ** 2))
-            if distance < self.ecc or np.random.rand() < 0.1:
-                child = self.create_solution()
-                pop_current_best, _ = self.get_global_best_solution(self.streams[i] + [child])
-                self.pop_best[i] = pop_current_best.pop(0)
-                self.streams[i] = pop_current_best
+        # Evaporation: the best of (streams of the river + a new random solution) becomes the new river
+        pos_best = self.get_position_matrix(self.pop_best)
+        distance = np.sqrt(np.sum((self.g_best[self.ID_POS] - pos_best[1:]) ** 2, axis=1))
+        list_evaporation = 1 + np.flatnonzero((distance < self.ecc) | (np.random.rand(self.nsr - 1) < 0.1))
+        if len(list_evaporation) > 0:
+            pop_child = self.create_population(len(list_evaporation))
+            list_stream_best = group.get_group_best(self.get_fitness_vector(self.pop_stream), self.stream_ids, self.nsr, self.problem.minmax)
+            for i, child in zip(list_evaporation, pop_child):
+                id_stream = list_stream_best[i]
+                if id_stream < 0 or self.compare_agent(child, self.pop_stream[id_stream]):
+                    self.pop_best[i] = child
+                else:
+                    self.pop_best[i] = self.pop_stream[id_stream]
+                    self.pop_stream[id_stream] = child
+            self.nfe_per_epoch = self.pop_size + len(list_evaporation)
+        else:
+            self.nfe_per_epoch = self.pop_size
 
-        self.pop = deepcopy(self.pop_best)
-        for idx, stream_list in self.streams.items():
-            self.pop += stream_list
+        self.pop = deepcopy(self.pop_best) + self.pop_stream
 
         # Reduce the ecc
         self.ecc = self.ecc - self.ecc / self.epoch
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 10:44, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+## Ask/tell driver: the normal solve_iter() loop runs in a worker thread with mode="ask_tell", every fitness evaluation
+## of the worker is handed to the caller as a position matrix (ask) and blocks until the caller sends the
+## objective values back (tell). Only one side runs at a time, so the optimizer itself needs no locking.
+
+import numpy as np
+import threading
+import bisect
+import queue
+
+MAX_CREATOR_THREADS = 1000          # Solutions created at the same time, so the initial population is asked in batches
+
+
+class AskTellSession:
+    """
+    Runs optimizer.solve_iter(mode="ask_tell") in a worker thread and exchanges the evaluations with the caller.
+    """
+
+    def __init__(self, optimizer, save_population=True):
+        """
+        Args:
+            optimizer (Optimizer): the model
+            save_population (bool): keep a copy of the population of each epoch in History, same as solve_iter()
+        """
+        self.optimizer = optimizer
+        self.save_population = save_population
+        self.requests = queue.Queue(maxsize=1)      # Worker -> caller: ("evaluate", pos_matrix), ("done", None), ("error", exc)
+        self.replies = queue.Queue(maxsize=1)       # Caller -> worker: list of objective values
+        self.pending = None                         # The request waiting for tell()
+        self.finished = False
+        self.creator = BatchedCreator(self.evaluate)
+        self.worker = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            for _ in self.optimizer.solve_iter(mode="ask_tell", save_population=self.save_population):
+                pass
+            self.requests.put(("done", None))
+        except BaseException as err:
+            self.requests.put(("error", err))
+
+    def _next_request(self):
+        if self.pending is None and not self.finished:
+            kind, value = self.requests.get()
+            if kind == "error":
+                self.finished = True
+                raise value
+            if kind == "done":
+                self.finished = True
+            else:
+                self.pending = value
+
+    ## Caller side
+
+    def ask(self):
+        """
+        Returns:
+            2-D matrix (n_candidates x n_dims) of positions to evaluate, None when the optimization is finished
+        """
+        if not self.worker.is_alive() and not self.finished and self.pending is None:
+            self.worker.start()
+        self._next_request()
+        return None if self.pending is None else self.pending.copy()
+
+    def tell(self, list_objs):
+        """
+        Args:
+            list_objs (list, nd.array): the objective value(s) of each asked candidate, same order as ask()
+        """
+        if self.pending is None:
+            print("Please call ask() before tell(), there is no candidate waiting for its fitness!")
+            exit(0)
+        if len(list_objs) != len(self.pending):
+            print(f"tell() needs {len(self.pending)} objective values, got {len(list_objs)}!")
+            exit(0)
+        self.pending = None
+        self.replies.put(list(list_objs))
+        ## Let the worker go on until it needs the next evaluation (or finishes)
+        self._next_request()
+
+    ## Worker side
+
+    def evaluate(self, pos_matrix):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n_candidates x n_dims)
+
+        Returns:
+            list of the objective value(s) of each candidate
+        """
+        if len(pos_matrix) == 0:
+            return []
+        self.requests.put(("evaluate", np.asarray(pos_matrix, dtype=float)))
+        return self.replies.get()
+
+    def evaluate_one(self, position):
+        return self.creator.evaluate_one(position)
+
+
+class BatchedCreator:
+    """
+    Runs create_solution() of many solutions in creator threads and gathers their single evaluations into batches,
+    for the evaluation backends that work on whole position matrices (ask/tell, worker farm). Only needed when
+    create_solution() is overridden, see Optimizer.create_population_batched().
+    """
+
+    def __init__(self, evaluate):
+        """
+        Args:
+            evaluate (callable): batch evaluation, pos_matrix (n x n_dims) -> list of n objective values
+        """
+        self.evaluate = evaluate
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.list_active, self.list_slots, self.list_events = [], [], []   # Creator threads of create_population()
+
+    def evaluate_one(self, position):
+        """
+        Single evaluation. Inside create_population() the single evaluations of all solutions being created are
+        gathered into one batch.
+        """
+        idx = getattr(self.local, "creator", None)
+        if idx is None:
+            return self.evaluate(np.reshape(position, (1, -1)))[0]
+        slot = {"position": position}
+        with self.lock:
+            self.list_slots.append(slot)
+            self.list_events[idx].clear()
+            self._pass_turn(idx)
+        self.list_events[idx].wait()
+        if "error" in slot:
+            raise slot["error"]
+        return slot["objs"]
+
+    def _pass_turn(self, idx):
+        ## Called with the lock held. The creators run one at a time in their order. Once every running creator
+        ## waits for its fitness, they are evaluated as one batch and the next round starts. Only the creator whose
+        ## turn it is gets woken. The random numbers drawn after the evaluation (e.g. the strategy of BaseES) come
+        ## round by round, not solution by solution as in the sequential mode.
+        id_next = bisect.bisect_right(self.list_active, idx)
+        if id_next < len(self.list_active):
+            self.list_events[self.list_active[id_next]].set()
+        else:
+            if self.list_slots:
+                list_slots, self.list_slots = self.list_slots, []
+                try:
+                    list_objs = self.evaluate(np.array([slot["position"] for slot in list_slots]))
+                    for slot, objs in zip(list_slots, list_objs):
+                        slot["objs"] = objs
+                except BaseException as err:        # Every waiting creator gets the error of the batch
+                    for slot in list_slots:
+                        slot["error"] = err
+            if self.list_active:
+                self.list_events[self.list_active[0]].set()
+
+    def _run_creator(self, create_solution, idx, list_results):
+        self.list_events[idx].wait()
+        self.local.creator = idx
+        try:
+            list_results[idx] = create_solution()
+        except BaseException as err:
+            list_results[idx] = err
+        finally:
+            self.local.creator = None
+            with self.lock:
+                self.list_active.remove(idx)
+                self._pass_turn(idx)
+
+    def create_population(self, create_solution, pop_size):
+        """
+        Args:
+            create_solution (callable): the create_solution() method of the optimizer
+            pop_size (int): number of solutions
+
+        Returns:
+            list of solutions, their fitness evaluations are asked in batches of up to MAX_CREATOR_THREADS
+        """
+        pop = []
+        for start in range(0, pop_size, MAX_CREATOR_THREADS):
+            n_batch = min(MAX_CREATOR_THREADS, pop_size - start)
+            self.list_active, self.list_slots = list(range(n_batch)), []
+            self.list_events = [threading.Event() for _ in range(n_batch)]
+            self.list_events[0].set()
+            ## Daemon threads: an abandoned ask/tell session doesn't block the exit of the interpreter
+            list_results = [None] * n_batch
+            list_threads = [threading.Thread(target=self._run_creator, args=(create_solution, idx, list_results), daemon=True)
+                            for idx in range(n_batch)]
+            for thread in list_threads:
+                thread.start()
+            for thread in list_threads:
+                thread.join()
+            for result in list_results:
+                if isinstance(result, BaseException):
+                    raise result
+            pop += list_results
+        return pop
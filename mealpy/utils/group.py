@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 10:20, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+## Grouped population: one flat population (list of agents / position matrix) plus a group-id vector.
+## Used by the algorithms that split their swarm into sub-populations (WCA: rivers, ICA: empires, HGSO: gas types,
+## BSO: clusters). Group-local updates are done on the whole matrix with fancy-indexing by group id, the per-group
+## statistics are segment reductions below, and moving an agent to another group just changes its label.
+
+import numpy as np
+
+
+def create_group_ids(list_sizes, shuffle=True):
+    """
+    Args:
+        list_sizes (list, nd.array): number of members of each group
+        shuffle (bool): randomly assign the members to the positions of the population
+
+    Returns:
+        1-D integer array of length sum(list_sizes), the group id of each agent
+    """
+    group_ids = np.repeat(np.arange(len(list_sizes)), np.asarray(list_sizes, dtype=int))
+    return np.random.permutation(group_ids) if shuffle else group_ids
+
+
+def get_group_size(group_ids, n_groups):
+    """
+    Returns:
+        1-D integer array (n_groups,), the number of members in each group
+    """
+    return np.bincount(group_ids, minlength=n_groups)
+
+
+def get_group_mean(values, group_ids, n_groups):
+    """
+    Args:
+        values (nd.array): 1-D (n_agents,) or 2-D (n_agents x n_dims) array
+        group_ids (nd.array): 1-D integer array (n_agents,)
+        n_groups (int): number of groups
+
+    Returns:
+        The mean of each group, (n_groups,) or (n_groups x n_dims). The mean of an empty group is 0.
+    """
+    values = np.asarray(values, dtype=float)
+    sizes = np.maximum(get_group_size(group_ids, n_groups), 1)
+    if values.ndim == 1:
+        return np.bincount(group_ids, weights=values, minlength=n_groups) / sizes
+    total = np.zeros((n_groups,) + values.shape[1:])
+    np.add.at(total, group_ids, values)
+    return total / sizes[:, None]
+
+
+def get_group_best(list_fitness, group_ids, n_groups, minmax="min"):
+    """
+    Args:
+        list_fitness (nd.array): 1-D array (n_agents,) of fitness values
+        group_ids (nd.array): 1-D integer array (n_agents,)
+        n_groups (int): number of groups
+        minmax (str): "min" or "max"
+
+    Returns:
+        1-D integer array (n_groups,), the index of the best agent of each group, -1 for an empty group
+    """
+    list_fitness = np.asarray(list_fitness, dtype=float)
+    list_best = -np.ones(n_groups, dtype=int)
+    if len(list_fitness) == 0:
+        return list_best
+    order = np.lexsort((list_fitness if minmax == "min" else -list_fitness, group_ids))
+    list_first = np.r_[True, group_ids[order][1:] != group_ids[order][:-1]]
+    list_best[group_ids[order][list_first]] = order[list_first]
+    return list_best
+
+
+def get_group_worst(list_fitness, group_ids, n_groups, minmax="min"):
+    """
+    Returns:
+        1-D integer array (n_groups,), the index of the worst agent of each group, -1 for an empty group
+    """
+    return get_group_best(list_fitness, group_ids, n_groups, "max" if minmax == "min" else "min")
+
+
+def get_random_member(group_ids, list_groups, n_groups):
+    """
+    Args:
+        group_ids (nd.array): 1-D integer array (n_agents,)
+        list_groups (nd.array): 1-D integer array, the groups we want to draw a member from
+        n_groups (int): number of groups
+
+    Returns:
+        1-D integer array (len(list_groups),), index of a random member of each requested group, -1 for an empty group
+    """
+    list_groups = np.asarray(list_groups, dtype=int)
+    order = np.argsort(group_ids, kind="stable")
+    sizes = get_group_size(group_ids, n_groups)
+    starts = np.cumsum(sizes) - sizes
+    offset = np.floor(np.random.uniform(0, 1, len(list_groups)) * sizes[list_groups]).astype(int)
+    list_idx = order[np.minimum(starts[list_groups] + offset, max(len(order) - 1, 0))] if len(order) > 0 \
+        else np.zeros(len(list_groups), dtype=int)
+    return np.where(sizes[list_groups] > 0, list_idx, -1)
+
+
+def get_random_partner(group_ids, n_groups):
+    """
+    Args:
+        group_ids (nd.array): 1-D integer array (n_agents,)
+        n_groups (int): number of groups
+
+    Returns:
+        1-D integer array (n_agents,), index of a random other member of the same group for each agent,
+        the agent itself when it is alone in its group
+    """
+    group_ids = np.asarray(group_ids, dtype=int)
+    order = np.argsort(group_ids, kind="stable")
+    sizes = get_group_size(group_ids, n_groups)
+    starts = np.cumsum(sizes) - sizes
+    rank = np.empty(len(group_ids), dtype=int)
+    rank[order] = np.arange(len(group_ids)) - starts[group_ids[order]]
+    size_own = sizes[group_ids]
+    offset = 1 + np.floor(np.random.uniform(0, 1, len(group_ids)) * (size_own - 1)).astype(int)
+    offset = np.where(size_own > 1, np.minimum(offset, size_own - 1), 0)
+    return order[starts[group_ids] + (rank + offset) % size_own]
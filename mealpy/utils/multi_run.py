@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 10:47, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+## Stacked multi-run: R independent runs of the same algorithm advance in lockstep through ask()/tell(). At every
+## step the candidates of all active runs are stacked into one position matrix, so a vectorized objective function is
+## called once for all the runs. Each run keeps its own random state (swapped in while it runs), its own best and
+## History, and stops on its own termination condition.
+## The runs are only stacked when the algorithm keeps the default create_solution(): a custom one needs a creator
+## thread per solution (see BatchedCreator), so the runs are then simply solved one after another with obj_func.
+
+import numpy as np
+from mealpy.problem import Problem
+from mealpy.optimizer import Optimizer
+from mealpy.utils.ask_tell import AskTellSession
+
+
+class MultiRun:
+    """
+    Examples:
+        multi = MultiRun(BaseDE, problem, n_runs=30, epoch=1000, pop_size=50, wf=0.8, cr=0.9)
+        list_best_fit = multi.solve(batch_obj_func=lambda pos_matrix: np.sum(pos_matrix**2, axis=1))
+        multi.models[0].history     # History of the first run
+    """
+
+    def __init__(self, optimizer_class, problem, n_runs=30, seeds=None, save_population=False, **kwargs):
+        """
+        Args:
+            optimizer_class (class): the algorithm, e.g. BaseDE
+            problem (dict, Problem): the problem, shared by all runs
+            n_runs (int): number of independent runs
+            seeds (list): seed of each run, default = random seeds from the current global random state
+            save_population (bool): keep a copy of the population of each epoch in the History of each run
+            **kwargs: parameters of the algorithm (epoch, pop_size, termination...)
+        """
+        if not isinstance(problem, Problem):
+            problem = Problem(problem)
+        self.problem = problem
+        if seeds is None:
+            seeds = np.random.randint(0, 2**31 - 1, n_runs)
+        if len(seeds) != n_runs:
+            print(f"Please give {n_runs} seeds, one for each run!")
+            exit(0)
+        self.n_runs = n_runs
+        self.save_population = save_population
+        self.models = [optimizer_class(problem, **kwargs) for _ in range(n_runs)]
+        self.stacked = optimizer_class.create_solution is Optimizer.create_solution
+        if self.stacked:
+            for model in self.models:
+                model.session = AskTellSession(model, save_population)
+        self.list_state = [np.random.RandomState(seed).get_state() for seed in seeds]
+        self.list_solution = None
+
+    def _step(self, idx, list_objs=None):
+        ## Run model idx with its own random state until it asks for the next candidates (or finishes)
+        np.random.set_state(self.list_state[idx])
+        if list_objs is not None:
+            self.models[idx].tell(list_objs)
+        pos_matrix = self.models[idx].ask()
+        self.list_state[idx] = np.random.get_state()
+        return pos_matrix
+
+    def get_objs_from_batch(self, batch_obj_func, pos_matrix):
+        """
+        Args:
+            batch_obj_func (callable): objective on a 2-D matrix (n x n_dims), returns (n,) or (n x n_objs), None to
+                apply problem.obj_func row by row
+            pos_matrix (nd.array): 2-D matrix (n x n_dims)
+
+        Returns:
+            list of the objective value(s) of each row
+        """
+        if batch_obj_func is None:
+            return [self.problem.obj_func(position) for position in pos_matrix]
+        objs = np.asarray(batch_obj_func(pos_matrix))
+        if len(objs) != len(pos_matrix):
+            print(f"batch_obj_func() should return {len(pos_matrix)} values, one for each row, got {len(objs)}!")
+            exit(0)
+        return objs.tolist()
+
+    def solve(self, batch_obj_func=None):
+        """
+        Args:
+            batch_obj_func (callable): vectorized objective function, see get_objs_from_batch(), not used when the runs
+                can't be stacked (problem.obj_func gives the same values)
+
+        Returns:
+            list of [position, fitness value], the final best of each run
+        """
+        state_caller = np.random.get_state()
+        try:
+            if self.stacked:
+                self._solve_stacked(batch_obj_func)
+            else:
+                for idx in range(self.n_runs):
+                    np.random.set_state(self.list_state[idx])
+                    for _ in self.models[idx].solve_iter(save_population=self.save_population):
+                        pass
+        finally:
+            np.random.set_state(state_caller)
+        self.list_solution = [model.solution for model in self.models]
+        return [[sol[0], sol[1][0]] for sol in self.list_solution]
+
+    def _solve_stacked(self, batch_obj_func):
+        dict_pending = {}
+        for idx in range(self.n_runs):
+            pos_matrix = self._step(idx)
+            if pos_matrix is not None:
+                dict_pending[idx] = pos_matrix
+        while len(dict_pending) > 0:
+            list_idx = list(dict_pending.keys())
+            list_sizes = [len(dict_pending[idx]) for idx in list_idx]
+            list_objs = self.get_objs_from_batch(batch_obj_func, np.concatenate([dict_pending[idx] for idx in list_idx]))
+            dict_pending, start = {}, 0
+            for idx, size in zip(list_idx, list_sizes):
+                pos_matrix = self._step(idx, list_objs[start:start + size])
+                start += size
+                if pos_matrix is not None:
+                    dict_pending[idx] = pos_matrix
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 10:11, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+## Pairwise-interaction kernels for the O(pop_size^2) swarm algorithms (FireflyA, BFO, SSpiderO, SSpiderA, TWO...)
+## and the nearest-neighbour queries of the distance-driven algorithms (BRO, SSpiderO).
+## Every function works on a position matrix (n_agents x n_dims) instead of a list of agents.
+## The big intermediate tensors (pairs x n_dims) are computed in blocks of rows, so the memory footprint is bounded
+## by MAX_BLOCK_ELEMENTS no matter how large pop_size or n_dims is.
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+MAX_BLOCK_ELEMENTS = 2 ** 22        # ~32 MB of float64 for a single intermediate block
+KDTREE_MAX_DIMS = 10                # KD-tree is only faster than the exact distance matrix in low dimensions
+
+
+def get_block_size(n_cols, n_dims=1, max_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Args:
+        n_cols (int): number of columns (partners) of each row
+        n_dims (int): number of dimensions of each pair
+        max_elements (int): maximum number of elements of a block
+
+    Returns:
+        The number of rows in a block, so that block_size * n_cols * n_dims <= max_elements (at least 1 row)
+    """
+    return max(1, int(max_elements // max(1, n_cols * n_dims)))
+
+
+def generate_row_blocks(n_rows, block_size):
+    """
+    Args:
+        n_rows (int): total number of rows
+        block_size (int): number of rows of each block
+
+    Returns:
+        Generator of 1-D index arrays, each one holds the rows of a block
+    """
+    for start in range(0, n_rows, block_size):
+        yield np.arange(start, min(start + block_size, n_rows))
+
+
+def get_squared_distance_matrix(pos_a, pos_b=None):
+    """
+    Squared Euclidean distance between every row of pos_a and every row of pos_b, computed with a matrix product.
+
+    Args:
+        pos_a (nd.array): 2-D matrix (n_a x n_dims)
+        pos_b (nd.array): 2-D matrix (n_b x n_dims), default = pos_a
+
+    Returns:
+        2-D matrix (n_a x n_b)
+    """
+    pos_a = np.asarray(pos_a, dtype=float)
+    pos_b = pos_a if pos_b is None else np.asarray(pos_b, dtype=float)
+    sq_a = np.einsum("ij,ij->i", pos_a, pos_a)
+    sq_b = np.einsum("ij,ij->i", pos_b, pos_b)
+    sq_sum = sq_a[:, None] + sq_b[None, :]
+    dist = sq_sum - 2 * pos_a @ pos_b.T
+    ## Cancellation error of the matrix product, identical points must give exactly 0
+    dist[dist <= 1e-12 * sq_sum] = 0
+    return dist
+
+
+def get_distance_matrix(pos_a, pos_b=None):
+    """
+    Args:
+        pos_a (nd.array): 2-D matrix (n_a x n_dims)
+        pos_b (nd.array): 2-D matrix (n_b x n_dims), default = pos_a
+
+    Returns:
+        2-D matrix (n_a x n_b) of Euclidean distances
+    """
+    return np.sqrt(get_squared_distance_matrix(pos_a, pos_b))
+
+
+def get_weighted_displacement(weights, pos_rows, pos_all):
+    """
+    Sum of weighted displacements for each row i: sum_j weights[i, j] * (pos_all[j] - pos_rows[i]), as a matrix product.
+
+    Args:
+        weights (nd.array): 2-D matrix (n_rows x n_all)
+        pos_rows (nd.array): 2-D matrix (n_rows x n_dims)
+        pos_all (nd.array): 2-D matrix (n_all x n_dims)
+
+    Returns:
+        2-D matrix (n_rows x n_dims)
+    """
+    return weights @ pos_all - np.sum(weights, axis=1)[:, None] * pos_rows
+
+
+def get_pair_displacement(pos_all, list_rows, list_cols):
+    """
+    Args:
+        pos_all (nd.array): 2-D matrix (n_agents x n_dims)
+        list_rows (nd.array): 1-D index array of the moving agents
+        list_cols (nd.array): 1-D index array of the partners, same length as list_rows
+
+    Returns:
+        2-D matrix (n_pairs x n_dims), each row is pos_all[list_cols[k]] - pos_all[list_rows[k]]
+    """
+    return pos_all[list_cols] - pos_all[list_rows]
+
+
+def get_sum_abs_deviation(pos_matrix):
+    """
+    Pairwise-L1 reduction per dimension: result[i, d] = sum_k |pos_matrix[k, d] - pos_matrix[i, d]|.
+    It is computed from the sorted columns and their prefix sums, so neither the (n x n x n_dims) tensor nor a
+    loop over agents is needed.
+
+    Args:
+        pos_matrix (nd.array): 2-D matrix (n_agents x n_dims)
+
+    Returns:
+        2-D matrix (n_agents x n_dims)
+    """
+    pos_matrix = np.asarray(pos_matrix, dtype=float)
+    n_agents = len(pos_matrix)
+    list_order = np.argsort(pos_matrix, axis=0)
+    pos_sorted = np.take_along_axis(pos_matrix, list_order, axis=0)
+    prefix = np.cumsum(pos_sorted, axis=0)
+    total = prefix[-1]
+    rank = np.arange(n_agents)[:, None]
+    lower = pos_sorted * rank - (prefix - pos_sorted)                 # Sum over the smaller values
+    upper = (total - prefix) - pos_sorted * (n_agents - 1 - rank)     # Sum over the larger values
+    result = np.empty_like(pos_matrix)
+    np.put_along_axis(result, list_order, lower + upper, axis=0)
+    return result
+
+
+def _get_nearest_neighbour_exact(pos_query, pos_ref, query_weight, ref_weight, exclude_zero, max_elements):
+    list_idx = -np.ones(len(pos_query), dtype=int)
+    list_dist = np.full(len(pos_query), np.inf)
+    block_size = get_block_size(len(pos_ref), max_elements=max_elements)
+    for list_rows in generate_row_blocks(len(pos_query), block_size):
+        dist = get_distance_matrix(pos_query[list_rows], pos_ref)
+        if exclude_zero:
+            dist[dist == 0] = np.inf
+        if query_weight is not None:
+            dist[ref_weight[None, :] <= query_weight[list_rows, None]] = np.inf
+        id_min = np.argmin(dist, axis=1)
+        dist_min = dist[np.arange(len(list_rows)), id_min]
+        list_idx[list_rows] = np.where(np.isfinite(dist_min), id_min, -1)
+        list_dist[list_rows] = dist_min
+    return list_idx, list_dist
+
+
+def get_nearest_neighbour(pos_query, pos_ref=None, query_weight=None, ref_weight=None, exclude_zero=True,
+                          max_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Nearest-neighbour query, it supports the filtered query "nearest reference with a higher weight".
+    A KD-tree is used when n_dims <= KDTREE_MAX_DIMS, the blocked exact distance matrix is used otherwise.
+
+    Args:
+        pos_query (nd.array): 2-D matrix (n_query x n_dims)
+        pos_ref (nd.array): 2-D matrix (n_ref x n_dims), default = pos_query
+        query_weight (nd.array): 1-D array (n_query,), optional filter, only references with ref_weight > query_weight are valid
+        ref_weight (nd.array): 1-D array (n_ref,), default = query_weight when pos_ref is None
+        exclude_zero (bool): ignore the references at distance 0 (e.g. the query point itself)
+        max_elements (int): maximum number of elements of a distance block
+
+    Returns:
+        list_idx (nd.array): 1-D integer array (n_query,), index of the nearest valid reference, -1 if there is none
+        list_dist (nd.array): 1-D array (n_query,), distance to that reference, inf if there is none
+    """
+    pos_query = np.asarray(pos_query, dtype=float)
+    pos_ref = pos_query if pos_ref is None else np.asarray(pos_ref, dtype=float)
+    if query_weight is not None:
+        query_weight = np.asarray(query_weight, dtype=float)
+        ref_weight = query_weight if ref_weight is None else np.asarray(ref_weight, dtype=float)
+    if len(pos_ref) == 0 or pos_query.shape[1] > KDTREE_MAX_DIMS:
+        return _get_nearest_neighbour_exact(pos_query, pos_ref, query_weight, ref_weight, exclude_zero, max_elements)
+
+    ## Query k neighbours, the queries without a valid one are asked again with 2k neighbours
+    tree = cKDTree(pos_ref)
+    list_idx = -np.ones(len(pos_query), dtype=int)
+    list_dist = np.full(len(pos_query), np.inf)
+    list_rows = np.arange(len(pos_query))
+    k = min(8, len(pos_ref))
+    while len(list_rows) > 0:
+        dist, idx = tree.query(pos_query[list_rows], k=k)
+        dist, idx = dist.reshape(len(list_rows), k), idx.reshape(len(list_rows), k)
+        valid = np.ones(dist.shape, dtype=bool)
+        if exclude_zero:
+            valid &= dist > 0
+        if query_weight is not None:
+            valid &= ref_weight[idx] > query_weight[list_rows, None]
+        found = np.any(valid, axis=1)
+        id_first = np.argmax(valid, axis=1)
+        list_idx[list_rows[found]] = idx[found, id_first[found]]
+        list_dist[list_rows[found]] = dist[found, id_first[found]]
+        if k >= len(pos_ref):
+            break
+        list_rows = list_rows[~found]
+        if 4 * k >= len(pos_ref):
+            ## Too many neighbours needed, the exact search is cheaper for the remaining queries
+            idx, dist = _get_nearest_neighbour_exact(pos_query[list_rows], pos_ref,
+                None if query_weight is None else query_weight[list_rows], ref_weight, exclude_zero, max_elements)
+            list_idx[list_rows], list_dist[list_rows] = idx, dist
+            break
+        k = min(2 * k, len(pos_ref))
+    return list_idx, list_dist
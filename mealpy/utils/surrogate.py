@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 11:10, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+## Surrogate of the objective function for the pre-screening of candidates: a k-nearest-neighbour regressor with
+## inverse-distance weights, trained incrementally on the really evaluated (position, objs) pairs.
+## The positions are scaled to [0, 1] with the bounds of the problem, the archive keeps the most recent samples.
+
+import numpy as np
+from mealpy.utils import pairwise
+
+
+class SurrogateModel:
+
+    def __init__(self, lb, ub, k=5, archive_size=5000):
+        """
+        Args:
+            lb (nd.array): lower bound of the problem
+            ub (nd.array): upper bound of the problem
+            k (int): number of neighbours of a prediction
+            archive_size (int): maximum number of samples kept (the oldest ones are dropped)
+        """
+        self.lb = np.asarray(lb, dtype=float)
+        self.scale = np.maximum(np.asarray(ub, dtype=float) - self.lb, 1e-12)
+        self.k = k
+        self.archive_size = archive_size
+        self.pos_archive, self.objs_archive = None, None
+        self.predicted_keys = set()         # (position, fitness) pairs where the fitness is a prediction
+
+    def __len__(self):
+        return 0 if self.pos_archive is None else len(self.pos_archive)
+
+    def add(self, pos_matrix, objs_matrix):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n x n_dims) of really evaluated positions
+            objs_matrix (nd.array): 2-D matrix (n x n_objs) of their objective values
+        """
+        pos_matrix = (np.asarray(pos_matrix, dtype=float) - self.lb) / self.scale
+        objs_matrix = np.asarray(objs_matrix, dtype=float).reshape(len(pos_matrix), -1)
+        if self.pos_archive is None:
+            self.pos_archive, self.objs_archive = pos_matrix, objs_matrix
+        else:
+            self.pos_archive = np.concatenate((self.pos_archive, pos_matrix))[-self.archive_size:]
+            self.objs_archive = np.concatenate((self.objs_archive, objs_matrix))[-self.archive_size:]
+
+    def predict(self, pos_matrix):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n x n_dims)
+
+        Returns:
+            2-D matrix (n x n_objs) of predicted objective values
+        """
+        pos_matrix = (np.asarray(pos_matrix, dtype=float) - self.lb) / self.scale
+        k = min(self.k, len(self))
+        objs_pred = np.empty((len(pos_matrix), self.objs_archive.shape[1]))
+        block_size = pairwise.get_block_size(len(self))
+        for list_rows in pairwise.generate_row_blocks(len(pos_matrix), block_size):
+            dist = pairwise.get_distance_matrix(pos_matrix[list_rows], self.pos_archive)
+            idx = np.argpartition(dist, k - 1, axis=1)[:, :k]
+            dist_k = np.take_along_axis(dist, idx, axis=1)
+            weights = 1.0 / np.maximum(dist_k, 1e-12)
+            ## An already evaluated position gets its own value
+            exact = dist_k <= 1e-12
+            weights = np.where(np.any(exact, axis=1, keepdims=True), exact.astype(float), weights)
+            weights /= np.sum(weights, axis=1, keepdims=True)
+            objs_pred[list_rows] = np.einsum("ik,ikj->ij", weights, self.objs_archive[idx])
+        return objs_pred
+
+    @staticmethod
+    def get_key(position, fitness):
+        ## The fitness is part of the key: an agent keeps its predicted fitness when the same position is really
+        ## evaluated for another agent (e.g. a DE trial vector equal to its parent)
+        return np.asarray(position, dtype=float).tobytes(), float(fitness)
+
+    def set_predicted(self, pos_matrix, list_fitness, flag=True):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n x n_dims)
+            list_fitness (list, nd.array): their fitness (target)
+            flag (bool): True when their fitness is a prediction, False when they are really evaluated
+        """
+        for position, fitness in zip(pos_matrix, list_fitness):
+            if flag:
+                self.predicted_keys.add(self.get_key(position, fitness))
+            else:
+                self.predicted_keys.discard(self.get_key(position, fitness))
+
+    def prune_predicted(self, pos_matrix, list_fitness):
+        """
+        Forget the predictions that are no longer used, once there are more than 4 * archive_size of them.
+
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n x n_dims) of the positions still in use (e.g. the population)
+            list_fitness (list, nd.array): their fitness (target)
+        """
+        if len(self.predicted_keys) > 4 * self.archive_size:
+            list_keys = [self.get_key(position, fitness) for position, fitness in zip(pos_matrix, list_fitness)]
+            self.predicted_keys &= set(list_keys)
+
+    def is_predicted(self, position, fitness):
+        """
+        Returns:
+            True if this fitness of this position is a prediction of the surrogate
+        """
+        return self.get_key(position, fitness) in self.predicted_keys
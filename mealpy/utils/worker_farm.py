@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# ------------------------------------------------------------------------------------------------------%
+# Created by "agent" at 11:21, 19/10/2026                                                               %
+#                                                                                                       %
+#       Email:      agent@local                                                                         %
+# ------------------------------------------------------------------------------------------------------%
+
+## Worker farm: the coordinator lives inside solve(mode="farm") and listens on a TCP port, the workers (local processes
+## or processes on other hosts) connect to it and keep their connection. Each batch of candidates is split into chunks,
+## an idle worker gets one chunk at a time. The workers send heartbeats with their progress; a worker that disconnects,
+## stays silent longer than timeout or evaluates nothing during eval_timeout is dropped and its chunk is given to
+## another worker.
+## Connections use multiprocessing.connection: length-prefixed pickle frames with an HMAC challenge on the authkey.
+## There is no default authkey: WorkerFarm generates a random one (farm.authkey) unless it is given, the remote workers
+## need the same key. Use a trusted network.
+
+import numpy as np
+import threading
+import time
+import socket
+import secrets
+import traceback
+import multiprocessing as mp
+from collections import deque
+from multiprocessing.connection import Listener, Client
+
+
+class WorkerError(RuntimeError):
+    """
+    The objective function raised an exception on a worker, the message carries the traceback of the worker.
+    """
+    pass
+
+
+def run_worker(address, obj_func, authkey, heartbeat=1.0):
+    """
+    Worker loop: connect to the coordinator, evaluate the chunks it sends until it says stop or the connection is lost.
+
+    Args:
+        address (tuple): (host, port) of the coordinator
+        obj_func (callable): the objective function, same as Problem obj_func
+        authkey (bytes): shared secret of the farm, the authkey of the WorkerFarm
+        heartbeat (float): seconds between two heartbeats
+    """
+    conn = Client(tuple(address), authkey=authkey)
+    lock_send = threading.Lock()
+    stopped = threading.Event()
+    progress = [0]                  # Candidates evaluated so far, sent with the heartbeats
+
+    def send(message):
+        with lock_send:
+            conn.send(message)
+
+    def beat():
+        while not stopped.wait(heartbeat):
+            try:
+                send(("heartbeat", progress[0]))
+            except (OSError, EOFError):
+                break
+
+    threading.Thread(target=beat, daemon=True).start()
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                break
+            _, chunk_id, pos_matrix = message
+            try:
+                list_objs = []
+                for position in pos_matrix:
+                    list_objs.append(obj_func(position))
+                    progress[0] += 1
+            except Exception:
+                send(("error", chunk_id, traceback.format_exc()))
+                continue
+            send(("result", chunk_id, list_objs))
+    except (OSError, EOFError):
+        pass
+    finally:
+        stopped.set()
+        conn.close()
+
+
+class WorkerFarm:
+    """
+    Examples:
+        ## Coordinator with 4 local workers, more workers can join from other hosts with run_worker()
+        farm = WorkerFarm(host="0.0.0.0", port=6000, authkey=secret_key, n_local_workers=4)
+        model = BaseGA(problem, epoch=100, pop_size=50, farm=farm)
+        model.solve(mode="farm")
+
+        ## On another host, with the same secret_key (os.urandom(32), shared out of band)
+        run_worker(("coordinator-host", 6000), obj_func, authkey=secret_key)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, authkey=None, n_local_workers=0, heartbeat=1.0, timeout=10.0,
+                 eval_timeout=None, chunk_size=None):
+        """
+        Args:
+            host (str): interface of the coordinator
+            port (int): port of the coordinator, 0 = any free port (see address)
+            authkey (bytes): shared secret of the farm, default = None (a random key, read it from farm.authkey)
+            n_local_workers (int): number of worker processes started on this host
+            heartbeat (float): seconds between two heartbeats of a worker
+            timeout (float): seconds without any message after which a worker is considered dead
+            eval_timeout (float): seconds without any finished evaluation after which a busy worker is considered
+                hung, default = None (an evaluation can take any time)
+            chunk_size (int): candidates sent to a worker at once, default = about 2 chunks per worker
+        """
+        self.host, self.port = host, port
+        self.authkey = secrets.token_bytes(32) if authkey is None else authkey
+        self.n_local_workers = n_local_workers
+        self.heartbeat, self.timeout, self.eval_timeout = heartbeat, timeout, eval_timeout
+        self.chunk_size = chunk_size
+        self.listener, self.address = None, None
+        self.condition = threading.Condition()
+        self.workers = {}               # Worker id -> {"conn", "last_seen", "chunk", "progress", "last_progress"}
+        self.next_worker = 0
+        self.pending, self.results = deque(), {}        # Chunk ids waiting for a worker, chunk id -> reply
+        self.list_process = []
+        self.running = False
+
+    def start(self, obj_func=None):
+        """
+        Open the listener and start the local workers.
+
+        Args:
+            obj_func (callable): the objective function of the local workers
+        """
+        if self.running:
+            return
+        self.listener = Listener((self.host, self.port), authkey=self.authkey)
+        self.address = self.listener.address
+        self.running = True
+        threading.Thread(target=self._accept, daemon=True).start()
+        for _ in range(self.n_local_workers):
+            process = mp.Process(target=run_worker, args=(self.address, obj_func, self.authkey, self.heartbeat), daemon=True)
+            process.start()
+            self.list_process.append(process)
+
+    def stop(self):
+        """
+        Tell the workers to stop and close the listener.
+        """
+        if not self.running:
+            return
+        with self.condition:
+            self.running = False
+            for worker in self.workers.values():
+                try:
+                    worker["conn"].send(("stop",))
+                except (OSError, EOFError):
+                    pass
+            self.workers = {}
+            self.condition.notify_all()
+        self.listener.close()
+        for process in self.list_process:
+            process.join(timeout=self.timeout)
+        self.list_process = []
+
+    def _accept(self):
+        while self.running:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError, mp.AuthenticationError):
+                if not self.running:
+                    break
+                continue
+            with self.condition:
+                worker_id = self.next_worker
+                self.next_worker += 1
+                self.workers[worker_id] = {"conn": conn, "last_seen": time.time(), "chunk": None, "progress": 0,
+                                           "last_progress": time.time()}
+                self.condition.notify_all()
+            threading.Thread(target=self._read, args=(worker_id, conn), daemon=True).start()
+
+    def _read(self, worker_id, conn):
+        ## The reader thread owns the connection, the others only shut the socket down to end it
+        while True:
+            try:
+                message = conn.recv()
+            except (OSError, EOFError):
+                with self.condition:
+                    self._drop_worker(worker_id)
+                    self.condition.notify_all()
+                conn.close()
+                break
+            with self.condition:
+                worker = self.workers.get(worker_id)
+                if worker is None:
+                    continue
+                worker["last_seen"] = time.time()
+                if message[0] == "heartbeat" and message[1] > worker["progress"]:
+                    worker["progress"], worker["last_progress"] = message[1], worker["last_seen"]
+                if message[0] in ("result", "error") and message[1] == worker["chunk"]:
+                    worker["chunk"] = None
+                    self.results[message[1]] = message
+                    self.condition.notify_all()
+
+    def _drop_worker(self, worker_id):
+        ## Called with the condition held: the chunk of a dead worker goes back to the queue
+        worker = self.workers.pop(worker_id, None)
+        if worker is None:
+            return
+        if worker["chunk"] is not None and worker["chunk"] not in self.results:
+            self.pending.appendleft(worker["chunk"])
+        try:
+            with socket.fromfd(worker["conn"].fileno(), socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def evaluate(self, pos_matrix):
+        """
+        Args:
+            pos_matrix (nd.array): 2-D matrix (n_candidates x n_dims)
+
+        Returns:
+            list of the objective value(s) of each candidate
+        """
+        pos_matrix = np.asarray(pos_matrix, dtype=float)
+        if len(pos_matrix) == 0:
+            return []
+        with self.condition:
+            n_workers = max(1, len(self.workers), self.n_local_workers)
+            chunk_size = self.chunk_size if self.chunk_size else int(np.ceil(len(pos_matrix) / (2 * n_workers)))
+            list_chunks = [np.arange(start, min(start + chunk_size, len(pos_matrix)))
+                           for start in range(0, len(pos_matrix), chunk_size)]
+            self.pending, self.results = deque(range(len(list_chunks))), {}
+            while len(self.results) < len(list_chunks):
+                if not self.running:
+                    print("The worker farm is stopped!")
+                    exit(0)
+                now = time.time()
+                for worker_id, worker in list(self.workers.items()):
+                    hung = self.eval_timeout is not None and worker["chunk"] is not None and \
+                           now - worker["last_progress"] > self.eval_timeout
+                    if now - worker["last_seen"] > self.timeout or hung:
+                        self._drop_worker(worker_id)
+                for worker_id, worker in list(self.workers.items()):
+                    if worker["chunk"] is None and self.pending:
+                        chunk_id = self.pending.popleft()
+                        try:
+                            worker["conn"].send(("batch", chunk_id, pos_matrix[list_chunks[chunk_id]]))
+                            worker["chunk"], worker["last_progress"] = chunk_id, time.time()
+                        except (OSError, EOFError):
+                            self.pending.appendleft(chunk_id)
+                            self._drop_worker(worker_id)
+                self.condition.wait(timeout=self.heartbeat)
+            list_objs = [None] * len(pos_matrix)
+            for chunk_id, list_idx in enumerate(list_chunks):
+                message = self.results[chunk_id]
+                if message[0] == "error":
+                    raise WorkerError(f"The objective function failed on a worker:\n{message[2]}")
+                for idx, objs in zip(list_idx, message[2]):
+                    list_objs[idx] = objs
+        return list_objs